@@ -0,0 +1,102 @@
+"""Measures how long searching a catalog of 100,000 movies takes as a query is typed.
+
+Searches are measured the way ``Movies.search`` runs them: filtered to the user's
+region and services, with a ``Movie`` built for each result. Every movie is available
+in the US, 10% of them in the UK, and 0.1% of them in Canada. Run from the project's
+root folder with ``PYTHONPATH=src python benchmarks/...``.
+"""
+import random
+import tempfile
+import time
+from itertools import accumulate
+from pathlib import Path
+
+from moviefinder.catalog_store import CatalogStore
+from moviefinder.country_code import CountryCode
+from moviefinder.movie import Movie
+from moviefinder.movie import ServiceName
+
+MOVIE_COUNT = 100_000
+PAGE_SIZE = 20  # movies are added one page of the service's responses at a time
+SYLLABLES = "ka lo mi ne ru sa to vi ba de fi go hu ja ke li mo na pe ra se ti".split()
+NAMES = (
+    "Anna Ben Carla David Emma Frank Grace Henry Iris Jack Kate Leo Maya Noah Olive"
+    " Paul Quinn Rosa Sam Tara Uma Victor Wendy Xavier Yara Zane"
+).split()
+QUERIES = ["s", "st", "sta", "star", "star w", "star wa", "star war", "kate", "zzz"]
+SEARCH_COUNT = 20
+RESULT_LIMIT = 60  # the default limit of Movies.search
+REGIONS = {"US": CountryCode.US, "UK": CountryCode.GB, "Canada": CountryCode.CA}
+
+
+def make_words(count: int) -> list[str]:
+    """Returns made-up words, and "star" and "war", in a random order."""
+    words = sorted(
+        {
+            "".join(random.choices(SYLLABLES, k=random.randint(2, 4)))
+            for _ in range(count)
+        }
+    )
+    random.shuffle(words)
+    words[100:100] = ["star", "war"]
+    return words
+
+
+def make_movie_info(i: int, words: list[str], cum_weights: list[float]) -> dict:
+    def text(k: int) -> str:
+        return " ".join(random.choices(words, cum_weights=cum_weights, k=k))
+
+    countries = ["us"]
+    if i % 10 == 0:
+        countries.append("gb")
+    if i % 1000 == 0:
+        countries.append("ca")
+    return {
+        "imdbID": f"tt{i:08}",
+        "genres": ["Drama"],
+        "countries": countries,
+        "videoURL": "https://www.hulu.com/movie/a",
+        "title": text(random.randint(1, 4)).title(),
+        "tagline": text(6),
+        "overview": text(40),
+        "cast": [f"{random.choice(NAMES)} {random.choice(NAMES)}s" for _ in range(5)],
+        "director": [f"{random.choice(NAMES)} {random.choice(NAMES)}son"],
+    }
+
+
+def main() -> None:
+    random.seed(0)
+    words = make_words(30_000)
+    # Word frequencies follow Zipf's law, as they do in natural languages.
+    cum_weights = list(accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    movies = [Movie(make_movie_info(i, words, cum_weights)) for i in range(MOVIE_COUNT)]
+    with tempfile.TemporaryDirectory() as directory:
+        store = CatalogStore(Path(directory) / "catalog.sqlite3")
+        start = time.perf_counter()
+        for page_start in range(0, MOVIE_COUNT, PAGE_SIZE):
+            store.add(movies[page_start:][:PAGE_SIZE])
+        add_seconds = time.perf_counter() - start
+        print(f"adding {len(store):,} movies: {add_seconds:.2f} s")
+        print(
+            f"adding a page:      {add_seconds / MOVIE_COUNT * PAGE_SIZE * 1000:.2f} ms"
+        )
+        for region_name, region in REGIONS.items():
+            print(f"available in {region_name}:")
+            for query in QUERIES:
+                # Warm up the page cache.
+                store.search(query, RESULT_LIMIT, region, [ServiceName.HULU])
+                start = time.perf_counter()
+                for _ in range(SEARCH_COUNT):
+                    results = [
+                        Movie(info)
+                        for info in store.search(
+                            query, RESULT_LIMIT, region, [ServiceName.HULU]
+                        )
+                    ]
+                milliseconds = (time.perf_counter() - start) / SEARCH_COUNT * 1000
+                print(f"{query!r:>10}: {milliseconds:6.2f} ms, {len(results)} results")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Compares checking movies against the user's filters by scanning and by bitmasks.
+
+Movies are matched the way the app matches them: one page at a time as the pages are
+ingested, with the filters' masks built once per page. Run from the project's root
+folder with ``PYTHONPATH=src python benchmarks/...``.
+"""
+import random
+import time
+
+from moviefinder.country_code import CountryCode
+from moviefinder.movie import genre_vocabulary
+from moviefinder.movie import Movie
+from moviefinder.movie import region_vocabulary
+from moviefinder.movie import service_vocabulary
+from moviefinder.movie import ServiceName
+
+MOVIE_COUNT = 100_000
+PAGE_SIZE = 20
+GENRES = [
+    "action",
+    "adventure",
+    "animation",
+    "comedy",
+    "crime",
+    "documentary",
+    "drama",
+    "family",
+    "fantasy",
+    "horror",
+    "mystery",
+    "romance",
+    "science fiction",
+    "thriller",
+]
+VIDEO_URLS = [
+    "https://www.amazon.com/a",
+    "https://tv.apple.com/a",
+    "https://www.disneyplus.com/a",
+    "https://www.hulu.com/a",
+    "https://www.netflix.com/a",
+]
+COUNTRIES = ["us", "gb", "ca", "de", "fr", "jp", "br", "in", "mx", "za"]
+
+
+def make_movie(i: int) -> Movie:
+    return Movie(
+        {
+            "imdbID": f"tt{i:08}",
+            "title": f"Movie {i}",
+            "genres": random.sample(GENRES, 3),
+            "countries": random.sample(COUNTRIES, 4),
+            "videoURL": random.choice(VIDEO_URLS),
+        }
+    )
+
+
+def scan_match(
+    movie: Movie,
+    genres: list[str],
+    services: list[ServiceName],
+    region: CountryCode,
+) -> bool:
+    """How movies were matched before they had bitmasks."""
+    if region not in movie.regions:
+        return False
+    for service in services:
+        if service in movie.services:
+            break
+    else:
+        return False
+    for genre in genres:
+        if genre in movie.genres:
+            break
+    else:
+        return False
+    return True
+
+
+def mask_match_page(
+    page: list[Movie],
+    genres: list[str],
+    services: list[ServiceName],
+    region: CountryCode,
+) -> list[bool]:
+    """How ``Movies.__add_movies`` matches each page of movies."""
+    genre_mask = genre_vocabulary.mask(genres)
+    service_mask = service_vocabulary.mask(services)
+    region_mask = region_vocabulary.mask([region])
+    return [
+        bool(
+            movie.genre_mask & genre_mask
+            and movie.service_mask & service_mask
+            and movie.region_mask & region_mask
+        )
+        for movie in page
+    ]
+
+
+def main() -> None:
+    random.seed(0)
+    pages = [
+        [make_movie(page * PAGE_SIZE + i) for i in range(PAGE_SIZE)]
+        for page in range(MOVIE_COUNT // PAGE_SIZE)
+    ]
+    genres = ["comedy", "horror", "thriller"]
+    services = [ServiceName.HULU, ServiceName.NETFLIX]
+    region = CountryCode.US
+
+    start = time.perf_counter()
+    scan_count = sum(
+        scan_match(movie, genres, services, region) for page in pages for movie in page
+    )
+    scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mask_count = sum(
+        sum(mask_match_page(page, genres, services, region)) for page in pages
+    )
+    mask_seconds = time.perf_counter() - start
+    assert scan_count == mask_count
+
+    print(
+        f"{MOVIE_COUNT:,} movies in {len(pages):,} pages of {PAGE_SIZE},"
+        f" {mask_count:,} matches"
+    )
+    print(f"scanning: {scan_seconds:.3f} s")
+    print(f"bitmasks: {mask_seconds:.3f} s")
+    print(f"speedup:  {scan_seconds / mask_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Times adding synthetic movies to the movies singleton one by one, and then
+deleting half of them one by one.
+
+The time per movie should stay about the same as the number of movies grows.
+
+Run from the project's root folder with ``PYTHONPATH=src python benchmarks/...``.
+"""
+import time
+
+from moviefinder.movie import Movie
+from moviefinder.movies import movies
+
+MOVIE_COUNTS = (25_000, 50_000, 100_000)
+
+
+def make_movie(i: int) -> Movie:
+    return Movie(
+        {
+            "imdbID": f"tt{i:08}",
+            "title": f"Movie {i}",
+            "genres": ["Action"],
+            "countries": ["us"],
+            "videoURL": "https://www.hulu.com/movie/abc",
+            "posterURL": f"https://image.tmdb.org/t/p/original/{i}.jpg",
+            "year": 2022,
+            "runtime": 100,
+        }
+    )
+
+
+def add_all(new_movies: list[Movie]) -> float:
+    movies.clear()
+    start = time.perf_counter()
+    for movie in new_movies:
+        movies[movie.id] = movie
+    for movie_id in movies.range():
+        pass
+    seconds = time.perf_counter() - start
+    assert len(movies) == len(new_movies)
+    return seconds
+
+
+def delete_half() -> float:
+    movie_ids = list(movies.range())
+    start = time.perf_counter()
+    for movie_id in movie_ids[::2]:
+        del movies[movie_id]
+    for movie_id in movies.range():
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    new_movies = [make_movie(i) for i in range(MOVIE_COUNTS[-1])]
+    for count in MOVIE_COUNTS:
+        seconds = add_all(new_movies[:count])
+        print(
+            f"{count:>7,} movies: {seconds:.3f} s,"
+            f" {seconds / count * 1e9:,.0f} ns per movie"
+        )
+        seconds = delete_half()
+        print(
+            f"{count // 2:>7,} deletes: {seconds:.3f} s,"
+            f" {seconds / (count // 2) * 1e9:,.0f} ns per movie"
+        )
+    movies.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compares decoding a large poster at full size and at thumbnail size, and how long
+the GUI thread is blocked when thumbnails are decoded in it or in the background.
+
+Run from the project's root folder with ``PYTHONPATH=src python benchmarks/...``.
+"""
+import time
+
+from moviefinder.movie import POSTER_HEIGHT
+from moviefinder.movie import POSTER_WIDTH
+from moviefinder.poster_cache import PosterCache
+from PySide6 import QtCore
+from PySide6 import QtGui
+from PySide6 import QtWidgets
+
+POSTER_COUNT = 30
+
+
+def make_jpeg(width: int, height: int) -> bytes:
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_RGB32)
+    painter = QtGui.QPainter(image)
+    gradient = QtGui.QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QtGui.QColor("navy"))
+    gradient.setColorAt(1, QtGui.QColor("orange"))
+    painter.fillRect(image.rect(), gradient)
+    painter.end()
+    buffer = QtCore.QBuffer()
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    image.save(buffer, "JPEG")
+    return bytes(buffer.data())
+
+
+def decode_all(jpeg: bytes, size: QtCore.QSize | None) -> tuple[float, int]:
+    cache = PosterCache(max_pixmap_bytes=2**40)
+    urls = [f"https://example.com/{i}.jpg" for i in range(POSTER_COUNT)]
+    for url in urls:
+        cache.set_data(url, jpeg)
+    start = time.perf_counter()
+    for url in urls:
+        cache.pixmap(url, size)
+    return time.perf_counter() - start, cache.pixmap_bytes // POSTER_COUNT
+
+
+def longest_gui_stall(jpeg: bytes, in_background: bool) -> float:
+    """Returns the longest time the GUI thread was busy while decoding thumbnails."""
+    app = QtWidgets.QApplication.instance()
+    cache = PosterCache(max_pixmap_bytes=2**40)
+    urls = [f"https://example.com/{i}.jpg" for i in range(POSTER_COUNT)]
+    for url in urls:
+        cache.set_data(url, jpeg)
+    size = QtCore.QSize(POSTER_WIDTH, POSTER_HEIGHT)
+    decoded_count = 0
+
+    def on_decoded(url: str) -> None:
+        nonlocal decoded_count
+        decoded_count += 1
+
+    cache.signals.pixmap_decoded.connect(on_decoded)
+    start = time.perf_counter()
+    if not in_background:
+        for url in urls:  # as when painting the newly visible posters
+            cache.pixmap(url, size)
+        return time.perf_counter() - start
+    for url in urls:
+        cache.pixmap_async(url, size)
+    longest = time.perf_counter() - start
+    while decoded_count < POSTER_COUNT:
+        start = time.perf_counter()
+        app.processEvents()
+        longest = max(longest, time.perf_counter() - start)
+    return longest
+
+
+def main() -> None:
+    app = QtWidgets.QApplication([])  # noqa: F841
+    jpeg = make_jpeg(2000, 3000)
+    full_seconds, full_bytes = decode_all(jpeg, None)
+    thumb_seconds, thumb_bytes = decode_all(
+        jpeg, QtCore.QSize(POSTER_WIDTH, POSTER_HEIGHT)
+    )
+    print(f"{POSTER_COUNT} 2000x3000 JPEG posters")
+    print(f"full size:      {full_seconds:.3f} s, {full_bytes:,} bytes per poster")
+    print(f"thumbnail size: {thumb_seconds:.3f} s, {thumb_bytes:,} bytes per poster")
+    print(f"speedup:        {full_seconds / thumb_seconds:.1f}x")
+    print(f"memory saved:   {full_bytes / thumb_bytes:.1f}x")
+    gui_seconds = longest_gui_stall(jpeg, in_background=False)
+    background_seconds = longest_gui_stall(jpeg, in_background=True)
+    print(f"longest GUI thread stall, decoding {POSTER_COUNT} thumbnails:")
+    print(f"  in the GUI thread:  {gui_seconds * 1000:.1f} ms")
+    print(f"  in the background:  {background_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
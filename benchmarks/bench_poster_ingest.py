@@ -0,0 +1,52 @@
+"""Compares sequential and concurrent poster downloads for one page of movies.
+
+Run from the project's root folder with ``PYTHONPATH=src python benchmarks/...``.
+"""
+import time
+from threading import Event
+
+from moviefinder.poster_fetcher import PosterFetcher
+from tests.image_server import ImageServer
+
+PAGE_SIZE = 30
+LATENCY_SECONDS = 0.1
+POSTER_BYTES = b"\xff" * 50_000
+
+
+def main() -> None:
+    with ImageServer(latency=LATENCY_SECONDS) as server:
+        urls = [server.add(f"/{i}.jpg", POSTER_BYTES) for i in range(PAGE_SIZE)]
+        fetcher = PosterFetcher()
+
+        start = time.perf_counter()
+        for url in urls:
+            assert fetcher.fetch(url) is not None
+        sequential_seconds = time.perf_counter() - start
+
+        done = Event()
+        first_poster_seconds = 0.0
+
+        def on_result(index: int, url: str, data: bytes | None) -> None:
+            nonlocal first_poster_seconds
+            assert data is not None
+            if index == 0:
+                first_poster_seconds = time.perf_counter() - start
+            if index == len(urls) - 1:
+                done.set()
+
+        start = time.perf_counter()
+        fetcher.stream(urls, on_result)
+        returned_seconds = time.perf_counter() - start
+        done.wait()
+        concurrent_seconds = time.perf_counter() - start
+
+    print(f"{PAGE_SIZE} posters, {LATENCY_SECONDS * 1000:.0f} ms latency each")
+    print(f"sequential:           {sequential_seconds:.3f} s")
+    print(f"concurrent:           {concurrent_seconds:.3f} s")
+    print(f"  returned after:     {returned_seconds:.3f} s")
+    print(f"  first poster after: {first_poster_seconds:.3f} s")
+    print(f"speedup:              {sequential_seconds / concurrent_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
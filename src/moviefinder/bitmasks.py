@@ -0,0 +1,44 @@
+from collections.abc import Hashable
+from collections.abc import Iterable
+from threading import Lock
+
+
+class Vocabulary:
+    """Interns values as bit positions so that sets of values can be stored as ints.
+
+    Each distinct value gets the next unused bit the first time it is seen, so a set of
+    values becomes one int with one bit set per value, and two sets overlap if and only
+    if their masks have a bit in common. This object is thread-safe.
+
+    Parameters
+    ----------
+    values : Iterable[Hashable]
+        Values to give the first bits to, in order.
+    """
+
+    def __init__(self, values: Iterable[Hashable] = ()):
+        self.__bits: dict[Hashable, int] = {}
+        self.__lock = Lock()
+        self.extend(values)
+
+    def __len__(self) -> int:
+        return len(self.__bits)
+
+    def bit(self, value: Hashable) -> int:
+        """Returns the value's bit position, assigning one if it does not have one."""
+        bit = self.__bits.get(value)
+        if bit is None:
+            with self.__lock:
+                bit = self.__bits.setdefault(value, len(self.__bits))
+        return bit
+
+    def extend(self, values: Iterable[Hashable]) -> None:
+        for value in values:
+            self.bit(value)
+
+    def mask(self, values: Iterable[Hashable]) -> int:
+        """Returns an int with the bits of the given values set."""
+        mask = 0
+        for value in values:
+            mask |= 1 << self.bit(value)
+        return mask
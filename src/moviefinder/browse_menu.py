@@ -8,27 +8,6 @@ from PySide6 import QtCore
 from PySide6 import QtWidgets
 
 
-class InfiniteScrollBar(QtWidgets.QScrollBar):
-    """A scroll bar that emits a signal when it nears and when it reaches the bottom."""
-
-    at_bottom = QtCore.Signal()
-    near_bottom = QtCore.Signal()
-
-    def __init__(self):
-        super().__init__()
-        self.setTracking(False)
-        self.valueChanged.connect(self.emit_at_bottom_if_true)
-        self.valueChanged.connect(self.emit_near_bottom_if_true)
-
-    def emit_at_bottom_if_true(self) -> None:
-        if self.value() == self.maximum():
-            self.at_bottom.emit()
-
-    def emit_near_bottom_if_true(self) -> None:
-        if self.value() >= self.maximum() - self.pageStep():
-            self.near_bottom.emit()
-
-
 class BrowseMenu(QtWidgets.QWidget):
     def __init__(self, main_window: QtWidgets.QMainWindow):
         QtWidgets.QWidget.__init__(self)
@@ -43,17 +22,18 @@ class BrowseMenu(QtWidgets.QWidget):
         )
         self.genres_combo_box.setCurrentData(movies.genres)
         self.layout.addWidget(self.genres_combo_box)
-        self.scroll_area = QtWidgets.QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_bar = InfiniteScrollBar()
-        self.scroll_area.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
-        self.scroll_bar.near_bottom.connect(self.add_row)
-        self.scroll_area.setVerticalScrollBar(self.scroll_bar)
+        self.search_line_edit = QtWidgets.QLineEdit()
+        self.search_line_edit.setPlaceholderText("Search titles, actors, and directors")
+        self.search_line_edit.setClearButtonEnabled(True)
+        self.layout.addWidget(self.search_line_edit)
+        # Searches once the user pauses typing instead of after every keystroke.
+        self.__search_timer = QtCore.QTimer(self)
+        self.__search_timer.setSingleShot(True)
+        self.__search_timer.setInterval(150)
+        self.__search_timer.timeout.connect(self.search)
+        self.search_line_edit.textChanged.connect(self.__search_timer.start)
         self.browse_widget = BrowseWidget(main_window)
-        if self.scroll_bar.value() == self.scroll_bar.maximum():
-            self.add_row()
-        self.scroll_area.setWidget(self.browse_widget)
-        self.layout.addWidget(self.scroll_area)
+        self.layout.addWidget(self.browse_widget)
 
     def reload_browse_widget_if_genres_changed(self) -> None:
         if self.main_window.is_quitting:
@@ -64,20 +44,48 @@ class BrowseMenu(QtWidgets.QWidget):
             self.genres_combo_box.setCurrentData(movies.genres)
             return
         if new_genres != movies.genres:
-            with LoadingDialog():
-                movies.genres = new_genres
-                self.main_window.clear_movies()
-                if not movies.load():
-                    show_message_box("Error: unable to connect to the service.")
-                    return
-                self.reload_browse_widget()
+            self.refilter(new_genres)
+
+    def refilter(self, genres: list[str]) -> None:
+        """Shows the movies that match new genres, or the user's new services or region.
+
+        The loaded movies that still match are shown right away. If none match, movies
+        are loaded in the background, and they are shown as they arrive.
+
+        Parameters
+        ----------
+        genres : list[str]
+            The new genres.
+        """
+        LoadingDialog.cancel_current()
+        is_any_match = movies.refilter(genres)
+        self.reload_browse_widget()
+        if not is_any_match:
+            loading_dialog = LoadingDialog(self.main_window)
+            loading_dialog.loaded.connect(self.__on_movies_loaded)
+
+    def __on_movies_loaded(self, is_loaded: bool) -> None:
+        if not is_loaded:
+            show_message_box("Error: unable to connect to the service.")
 
     def reload_browse_widget(self) -> None:
-        self.browse_widget = BrowseWidget(self.main_window)
-        self.scroll_area.setWidget(self.browse_widget)
+        """Shows the loaded movies, clearing the search if there is one."""
+        self.__search_timer.stop()
+        self.search_line_edit.blockSignals(True)
+        self.search_line_edit.clear()
+        self.search_line_edit.blockSignals(False)
+        self.browse_widget.show_movies()
+
+    def search(self) -> None:
+        """Shows the movies that match the search box's text.
 
-    def update_movie_widgets(self) -> None:
-        self.browse_widget.update_movie_widgets()
+        Shows the loaded movies instead if the search box is empty.
+        """
+        query = self.search_line_edit.text().strip()
+        if not query:
+            self.reload_browse_widget()
+            return
+        self.browse_widget.show_movies(movies.search(query))
 
-    def add_row(self) -> None:
-        self.browse_widget.add_row()
+    def update_movies(self) -> None:
+        self.browse_widget.update_movies()
@@ -1,114 +1,323 @@
+from moviefinder.buttons import toggle_heart
+from moviefinder.buttons import toggle_x
+from moviefinder.icons import icon
+from moviefinder.movie import POSTER_HEIGHT
+from moviefinder.movie import POSTER_WIDTH
+from moviefinder.movie_list_model import MovieListModel
 from moviefinder.movie_menu import MovieMenu
-from moviefinder.movie_widget import MovieWidget
 from moviefinder.movies import movies
-from moviefinder.worker import Worker
+from moviefinder.placeholder import paint_placeholder
+from moviefinder.poster_cache import poster_cache
+from moviefinder.resources import black_x_icon_path
+from moviefinder.resources import empty_heart_icon_path
+from moviefinder.resources import filled_heart_icon_path
+from moviefinder.resources import red_x_icon_path
 from PySide6 import QtCore
+from PySide6 import QtGui
 from PySide6 import QtWidgets
 
 
+class MovieDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints a movie's poster with heart and X buttons below it, and handles clicks.
+
+    Cells are only painted while they are visible, so movies cost nothing but a row in
+    the model until they are scrolled into view.
+    """
+
+    poster_clicked = QtCore.Signal(str)  # movie ID
+
+    MARGIN = 8
+    BUTTON_SIZE = 24
+
+    def __init__(self, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.__empty_heart_icon = icon(empty_heart_icon_path)
+        self.__filled_heart_icon = icon(filled_heart_icon_path)
+        self.__black_x_icon = icon(black_x_icon_path)
+        self.__red_x_icon = icon(red_x_icon_path)
+
+    def sizeHint(
+        self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex
+    ) -> QtCore.QSize:
+        return QtCore.QSize(
+            POSTER_WIDTH + 2 * self.MARGIN,
+            POSTER_HEIGHT + self.BUTTON_SIZE + 3 * self.MARGIN,
+        )
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> None:
+        movie = movies[index.data(MovieListModel.MOVIE_ID_ROLE)]
+        poster_rect, heart_rect, x_rect = self.__rects(option.rect)
+        device_pixel_ratio = option.widget.devicePixelRatioF()
+        # Posters are decoded in the background so that scrolling never waits for them,
+        # and placeholders are painted until they are ready.
+        pixmap = movie.poster.pixmap_async(poster_rect.size(), device_pixel_ratio)
+        if pixmap is None:
+            pixmap_rect = poster_rect
+            paint_placeholder(painter, pixmap_rect, movie.title)
+        else:
+            pixmap_size = pixmap.deviceIndependentSize().toSize()
+            pixmap_rect = QtCore.QRect(QtCore.QPoint(0, 0), pixmap_size)
+            pixmap_rect.moveCenter(poster_rect.center())
+            painter.drawPixmap(pixmap_rect, pixmap)
+        if option.state & QtWidgets.QStyle.State_MouseOver:
+            painter.save()
+            painter.setPen(option.palette.highlight().color())
+            painter.drawRect(pixmap_rect.adjusted(0, 0, -1, -1))
+            painter.restore()
+        heart_icon = (
+            self.__filled_heart_icon if movie.hearted else self.__empty_heart_icon
+        )
+        heart_icon.paint(
+            painter,
+            heart_rect,
+            mode=QtGui.QIcon.Disabled if movie.xed else QtGui.QIcon.Normal,
+        )
+        x_icon = self.__red_x_icon if movie.xed else self.__black_x_icon
+        x_icon.paint(
+            painter,
+            x_rect,
+            mode=QtGui.QIcon.Disabled if movie.hearted else QtGui.QIcon.Normal,
+        )
+
+    def editorEvent(
+        self,
+        event: QtCore.QEvent,
+        model: QtCore.QAbstractItemModel,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> bool:
+        if (
+            event.type() != QtCore.QEvent.MouseButtonRelease
+            or event.button() != QtCore.Qt.LeftButton
+        ):
+            return False
+        movie_id = index.data(MovieListModel.MOVIE_ID_ROLE)
+        movie = movies[movie_id]
+        poster_rect, heart_rect, x_rect = self.__rects(option.rect)
+        position = event.position().toPoint()
+        if poster_rect.contains(position):
+            self.poster_clicked.emit(movie_id)
+        elif heart_rect.contains(position) and not movie.xed:
+            toggle_heart(movie_id)
+        elif x_rect.contains(position) and not movie.hearted:
+            toggle_x(movie_id)
+        else:
+            return False
+        model.dataChanged.emit(index, index, [])
+        return True
+
+    def __rects(
+        self, cell_rect: QtCore.QRect
+    ) -> tuple[QtCore.QRect, QtCore.QRect, QtCore.QRect]:
+        """Returns where a cell's poster, heart button, and X button are."""
+        poster_rect = QtCore.QRect(
+            cell_rect.left() + self.MARGIN,
+            cell_rect.top() + self.MARGIN,
+            POSTER_WIDTH,
+            POSTER_HEIGHT,
+        )
+        buttons_top = poster_rect.bottom() + 1 + self.MARGIN
+        heart_rect = QtCore.QRect(
+            poster_rect.left(), buttons_top, self.BUTTON_SIZE, self.BUTTON_SIZE
+        )
+        x_rect = heart_rect.translated(self.BUTTON_SIZE + 2 * self.MARGIN, 0)
+        return poster_rect, heart_rect, x_rect
+
+
 class BrowseWidget(QtWidgets.QWidget):
-    """A widget that displays a list of movies and shows.
+    """A widget that displays a grid of movies and shows.
 
-    This widget is deleted and recreated every time the user changes the genres,
-    services, and/or region.
+    The grid is a list view over a ``MovieListModel``, and a ``MovieDelegate`` paints
+    each visible cell, so any number of movies can be shown. More movies are loaded in
+    the background as the user scrolls.
+
+    The same widget is reused when the user changes the genres, services, and/or
+    region, or searches; only its model is reset, by ``show_movies``.
+
+    Parameters
+    ----------
+    main_window : QtWidgets.QMainWindow
+        The main window.
+    search_results : list[str] | None
+        The IDs of the movies to show, such as from ``movies.search``. If None, the
+        loaded movies are shown, and more are loaded as the user scrolls.
     """
 
-    def __init__(self, main_window: QtWidgets.QMainWindow):
+    def __init__(
+        self,
+        main_window: QtWidgets.QMainWindow,
+        search_results: list[str] | None = None,
+    ):
         QtWidgets.QWidget.__init__(self)
-        self.__START_ROW_COUNT = 2
-        self.__MOVIES_PER_ROW = 4
-        self.__total_shown_movie_count = 0
-        self.__MAX_SHOWN_MOVIES = 30 * self.__MOVIES_PER_ROW
         self.main_window = main_window
         self.movie_menu: MovieMenu | None = None
         self.layout = QtWidgets.QVBoxLayout(self)
-        self.movies_layout = QtWidgets.QVBoxLayout()
-        self.layout.addLayout(self.movies_layout)
-        self.layout.addSpacerItem(QtWidgets.QSpacerItem(1, 100))
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.model = MovieListModel(search_results, self)
+        self.delegate = MovieDelegate(self)
+        self.delegate.poster_clicked.connect(self.show_movie_menu)
+        self.list_view = QtWidgets.QListView()
+        self.list_view.setViewMode(QtWidgets.QListView.IconMode)
+        self.list_view.setMovement(QtWidgets.QListView.Static)
+        self.list_view.setResizeMode(QtWidgets.QListView.Adjust)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.list_view.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.list_view.verticalScrollBar().setSingleStep(POSTER_HEIGHT // 8)
+        self.list_view.setMouseTracking(True)
+        self.list_view.setItemDelegate(self.delegate)
+        self.list_view.setModel(self.model)
+        self.layout.addWidget(self.list_view)
+        self.__empty_label = QtWidgets.QLabel()
+        self.layout.addWidget(self.__empty_label, alignment=QtCore.Qt.AlignCenter)
         self.__loading_label = QtWidgets.QLabel("<h2>Loading...</h2>")
         self.layout.addWidget(self.__loading_label, alignment=QtCore.Qt.AlignCenter)
-        self.movie_widgets: dict[str, MovieWidget] = {}  # movie_id: MovieWidget
-        self.__row_movie_count = 0
-        self.row_layout = QtWidgets.QHBoxLayout()
-        self.__movies_loader = Worker()
-        self.__movies_loader.done.connect(self.__add_row)
-        if movies:
-            self.load_starting_movie_rows()
-        else:
-            self.layout.addWidget(
-                QtWidgets.QLabel(
-                    "No movies match your chosen genres, services, and region."
-                )
-            )
+        # The movies in or near the viewport. The decoded posters of movies scrolled
+        # further away are released from the poster cache.
+        self.__nearby_ids: set[str] = set()
+        # Coalesces the many scroll events into one prefetch and one update of the
+        # posters' priorities every 50 ms, even while the user keeps scrolling.
+        self.__viewport_timer = QtCore.QTimer(self)
+        self.__viewport_timer.setSingleShot(True)
+        self.__viewport_timer.setInterval(50)
+        self.__viewport_timer.timeout.connect(self.prefetch)
+        self.__viewport_timer.timeout.connect(self.prioritize_posters)
+        self.list_view.verticalScrollBar().valueChanged.connect(
+            self.__on_viewport_changed
+        )
+        self.model.rowsInserted.connect(self.__update_labels)
+        self.model.modelReset.connect(self.__update_labels)
+        self.model.rowsInserted.connect(self.__on_viewport_changed)
+        self.model.modelReset.connect(self.__on_viewport_changed)
+        # Pages that failed to load are requested again after a while, even if the
+        # user doesn't scroll.
+        self.__retry_timer = QtCore.QTimer(self)
+        self.__retry_timer.setSingleShot(True)
+        self.__retry_timer.setInterval(5000)
+        self.__retry_timer.timeout.connect(self.prefetch)
+        movies.signals.page_loaded.connect(self.__on_page_loaded)
+        movies.signals.page_failed.connect(self.__on_page_failed)
+        poster_cache.signals.pixmap_decoded.connect(self.__on_pixmap_decoded)
+        self.__set_empty_text(search_results is not None)
+        self.__update_labels()
 
-    def load_starting_movie_rows(self) -> None:
-        for _ in range(self.__START_ROW_COUNT):
-            self.add_row()
+    def show_movies(self, search_results: list[str] | None = None) -> None:
+        """Shows other movies in the same view, scrolled to the top.
 
-    def update_movie_widgets(self) -> None:
-        for movie_widget in self.movie_widgets.values():
-            movie_widget.update_movie_data()
+        Parameters
+        ----------
+        search_results : list[str] | None
+            The IDs of the movies to show, such as from ``movies.search``. If None, the
+            loaded movies are shown, and more are loaded as the user scrolls.
+        """
+        self.__viewport_timer.stop()
+        self.__set_empty_text(search_results is not None)
+        self.model.set_movies(search_results)
+        self.list_view.scrollToTop()
+
+    def update_movies(self) -> None:
+        """Repaints the movies, such as after they were hearted in the movie menu."""
+        self.model.refresh()
 
     def show_movie_menu(self, movie_id: str) -> None:
         if self.movie_menu is None:
             self.movie_menu = MovieMenu(self.main_window)
             self.main_window.central_widget.addWidget(self.movie_menu)
-        if not self.movie_menu.update_movie_data(
-            movie_id, movies[movie_id].poster_pixmap
-        ):
+        if not self.movie_menu.update_movie_data(movie_id):
             print(f'Error: movie "{movie_id}" is invalid.')
         else:
             self.main_window.central_widget.setCurrentWidget(self.movie_menu)
 
-    def add_row(self) -> None:
-        """Loads more movies if needed and adds a row of movies to the browse widget."""
-        if self.__total_shown_movie_count >= self.__MAX_SHOWN_MOVIES:
-            print("Maximum number of movies shown.")
-            self.__loading_label.hide()
+    def prefetch(self) -> None:
+        """Loads more movies in the background ahead of the last visible movie."""
+        if not self.model.canFetchMore():
             return
-        if self.__total_shown_movie_count < len(movies):
-            self.__add_row()
-        if self.__total_shown_movie_count >= len(movies) - 3 * self.__MOVIES_PER_ROW:
-            if not self.__movies_loader.is_running:
-                self.__movies_loader.start(movies.load)
+        viewport_rect = self.list_view.viewport().rect()
+        last_index = self.list_view.indexAt(viewport_rect.bottomRight())
+        if last_index.isValid():
+            movies.prefetch(last_index.row() + 1)
+        else:  # the end of the movies is visible
+            movies.prefetch(self.model.rowCount())
 
-    def __add_row(self, ok: bool = True) -> None:
-        """Adds a row of movies to the browse widget.
+    def prioritize_posters(self) -> None:
+        """Downloads and decodes the posters of the movies in view first.
 
-        Parameters
-        ----------
-        ok : bool, optional
-            Whether the movies were loaded successfully. If False, the row is not added.
-            The default is True.
+        The posters of the movies within one screen above or below the viewport are
+        downloaded next, and all the others last. Decodes of posters that are neither in
+        nor near the viewport are cancelled, and the decoded posters of movies scrolled
+        out of that range are released.
         """
-        if not ok:
-            return
-        is_new_row = False
-        if self.__row_movie_count == 0:
-            is_new_row = True
-        elif self.__row_movie_count >= self.__MOVIES_PER_ROW:
-            is_new_row = True
-            self.__row_movie_count = 0
-            self.row_layout = QtWidgets.QHBoxLayout()
-        for movie_id in movies.range(self.__total_shown_movie_count):
-            if self.__row_movie_count >= self.__MOVIES_PER_ROW:
-                break
-            if movie_widget := self.__create_movie_widget(movie_id):
-                self.row_layout.addWidget(movie_widget)
-                self.__row_movie_count += 1
-                self.__total_shown_movie_count += 1
-        if is_new_row:
-            self.movies_layout.addLayout(self.row_layout)
+        row_count = self.model.rowCount()
+        first_cell = self.list_view.visualRect(self.model.index(0))
+        if not row_count or first_cell.isEmpty():
+            return  # there are no cells, or they have not been laid out yet
+        # Every cell has the same size, and they are laid out in rows left to right.
+        viewport_rect = self.list_view.viewport().rect()
+        column_count = max(1, viewport_rect.width() // first_cell.width())
+        first_line = max(
+            0, (viewport_rect.top() - first_cell.top()) // first_cell.height()
+        )
+        last_line = (viewport_rect.bottom() - first_cell.top()) // first_cell.height()
+        screen_lines = last_line - first_line + 1
+
+        def movie_ids(first: int, last: int) -> list[str]:
+            """Returns the IDs of the movies in the lines from first to last."""
+            start = max(0, first * column_count)
+            stop = min(row_count, (last + 1) * column_count)
+            return [self.model.movie_id(row) for row in range(start, stop)]
+
+        visible_ids = movie_ids(first_line, last_line)
+        nearby_ids = movie_ids(first_line - screen_lines, first_line - 1) + movie_ids(
+            last_line + 1, last_line + screen_lines
+        )
+        movies.prioritize_posters(visible_ids, nearby_ids)
+        poster_cache.prioritize_decodes(
+            [movies[movie_id].poster.url for movie_id in visible_ids],
+            [movies[movie_id].poster.url for movie_id in nearby_ids],
+        )
+        previous_ids = self.__nearby_ids
+        self.__nearby_ids = set(visible_ids) | set(nearby_ids)
+        poster_size = QtCore.QSize(POSTER_WIDTH, POSTER_HEIGHT)
+        device_pixel_ratio = self.list_view.devicePixelRatioF()
+        for movie_id in previous_ids - self.__nearby_ids:
+            movie = movies.get(movie_id)
+            if movie is not None:
+                movie.poster.release(poster_size, device_pixel_ratio)
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        super().resizeEvent(event)
+        self.__on_viewport_changed()
+
+    def __set_empty_text(self, is_search: bool) -> None:
+        if is_search:
+            self.__empty_label.setText("No movies match your search.")
         else:
-            scroll_bar = self.main_window.browse_menu.scroll_bar
-            if scroll_bar.value() == scroll_bar.maximum():
-                scroll_bar.setValue(scroll_bar.maximum() - 1)
-
-    def __create_movie_widget(self, movie_id: str) -> MovieWidget | None:
-        if movie_widget := MovieWidget(movie_id):
-            movie_widget.poster_button.clicked.connect(
-                lambda self=self, movie_id=movie_id: self.show_movie_menu(movie_id)
+            self.__empty_label.setText(
+                "No movies match your chosen genres, services, and region."
             )
-            self.movie_widgets[movie_id] = movie_widget
-            return movie_widget
-        return None
+
+    def __on_viewport_changed(self) -> None:
+        if not self.__viewport_timer.isActive():
+            self.__viewport_timer.start()
+
+    def __on_pixmap_decoded(self, url: str) -> None:
+        self.list_view.viewport().update()
+
+    def __on_page_loaded(self, page: int) -> None:
+        self.__loading_label.setText("<h2>Loading...</h2>")
+        self.__update_labels()
+
+    def __on_page_failed(self, page: int) -> None:
+        self.__loading_label.setText("<h2>Unable to load movies. Retrying...</h2>")
+        self.__retry_timer.start()
+
+    def __update_labels(self) -> None:
+        is_empty = self.model.rowCount() == 0
+        is_loading = self.model.canFetchMore() and movies.has_more_pages()
+        self.__empty_label.setVisible(is_empty and not is_loading)
+        self.__loading_label.setVisible(is_empty and is_loading)
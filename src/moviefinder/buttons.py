@@ -1,4 +1,5 @@
 from moviefinder.abstract_movie_widget import AbstractMovieWidget
+from moviefinder.icons import icon
 from moviefinder.movie import ServiceName
 from moviefinder.movies import movies
 from moviefinder.resources import black_x_icon_path
@@ -6,7 +7,6 @@ from moviefinder.resources import empty_heart_icon_path
 from moviefinder.resources import filled_heart_icon_path
 from moviefinder.resources import red_x_icon_path
 from moviefinder.user import user
-from PySide6 import QtGui
 from PySide6 import QtWidgets
 
 
@@ -27,44 +27,51 @@ def init_buttons(widget: AbstractMovieWidget, movie_id: str) -> None:
         lambda __on_x_click=__on_x_click, w=widget, id=movie_id: __on_x_click(w, id)
     )
     if movies[movie_id].hearted:
-        widget.heart_button.setIcon(QtGui.QIcon(filled_heart_icon_path))
+        widget.heart_button.setIcon(icon(filled_heart_icon_path))
         widget.x_button.setDisabled(True)
     else:
-        widget.heart_button.setIcon(QtGui.QIcon(empty_heart_icon_path))
+        widget.heart_button.setIcon(icon(empty_heart_icon_path))
         widget.x_button.setDisabled(False)
     if movies[movie_id].xed:
-        widget.x_button.setIcon(QtGui.QIcon(red_x_icon_path))
+        widget.x_button.setIcon(icon(red_x_icon_path))
         widget.heart_button.setDisabled(True)
     else:
-        widget.x_button.setIcon(QtGui.QIcon(black_x_icon_path))
+        widget.x_button.setIcon(icon(black_x_icon_path))
         widget.heart_button.setDisabled(False)
 
 
+def toggle_heart(movie_id: str) -> None:
+    """Hearts or unhearts a movie and updates the user's genre habits."""
+    movie = movies[movie_id]
+    movie.hearted = not movie.hearted
+    for genre in movie.genres:
+        user.genre_habits[genre] += 1 if movie.hearted else -1
+
+
+def toggle_x(movie_id: str) -> None:
+    """Xes or un-Xes a movie."""
+    movies[movie_id].xed = not movies[movie_id].xed
+
+
 def __on_heart_click(widget: AbstractMovieWidget, movie_id: str) -> None:
     """Responds to a widget's heart button being clicked."""
-    if not movies[movie_id].hearted:
-        movies[movie_id].hearted = True
-        widget.heart_button.setIcon(QtGui.QIcon(filled_heart_icon_path))
+    toggle_heart(movie_id)
+    if movies[movie_id].hearted:
+        widget.heart_button.setIcon(icon(filled_heart_icon_path))
         widget.x_button.setDisabled(True)
-        for genre in movies[movie_id].genres:
-            user.genre_habits[genre] += 1
     else:
-        movies[movie_id].hearted = False
-        widget.heart_button.setIcon(QtGui.QIcon(empty_heart_icon_path))
+        widget.heart_button.setIcon(icon(empty_heart_icon_path))
         widget.x_button.setDisabled(False)
-        for genre in movies[movie_id].genres:
-            user.genre_habits[genre] -= 1
 
 
 def __on_x_click(widget: AbstractMovieWidget, movie_id: str) -> None:
     """Responds to a widget's x button being clicked."""
-    if not movies[movie_id].xed:
-        movies[movie_id].xed = True
-        widget.x_button.setIcon(QtGui.QIcon(red_x_icon_path))
+    toggle_x(movie_id)
+    if movies[movie_id].xed:
+        widget.x_button.setIcon(icon(red_x_icon_path))
         widget.heart_button.setDisabled(True)
     else:
-        movies[movie_id].xed = False
-        widget.x_button.setIcon(QtGui.QIcon(black_x_icon_path))
+        widget.x_button.setIcon(icon(black_x_icon_path))
         widget.heart_button.setDisabled(False)
 
 
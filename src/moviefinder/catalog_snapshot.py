@@ -0,0 +1,82 @@
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any
+
+from PySide6 import QtCore
+
+
+SNAPSHOT_MAGIC = b"MFCS"
+SNAPSHOT_FORMAT_VERSION = 1
+# The magic bytes, the format version, the CRC-32 of the payload, and the payload's
+# length, followed by the payload: zlib-compressed UTF-8 JSON.
+__header = struct.Struct("<4sHII")
+
+
+def snapshot_path() -> Path:
+    """Returns where the catalog snapshot is saved in the app data folder."""
+    app_data = QtCore.QStandardPaths.writableLocation(
+        QtCore.QStandardPaths.AppDataLocation
+    )
+    return Path(app_data) / "catalog.snapshot"
+
+
+def write_snapshot(path: Path, state: dict[str, Any]) -> bool:
+    """Saves a catalog snapshot atomically.
+
+    Returns True if the snapshot was saved, returns False otherwise.
+
+    Parameters
+    ----------
+    path : Path
+        Where to save the snapshot.
+    state : dict[str, Any]
+        The state to save. It must be JSON serializable.
+    """
+    payload = zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf8"))
+    header = __header.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, zlib.crc32(payload), len(payload)
+    )
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.write_bytes(header + payload)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Error: unable to save the catalog snapshot: {e}")
+        return False
+    return True
+
+
+def read_snapshot(path: Path) -> dict[str, Any] | None:
+    """Reads a catalog snapshot.
+
+    Returns None if there is no snapshot, or if it has a different format version or
+    is corrupt.
+    """
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    header_size = __header.size
+    if len(data) < header_size:
+        print("Error: the catalog snapshot is truncated.")
+        return None
+    magic, version, crc, length = __header.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        print("Error: the catalog snapshot is not a catalog snapshot.")
+        return None
+    if version != SNAPSHOT_FORMAT_VERSION:
+        print(f"Ignoring a catalog snapshot with format version {version}.")
+        return None
+    payload = data[header_size:]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        print("Error: the catalog snapshot is corrupt.")
+        return None
+    try:
+        return json.loads(zlib.decompress(payload))
+    except (zlib.error, ValueError) as e:
+        print(f"Error: unable to read the catalog snapshot: {e}")
+        return None
@@ -0,0 +1,379 @@
+import json
+import re
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from moviefinder.country_code import CountryCode
+from moviefinder.movie import Movie
+from moviefinder.movie import ServiceName
+from PySide6 import QtCore
+
+
+# The FTS5 index reads the indexed columns from the movies table, and the triggers keep
+# it in sync. Prefix indexes make searches for partly typed words fast. The availability
+# column lists a token for each region and service a movie can be watched in, such as
+# "ushulu", so searches can skip the movies the user can't watch inside the index,
+# before the matches are ranked and limited.
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS movies (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    tagline TEXT NOT NULL,
+    overview TEXT NOT NULL,
+    actors TEXT NOT NULL,
+    directors TEXT NOT NULL,
+    availability TEXT NOT NULL DEFAULT '',
+    info TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+    title, tagline, overview, actors, directors, availability,
+    content = 'movies', content_rowid = 'rowid',
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3'
+);
+CREATE TRIGGER IF NOT EXISTS movies_after_insert AFTER INSERT ON movies BEGIN
+    INSERT INTO movies_fts (
+        rowid, title, tagline, overview, actors, directors, availability
+    )
+    VALUES (
+        new.rowid, new.title, new.tagline, new.overview, new.actors, new.directors,
+        new.availability
+    );
+END;
+CREATE TRIGGER IF NOT EXISTS movies_after_delete AFTER DELETE ON movies BEGIN
+    INSERT INTO movies_fts (
+        movies_fts, rowid, title, tagline, overview, actors, directors, availability
+    )
+    VALUES (
+        'delete', old.rowid, old.title, old.tagline, old.overview, old.actors,
+        old.directors, old.availability
+    );
+END;
+CREATE TRIGGER IF NOT EXISTS movies_after_update AFTER UPDATE ON movies BEGIN
+    INSERT INTO movies_fts (
+        movies_fts, rowid, title, tagline, overview, actors, directors, availability
+    )
+    VALUES (
+        'delete', old.rowid, old.title, old.tagline, old.overview, old.actors,
+        old.directors, old.availability
+    );
+    INSERT INTO movies_fts (
+        rowid, title, tagline, overview, actors, directors, availability
+    )
+    VALUES (
+        new.rowid, new.title, new.tagline, new.overview, new.actors, new.directors,
+        new.availability
+    );
+END;
+"""
+# Stores saved before availability was stored get the column, and their full-text index
+# is dropped so it can be rebuilt with it.
+CATALOG_MIGRATION = """
+DROP TRIGGER IF EXISTS movies_after_insert;
+DROP TRIGGER IF EXISTS movies_after_delete;
+DROP TRIGGER IF EXISTS movies_after_update;
+DROP TABLE IF EXISTS movies_fts;
+"""
+# The columns searched for the words of a query.
+TEXT_COLUMNS = "{title tagline overview actors directors}"
+
+
+class CatalogStore:
+    """A SQLite database of every movie received from the service, for searching.
+
+    Each movie's details are stored as the JSON the service sent, and an FTS5 full-text
+    index over the titles, taglines, overviews, actors, and directors ranks search
+    results with BM25. The index also has the regions and services each movie is
+    available in, so searches can be limited to the movies the user can watch in the
+    same query. Searching needs no network requests, so it works offline with every
+    movie received so far, even in earlier launches. This object is thread-safe.
+
+    Parameters
+    ----------
+    path : str | Path | None
+        The database file, or ":memory:" for a database that is not saved. If None,
+        ``catalog.sqlite3`` in the app data folder is used. The database is opened the
+        first time it is used.
+    max_ranked_matches : int
+        Ranking costs far more than matching, so searches that match more movies than
+        this only rank the movies that match in their titles, and list the other
+        matches after them unranked.
+    """
+
+    # How much more a search term counts in each column than in the overview.
+    TITLE_WEIGHT = 10.0
+    TAGLINE_WEIGHT = 2.0
+    OVERVIEW_WEIGHT = 1.0
+    ACTORS_WEIGHT = 3.0
+    DIRECTORS_WEIGHT = 3.0
+
+    def __init__(self, path: str | Path | None = None, max_ranked_matches: int = 2000):
+        self.max_ranked_matches = max_ranked_matches
+        self.__path = path
+        self.__connection: sqlite3.Connection | None = None
+        self.__lock = Lock()
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return self.__connect().execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+
+    def add(self, movies: Iterable[Movie]) -> None:
+        """Adds movies, or replaces them if they are already stored.
+
+        Parameters
+        ----------
+        movies : Iterable[Movie]
+            Valid movies. Their details from the service are stored, along with the
+            regions and services they are available in.
+        """
+        rows = [
+            (
+                movie.id,
+                movie.info.get("title", ""),
+                movie.info.get("tagline", ""),
+                movie.info.get("overview", ""),
+                ", ".join(movie.info.get("cast", [])),
+                ", ".join(movie.info.get("director", [])),
+                self.__availability(movie),
+                json.dumps(movie.info),
+            )
+            for movie in movies
+        ]
+        with self.__lock:
+            try:
+                connection = self.__connect()
+                with connection:
+                    connection.executemany(
+                        """
+                        INSERT INTO movies (
+                            id, title, tagline, overview, actors, directors,
+                            availability, info
+                        )
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (id) DO UPDATE SET
+                            title = excluded.title,
+                            tagline = excluded.tagline,
+                            overview = excluded.overview,
+                            actors = excluded.actors,
+                            directors = excluded.directors,
+                            availability = excluded.availability,
+                            info = excluded.info
+                        """,
+                        rows,
+                    )
+            except sqlite3.Error as e:
+                print(f"Error: unable to save movies to the catalog store: {e}")
+
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        region: CountryCode | None = None,
+        services: Iterable[ServiceName] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Returns the details of the movies that best match a search, best first.
+
+        Every word of the query must match the start of a word in a movie's title,
+        tagline, overview, actors, or directors, so results can be shown while the user
+        is still typing the last word. Single letters must match whole words though,
+        because nearly every movie has words starting with any given letter.
+
+        Parameters
+        ----------
+        query : str
+            The words to search for. Punctuation is ignored.
+        limit : int
+            The most results to return.
+        region : CountryCode | None
+            If given along with ``services``, only the movies available in this region
+            on any of the services are returned. They are filtered in the full-text
+            index, before the matches are ranked and limited.
+        services : Iterable[ServiceName] | None
+            See ``region``.
+        """
+        words = re.findall(r"\w+", query.lower())
+        if not words:
+            return []
+        match = " ".join(
+            f'"{word}"*' if len(word) > 1 else f'"{word}"' for word in words
+        )
+        availability_match = ""
+        if region is not None and services is not None:
+            tokens = [
+                self.__availability_token(region, service) for service in services
+            ]
+            if not tokens:
+                return []
+            availability_match = f" AND {{availability}} : ({' OR '.join(tokens)})"
+        with self.__lock:
+            try:
+                rows = self.__search(match, availability_match, limit)
+            except sqlite3.Error as e:
+                print(f"Error: unable to search the catalog store: {e}")
+                return []
+        return [json.loads(info) for info, in rows]
+
+    def __search(
+        self, match: str, availability_match: str, limit: int
+    ) -> list[tuple[str]]:
+        """Returns the details of the best matches of an FTS5 query, best first.
+
+        ``match`` is searched for in the text columns, and ``availability_match`` is
+        added to each query to filter the matches. Only call this while holding
+        ``self.__lock``.
+        """
+        connection = self.__connect()
+        text_match = f"{TEXT_COLUMNS} : ({match})"
+        (match_count,) = connection.execute(
+            """
+            SELECT COUNT(*) FROM (
+                SELECT 1 FROM movies_fts WHERE movies_fts MATCH ? LIMIT ?
+            )
+            """,
+            (text_match + availability_match, self.max_ranked_matches + 1),
+        ).fetchone()
+        if match_count <= self.max_ranked_matches:
+            return self.__ranked_rows(
+                connection, text_match + availability_match, limit
+            )
+        # Only the movies that match in their titles are ranked, followed by the other
+        # matches in the order they were added.
+        title_match = f"{{title}} : ({match})"
+        rows = self.__ranked_rows(connection, title_match + availability_match, limit)
+        if len(rows) < limit:
+            rows += connection.execute(
+                """
+                SELECT movies.info FROM movies_fts
+                JOIN movies ON movies.rowid = movies_fts.rowid
+                WHERE movies_fts MATCH ?
+                LIMIT ?
+                """,
+                (
+                    f"({text_match} NOT {title_match}){availability_match}",
+                    limit - len(rows),
+                ),
+            ).fetchall()
+        return rows
+
+    def __ranked_rows(
+        self, connection: sqlite3.Connection, match: str, limit: int
+    ) -> list[tuple[str]]:
+        """Returns the details of the matches of an FTS5 query ranked by BM25."""
+        return connection.execute(
+            """
+            SELECT movies.info FROM movies_fts
+            JOIN movies ON movies.rowid = movies_fts.rowid
+            WHERE movies_fts MATCH ?
+            ORDER BY bm25(movies_fts, ?, ?, ?, ?, ?, 0)
+            LIMIT ?
+            """,
+            (
+                match,
+                self.TITLE_WEIGHT,
+                self.TAGLINE_WEIGHT,
+                self.OVERVIEW_WEIGHT,
+                self.ACTORS_WEIGHT,
+                self.DIRECTORS_WEIGHT,
+                limit,
+            ),
+        ).fetchall()
+
+    @classmethod
+    def __availability(cls, movie: Movie) -> str:
+        """Returns the tokens of the regions and services a movie is available in."""
+        return " ".join(
+            sorted(
+                {
+                    cls.__availability_token(region, service)
+                    for region in movie.regions
+                    for service in movie.services
+                }
+            )
+        )
+
+    @staticmethod
+    def __availability_token(region: CountryCode, service: ServiceName) -> str:
+        return f"{region.name}{service.value}".lower()
+
+    @staticmethod
+    def __needs_migration(connection: sqlite3.Connection) -> bool:
+        """Returns whether a store was saved before availability was stored.
+
+        A migration that was interrupted leaves the full-text index without the
+        availability column or missing, so it is finished the next time.
+        """
+        movies_columns = [
+            row[1] for row in connection.execute("PRAGMA table_info(movies)")
+        ]
+        fts_columns = [
+            row[1] for row in connection.execute("PRAGMA table_info(movies_fts)")
+        ]
+        return bool(movies_columns) and "availability" not in fts_columns
+
+    def __migrate(self, connection: sqlite3.Connection) -> None:
+        """Stores the availability of the movies in a store saved before it was stored.
+
+        Only call this while holding ``self.__lock``.
+        """
+        connection.executescript(CATALOG_MIGRATION)
+        movies_columns = [
+            row[1] for row in connection.execute("PRAGMA table_info(movies)")
+        ]
+        if "availability" not in movies_columns:
+            connection.execute(
+                "ALTER TABLE movies ADD COLUMN availability TEXT NOT NULL DEFAULT ''"
+            )
+        with connection:
+            rows = connection.execute("SELECT rowid, info FROM movies").fetchall()
+            movies = ((rowid, Movie(json.loads(info))) for rowid, info in rows)
+            connection.executemany(
+                "UPDATE movies SET availability = ? WHERE rowid = ?",
+                [
+                    (self.__availability(movie), rowid)
+                    for rowid, movie in movies
+                    if movie
+                ],
+            )
+        # The index is created and filled in one transaction, so it is never left empty.
+        connection.executescript(
+            f"""
+            BEGIN;
+            {CATALOG_SCHEMA}
+            INSERT INTO movies_fts (movies_fts) VALUES ('rebuild');
+            COMMIT;
+            """
+        )
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+    def __connect(self) -> sqlite3.Connection:
+        """Opens and sets up the database if it is not open yet.
+
+        Only call this while holding ``self.__lock``.
+        """
+        if self.__connection is not None:
+            return self.__connection
+        if self.__path is None:
+            app_data = QtCore.QStandardPaths.writableLocation(
+                QtCore.QStandardPaths.AppDataLocation
+            )
+            self.__path = Path(app_data) / "catalog.sqlite3"
+        if self.__path != ":memory:":
+            Path(self.__path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.__path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode = WAL")
+        if self.__needs_migration(connection):
+            self.__migrate(connection)
+        connection.executescript(CATALOG_SCHEMA)
+        self.__connection = connection
+        return connection
+
+
+catalog_store = CatalogStore()
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+
+from PySide6 import QtCore
+
+
+@dataclass
+class CacheEntry:
+    """A file from a ``DiskCache`` and the HTTP headers it was downloaded with."""
+
+    data: bytes
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+    is_fresh: bool
+
+    def revalidation_headers(self) -> dict[str, str]:
+        """Returns the headers for a conditional request for this entry's URL."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class DiskCache:
+    """A least-recently-used cache of downloaded files in the device's app data folder.
+
+    Files are stored under the SHA-256 hash of their URL, each next to a small JSON
+    file with the ETag and Last-Modified headers they were downloaded with. Entries
+    younger than ``max_age_seconds`` are fresh and can be used without any network
+    requests; older entries should be revalidated with the headers from
+    ``CacheEntry.revalidation_headers``. This object is thread-safe.
+
+    Parameters
+    ----------
+    name : str
+        The name of the cache's folder inside the app data folder.
+    max_bytes : int
+        The size limit of all of the cached files together. The least recently used
+        files are deleted when the cache grows beyond this.
+    max_age_seconds : float
+        How long a file can be used before it must be revalidated.
+    directory : str | Path | None
+        The cache's folder. If None, a folder named ``name`` in the app data folder is
+        used.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int = 200 * 1024 * 1024,
+        max_age_seconds: float = 7 * 24 * 60 * 60,
+        directory: str | Path | None = None,
+    ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hit_count = 0
+        self.miss_count = 0
+        self.revalidation_count = 0
+        self.__directory = Path(directory) if directory is not None else None
+        self.__total_bytes: int | None = None
+        self.__lock = Lock()
+
+    @property
+    def directory(self) -> Path:
+        if self.__directory is None:
+            app_data = QtCore.QStandardPaths.writableLocation(
+                QtCore.QStandardPaths.AppDataLocation
+            )
+            self.__directory = Path(app_data) / self.name
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        return self.__directory
+
+    @property
+    def total_bytes(self) -> int:
+        """The size of all of the cached files together."""
+        with self.__lock:
+            return self.__get_total_bytes()
+
+    def get(self, url: str) -> CacheEntry | None:
+        """Returns the cached file for a URL, or None if it is not cached."""
+        data_path, meta_path = self.__paths(url)
+        try:
+            data = data_path.read_bytes()
+            meta = json.loads(meta_path.read_text(encoding="utf8"))
+        except (OSError, ValueError):
+            with self.__lock:
+                self.miss_count += 1
+            return None
+        try:
+            os.utime(data_path)  # marks the file as recently used
+        except OSError:
+            pass
+        is_fresh = time.time() - meta["stored_at"] < self.max_age_seconds
+        with self.__lock:
+            if is_fresh:
+                self.hit_count += 1
+            else:
+                self.revalidation_count += 1
+        return CacheEntry(
+            data=data,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            stored_at=meta["stored_at"],
+            is_fresh=is_fresh,
+        )
+
+    def put(
+        self,
+        url: str,
+        data: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Saves a downloaded file and evicts old files if the cache is too big."""
+        data_path, meta_path = self.__paths(url)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+        }
+        with self.__lock:
+            total_bytes = self.__get_total_bytes()
+            try:
+                total_bytes -= data_path.stat().st_size
+            except OSError:
+                pass
+            try:
+                self.__write_atomically(data_path, data)
+                self.__write_atomically(meta_path, json.dumps(meta).encode("utf8"))
+            except OSError as e:
+                print(f"Error: unable to cache {url}: {e}")
+                self.__total_bytes = None
+                return
+            self.__total_bytes = total_bytes + len(data)
+            if self.__total_bytes > self.max_bytes:
+                self.__evict()
+
+    def refresh(self, url: str) -> None:
+        """Marks a cached file as fresh again after the server said it is unchanged."""
+        _, meta_path = self.__paths(url)
+        with self.__lock:
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf8"))
+                meta["stored_at"] = time.time()
+                self.__write_atomically(meta_path, json.dumps(meta).encode("utf8"))
+            except (OSError, ValueError) as e:
+                print(f"Error: unable to refresh the cache entry for {url}: {e}")
+
+    def clear(self) -> None:
+        """Deletes all of the cached files."""
+        with self.__lock:
+            for path in self.directory.iterdir():
+                path.unlink(missing_ok=True)
+            self.__total_bytes = 0
+
+    def __paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf8")).hexdigest()
+        return self.directory / key, self.directory / f"{key}.json"
+
+    def __get_total_bytes(self) -> int:
+        if self.__total_bytes is None:
+            self.__total_bytes = sum(
+                entry.stat().st_size
+                for entry in os.scandir(self.directory)
+                if "." not in entry.name
+            )
+        return self.__total_bytes
+
+    def __evict(self) -> None:
+        """Deletes the least recently used files until the cache is small enough."""
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if "." not in entry.name),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        total_bytes = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            total_bytes -= entry.stat().st_size
+            Path(entry.path).unlink(missing_ok=True)
+            Path(f"{entry.path}.json").unlink(missing_ok=True)
+        self.__total_bytes = total_bytes
+
+    @staticmethod
+    def __write_atomically(path: Path, data: bytes) -> None:
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
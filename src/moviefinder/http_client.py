@@ -0,0 +1,161 @@
+import random
+import time
+from bisect import bisect_right
+from threading import Lock
+from urllib.parse import urlsplit
+
+import requests
+from moviefinder.task_scheduler import Priority
+from moviefinder.task_scheduler import task_scheduler
+from requests.adapters import HTTPAdapter
+
+
+class HttpClient:
+    """The HTTP client that all of the app's network requests go through.
+
+    Connections are kept alive in a pool per host, so most requests skip the TCP and
+    TLS handshakes. Every request has connect and read timeouts unless others are
+    given. Idempotent requests that fail with a connection error, a timeout, or a
+    temporary server error are retried after a jittered exponential backoff. The
+    latency of each endpoint is tracked in a histogram. This object is thread-safe.
+
+    Parameters
+    ----------
+    timeout : tuple[float, float]
+        The default connect and read timeouts, in seconds.
+    max_retries : int
+        How many times to retry a failed idempotent request.
+    backoff_seconds : float
+        The average delay before the first retry. Each retry waits twice as long as
+        the previous one on average.
+    max_connections_per_host : int
+        The maximum number of kept-alive connections to each host.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+    # The upper bounds, in milliseconds, of the latency histograms' buckets. The last
+    # bucket has no upper bound.
+    LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(
+        self,
+        timeout: tuple[float, float] = (3.05, 15),
+        max_retries: int = 2,
+        backoff_seconds: float = 0.25,
+        max_connections_per_host: int = 12,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max_connections_per_host)
+        self.__session.mount("http://", adapter)
+        self.__session.mount("https://", adapter)
+        self.__latency_histograms: dict[str, list[int]] = {}
+        self.__lock = Lock()
+
+    def request(
+        self, method: str, url: str, endpoint: str | None = None, **kwargs
+    ) -> requests.Response:
+        """Sends a request and returns its response.
+
+        Raises ``requests.exceptions.RequestException`` if the request could not be
+        completed, even after retrying.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method, such as "GET".
+        url : str
+            The URL to send the request to.
+        endpoint : str | None
+            The name to track the request's latency under. If None, the method, host,
+            and path are used.
+        **kwargs
+            Passed to ``requests.Session.request``.
+        """
+        method = method.upper()
+        if endpoint is None:
+            split_url = urlsplit(url)
+            endpoint = f"{method} {split_url.netloc}{split_url.path}"
+        kwargs.setdefault("timeout", self.timeout)
+        max_retries = self.max_retries if method in self.IDEMPOTENT_METHODS else 0
+        for attempt in range(max_retries + 1):
+            start = time.perf_counter()
+            try:
+                response = self.__session.request(method, url, **kwargs)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                if attempt == max_retries:
+                    raise
+                print(f"Retrying {endpoint} after error: {e}")
+            else:
+                self.__record_latency(endpoint, time.perf_counter() - start)
+                if (
+                    response.status_code not in self.RETRY_STATUS_CODES
+                    or attempt == max_retries
+                ):
+                    return response
+                print(f"Retrying {endpoint} after status {response.status_code}.")
+            time.sleep(self.backoff_seconds * 2**attempt * random.uniform(0.5, 1.5))
+        raise AssertionError("unreachable")
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def warm_up(self, urls: list[str]) -> None:
+        """Opens connections to the given URLs' hosts in a background task.
+
+        This way the first real requests to those hosts do not pay for the TCP and TLS
+        handshakes.
+        """
+
+        def warm_up_connections() -> None:
+            for url in urls:
+                try:
+                    self.request("HEAD", url, endpoint=f"HEAD {urlsplit(url).netloc}")
+                except requests.exceptions.RequestException as e:
+                    print(f"Unable to warm up a connection to {url}: {e}")
+
+        task_scheduler.submit(warm_up_connections, priority=Priority.BACKGROUND)
+
+    def latency_histograms(self) -> dict[str, list[int]]:
+        """Returns the number of requests per latency bucket for each endpoint.
+
+        See ``LATENCY_BUCKETS_MS`` for the buckets' upper bounds.
+        """
+        with self.__lock:
+            return {
+                endpoint: list(counts)
+                for endpoint, counts in self.__latency_histograms.items()
+            }
+
+    def print_latency_histograms(self) -> None:
+        labels = [f"<{ms}ms" for ms in self.LATENCY_BUCKETS_MS]
+        labels.append(f">={self.LATENCY_BUCKETS_MS[-1]}ms")
+        for endpoint, counts in sorted(self.latency_histograms().items()):
+            buckets = ", ".join(
+                f"{label}: {count}" for label, count in zip(labels, counts) if count
+            )
+            print(f"{endpoint} ({sum(counts)} requests): {buckets}")
+
+    def __record_latency(self, endpoint: str, seconds: float) -> None:
+        bucket = bisect_right(self.LATENCY_BUCKETS_MS, seconds * 1000)
+        with self.__lock:
+            if endpoint not in self.__latency_histograms:
+                self.__latency_histograms[endpoint] = [0] * (
+                    len(self.LATENCY_BUCKETS_MS) + 1
+                )
+            self.__latency_histograms[endpoint][bucket] += 1
+
+
+http_client = HttpClient()
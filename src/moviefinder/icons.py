@@ -0,0 +1,46 @@
+from functools import lru_cache
+
+from PySide6 import QtCore
+from PySide6 import QtGui
+from PySide6 import QtSvg
+
+
+# The sizes icons are shown at in device-independent pixels: buttons' default icon
+# size, and the browse grid's heart and X buttons.
+ICON_SIZES = (16, 24)
+
+
+@lru_cache(maxsize=None)
+def icon(path: str) -> QtGui.QIcon:
+    """Returns an icon from ``moviefinder.resources``, shared by every caller.
+
+    Each SVG file is read and parsed once, and rendered once at each of ``ICON_SIZES``
+    for each screen's device pixel ratio, so showing the icon again does no file I/O
+    or rasterizing. Only use this in the GUI thread after the app has been created.
+
+    Parameters
+    ----------
+    path : str
+        The path of the icon's SVG file.
+    """
+    renderer = QtSvg.QSvgRenderer(path)
+    if not renderer.isValid():
+        print(f"Error: unable to load the icon {path}")
+        return QtGui.QIcon(path)
+    device_pixel_ratios = {1.0} | {
+        screen.devicePixelRatio() for screen in QtGui.QGuiApplication.screens()
+    }
+    result = QtGui.QIcon()
+    for device_pixel_ratio in sorted(device_pixel_ratios):
+        for size in ICON_SIZES:
+            pixel_size = round(size * device_pixel_ratio)
+            image = QtGui.QImage(
+                pixel_size, pixel_size, QtGui.QImage.Format_ARGB32_Premultiplied
+            )
+            image.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(image)
+            renderer.render(painter)
+            painter.end()
+            image.setDevicePixelRatio(device_pixel_ratio)
+            result.addPixmap(QtGui.QPixmap.fromImage(image))
+    return result
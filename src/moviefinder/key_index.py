@@ -0,0 +1,109 @@
+from collections.abc import Iterable
+from collections.abc import Iterator
+from itertools import islice
+
+
+class KeySnapshot:
+    """An immutable view of the keys in a ``KeyIndex`` at one version.
+
+    Snapshots can be read from any thread without locking, even while the index they
+    came from is being changed.
+    """
+
+    __slots__ = ("version", "__keys", "__length")
+
+    def __init__(self, version: int, keys: list[str], length: int):
+        self.version = version
+        # The index may append to this list, but never past ``length`` is part of this
+        # snapshot, and it never changes the first ``length`` keys.
+        self.__keys = keys
+        self.__length = length
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __iter__(self) -> Iterator[str]:
+        return islice(self.__keys, self.__length)
+
+    def __getitem__(self, index: int) -> str:
+        return self.__keys[range(self.__length)[index]]
+
+    def slice(self, start: int = 0, stop: int | None = None) -> list[str]:
+        """Returns the keys from position ``start`` up to but not including ``stop``."""
+        positions = range(self.__length)[start:stop]
+        start, stop = positions.start, positions.stop
+        return self.__keys[start:stop]
+
+
+class KeyIndex:
+    """An insertion-ordered set of keys with positional access.
+
+    Membership tests, appends, and removals take constant time. Removed keys are
+    compacted away the next time keys are accessed by position, so removing any number
+    of keys and then reading costs one linear pass.
+
+    ``snapshot`` returns an immutable view of the keys that stays valid while the index
+    changes. The list of keys is shared with snapshots and only ever appended to;
+    removing keys and clearing copy it instead of changing it. This object is not
+    thread-safe, but its snapshots are.
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self.__keys: list[str] = []  # may also contain removed keys
+        self.__members: dict[str, None] = {}  # an ordered set of the keys not removed
+        self.__version = 0
+        self.extend(keys)
+
+    @property
+    def version(self) -> int:
+        """A number that increases every time the keys change."""
+        return self.__version
+
+    def __len__(self) -> int:
+        return len(self.__members)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__members
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__members)
+
+    def __getitem__(self, index: int) -> str:
+        """Returns the key at the given position among the keys not removed."""
+        return self.snapshot()[index]
+
+    def append(self, key: str) -> bool:
+        """Adds a key to the end unless it is already present.
+
+        Returns True if the key was added, returns False otherwise.
+        """
+        if key in self.__members:
+            return False
+        self.__members[key] = None
+        self.__keys.append(key)
+        self.__version += 1
+        return True
+
+    def extend(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.append(key)
+
+    def remove(self, key: str) -> None:
+        """Removes a key. Raises KeyError if the key is not present."""
+        del self.__members[key]
+        self.__version += 1
+
+    def clear(self) -> None:
+        self.__keys = []
+        self.__members = {}
+        self.__version += 1
+
+    def slice(self, start: int = 0, stop: int | None = None) -> list[str]:
+        """Returns the keys from position ``start`` up to but not including ``stop``."""
+        return self.snapshot().slice(start, stop)
+
+    def snapshot(self) -> KeySnapshot:
+        """Returns an immutable view of the current keys."""
+        if len(self.__keys) != len(self.__members):
+            self.__keys = list(self.__members)  # a new list; snapshots keep the old one
+        return KeySnapshot(self.__version, self.__keys, len(self.__keys))
@@ -1,17 +1,81 @@
+from concurrent.futures import Future
+from typing import Optional
+
+from moviefinder.movies import movies
+from moviefinder.task_scheduler import task_scheduler
 from PySide6 import QtCore
 from PySide6 import QtWidgets
 
 
-class LoadingDialog:
-    """A context manager that shows a loading dialog."""
+class LoadingDialog(QtWidgets.QProgressDialog):
+    """A dialog that loads the next page of movies in the background.
+
+    The page is loaded by the task scheduler, so the app stays responsive and the GUI
+    thread never waits for the network. The dialog shows how many pages, movies, and
+    posters have loaded so far, and the user can cancel the load. Only one load runs at
+    a time: starting another cancels the previous one, such as when the user changes the
+    genres again before the previous genres' movies load.
+
+    Parameters
+    ----------
+    parent : QtWidgets.QWidget
+        The window to show the dialog over.
+    """
+
+    loaded = QtCore.Signal(bool)  # whether any movies were loaded; not if cancelled
+
+    __current: Optional["LoadingDialog"] = None
+
+    def __init__(self, parent: QtWidgets.QWidget):
+        super().__init__("Loading movies...", "Cancel", 0, 0, parent)
+        self.setWindowTitle("Movie Finder")
+        self.setMinimumDuration(0)
+        self.__is_cancelled = False
+        self.__posters_loaded = 0
+        self.canceled.connect(self.cancel_loading)
+        movies.signals.page_loaded.connect(self.__update_label)
+        movies.signals.poster_loaded.connect(self.__on_poster_loaded)
+        LoadingDialog.cancel_current()
+        LoadingDialog.__current = self
+        self.show()
+        # ``loaded`` is never emitted before this returns, even if the load finishes
+        # immediately.
+        task_scheduler.add_gui_callback(movies.load_async(), self.__on_load_finished)
+
+    @staticmethod
+    def cancel_current() -> None:
+        """Cancels the load in progress, if any, such as before changing the genres."""
+        if LoadingDialog.__current is not None:
+            LoadingDialog.__current.cancel_loading()
+
+    def cancel_loading(self) -> None:
+        """Cancels the load and closes the dialog without emitting ``loaded``."""
+        if self.__is_cancelled:
+            return
+        self.__is_cancelled = True
+        if LoadingDialog.__current is self:
+            LoadingDialog.__current = None
+        movies.cancel_loading()
+        self.hide()
+
+    def __on_load_finished(self, future: Future[bool]) -> None:
+        is_loaded = (
+            not future.cancelled() and future.exception() is None and future.result()
+        )
+        if LoadingDialog.__current is self:
+            LoadingDialog.__current = None
+        self.hide()
+        self.deleteLater()
+        if not self.__is_cancelled:
+            self.loaded.emit(is_loaded)
 
-    def __enter__(self) -> None:
-        self.__dialog = QtWidgets.QProgressDialog("Loading...", "", 0, 0)
-        self.__dialog.setWindowModality(QtCore.Qt.WindowModal)
-        self.__dialog.setCancelButton(None)
-        self.__dialog.show()
-        self.__dialog.setValue(0)
-        QtWidgets.QApplication.processEvents()  # For the dialog to not be blank.
+    def __on_poster_loaded(self, movie_id: str) -> None:
+        self.__posters_loaded += 1
+        self.__update_label()
 
-    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
-        self.__dialog.cancel()
+    def __update_label(self) -> None:
+        self.setLabelText(
+            "Loading movies...\n"
+            f"{movies.current_page} pages, {len(movies)} movies, and"
+            f" {self.__posters_loaded} posters loaded"
+        )
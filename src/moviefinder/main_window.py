@@ -6,17 +6,27 @@ from typing import Literal
 import requests
 from moviefinder.account_creation_menu import AccountCreationMenu
 from moviefinder.browse_menu import BrowseMenu
+from moviefinder.catalog_snapshot import snapshot_path
 from moviefinder.country_code import CountryCode
+from moviefinder.http_client import http_client
+from moviefinder.icons import icon
 from moviefinder.loading_dialog import LoadingDialog
 from moviefinder.logged_in_start_menu import LoggedInStartMenu
 from moviefinder.login_menu import LoginMenu
+from moviefinder.movie import genre_vocabulary
 from moviefinder.movie import SERVICE_BASE_URL
 from moviefinder.movie import ServiceName
 from moviefinder.movie import USE_MOCK_DATA
 from moviefinder.movies import movies
+from moviefinder.poster_cache import poster_cache
+from moviefinder.poster_fetcher import poster_fetcher
+from moviefinder.poster_urls import POSTER_CDN_BASE_URL
+from moviefinder.poster_urls import screen_device_pixel_ratio
 from moviefinder.resources import settings_icon_path
+from moviefinder.response_cache import response_cache
 from moviefinder.settings_menu import SettingsMenu
 from moviefinder.start_menu import StartMenu
+from moviefinder.task_scheduler import task_scheduler
 from moviefinder.user import show_message_box
 from moviefinder.user import User
 from moviefinder.user import user
@@ -33,10 +43,19 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setWindowTitle("Movie Finder")
         self.central_widget = QtWidgets.QStackedWidget()
         self.setCentralWidget(self.central_widget)
+        if not USE_MOCK_DATA:
+            http_client.warm_up([SERVICE_BASE_URL, POSTER_CDN_BASE_URL])
+        movies.device_pixel_ratio = screen_device_pixel_ratio()
         self.__init_menus()
         self.__load_settings_and_show_window()
         self.is_quitting = False
         qApp.aboutToQuit.connect(self.__on_quit)  # type: ignore # noqa: F821
+        qApp.applicationStateChanged.connect(  # type: ignore # noqa: F821
+            self.__on_application_state_changed
+        )
+        qApp.primaryScreenChanged.connect(  # type: ignore # noqa: F821
+            self.__on_primary_screen_changed
+        )
 
     def __init_menus(self) -> None:
         self.start_menu = StartMenu(self)
@@ -75,6 +94,14 @@ class MainWindow(QtWidgets.QMainWindow):
         """Saves the window's size and location to the device's configuration files."""
         QtCore.QSettings().setValue("main_window/geometry", self.saveGeometry())
 
+    def __on_application_state_changed(self, state: QtCore.Qt.ApplicationState) -> None:
+        """Stops prefetching movies while the app is in the background."""
+        movies.set_prefetching_paused(state != QtCore.Qt.ApplicationActive)
+
+    def __on_primary_screen_changed(self, screen: QtGui.QScreen) -> None:
+        """Sizes the posters of the movies loaded from now on for the new screen."""
+        movies.device_pixel_ratio = screen_device_pixel_ratio()
+
     def __on_quit(self) -> None:
         """Called when the application is about to quit.
 
@@ -82,7 +109,26 @@ class MainWindow(QtWidgets.QMainWindow):
         """
         self.is_quitting = True
         self.__save_window_geometry()
+        movies.set_prefetching_paused(True)
+        if poster_fetcher.cache is not None:
+            print(
+                f"Poster disk cache: {poster_fetcher.cache.hit_count} hits,"
+                f" {poster_fetcher.cache.miss_count} misses,"
+                f" {poster_fetcher.cache.revalidation_count} revalidations."
+            )
+        print(f"Poster memory cache: {poster_cache.resident_bytes} bytes resident.")
+        print(
+            f"Merged requests: {poster_fetcher.merged_count} posters,"
+            f" {movies.merged_page_request_count} pages."
+        )
+        print(
+            f"Response cache: {response_cache.hit_count} hits,"
+            f" {response_cache.miss_count} misses."
+        )
+        http_client.print_latency_histograms()
+        task_scheduler.print_wait_histograms()
         if user:
+            movies.save_snapshot()
             user.save_genre_habits()
 
     def load_user_data(self, email: str, password: str) -> bool:
@@ -103,14 +149,14 @@ class MainWindow(QtWidgets.QMainWindow):
             ]
             return True
         try:
-            response = requests.post(
+            response = http_client.post(
                 url=f"{SERVICE_BASE_URL}/account",
                 json={
                     "email": email,
                     "password": password,
                 },
             )
-        except requests.exceptions.ConnectionError as e:
+        except requests.exceptions.RequestException as e:
             show_message_box("Could not connect to the server.")
             print(e)
             return False
@@ -136,6 +182,7 @@ class MainWindow(QtWidgets.QMainWindow):
             else:
                 print(f"Unknown service: {s}")
         user.genre_habits = data["genre_habits"]
+        genre_vocabulary.extend(user.genre_habits)
         print("Logged in successfully.")
         return True
 
@@ -183,20 +230,33 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def show_browse_menu(self) -> None:
         if self.browse_menu is not None:
-            self.browse_menu.update_movie_widgets()
+            self.browse_menu.update_movies()
         else:
             if not user.is_valid():
                 show_message_box("Invalid user data.")
                 print(f"    User: {user.__dict__}")
                 self.show_start_menu()
                 return
-            with LoadingDialog():
-                if not movies.load():
-                    show_message_box("Cannot connect to the service.")
-                    self.show_settings_menu("LoggedInStartMenu")
-                    return
+            if movies.restore_snapshot():
+                # Show the movies from the last launch now, and refresh them from the
+                # service in the background.
+                movies.revalidate()
                 self.browse_menu = BrowseMenu(self)
                 self.central_widget.addWidget(self.browse_menu)
+            else:
+                loading_dialog = LoadingDialog(self)
+                loading_dialog.loaded.connect(self.__on_first_movies_loaded)
+                return
+        self.central_widget.setCurrentWidget(self.browse_menu)
+
+    def __on_first_movies_loaded(self, is_loaded: bool) -> None:
+        if not is_loaded:
+            show_message_box("Cannot connect to the service.")
+            self.show_settings_menu("LoggedInStartMenu")
+            return
+        if self.browse_menu is None:
+            self.browse_menu = BrowseMenu(self)
+            self.central_widget.addWidget(self.browse_menu)
         self.central_widget.setCurrentWidget(self.browse_menu)
 
     def show_about_dialog(self) -> None:
@@ -244,6 +304,7 @@ class MainWindow(QtWidgets.QMainWindow):
         user.save_genre_habits()
         user.clear()
         self.clear_movies()
+        snapshot_path().unlink(missing_ok=True)
         settings = QtCore.QSettings()
         if settings.contains("user/email"):
             settings.remove("user/email")
@@ -269,7 +330,7 @@ class MainWindow(QtWidgets.QMainWindow):
         options_button.setArrowType(QtCore.Qt.NoArrow)  # This doesn't seem to work?
         options_button.setPopupMode(QtWidgets.QToolButton.InstantPopup)
         options_button.setToolButtonStyle(QtCore.Qt.ToolButtonIconOnly)
-        options_button.setIcon(QtGui.QIcon(settings_icon_path))
+        options_button.setIcon(icon(settings_icon_path))
         parent.options_menu = QtWidgets.QMenu()
         parent.about_action = QtGui.QAction("About")
         parent.options_menu.addAction(parent.about_action)
@@ -293,8 +354,9 @@ class MainWindow(QtWidgets.QMainWindow):
         return options_button
 
     def clear_movies(self) -> None:
+        LoadingDialog.cancel_current()
         if self.browse_menu is not None:
-            self.browse_menu.browse_widget.movie_widgets.clear()
+            self.browse_menu.browse_widget.model.clear()
             movies.clear()
 
     def get_top_3_genres(self, user: User) -> list[str]:
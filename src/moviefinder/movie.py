@@ -1,10 +1,12 @@
 import enum
-from html import escape
 from typing import NoReturn
 
-import requests
+from moviefinder.bitmasks import Vocabulary
 from moviefinder.country_code import CountryCode
-from PySide6 import QtGui
+from moviefinder.poster_cache import poster_cache
+from moviefinder.poster_cache import PosterHandle
+from moviefinder.poster_urls import resolve_poster_url
+from PySide6 import QtCore
 from PySide6.QtCore import QCoreApplication
 
 
@@ -15,6 +17,7 @@ __DOMAIN_NAME = "76.176.224.129"  # chuadevs.com
 SERVICE_BASE_URL = f"http://{__DOMAIN_NAME}:1587/v1"
 POSTER_WIDTH = 235
 POSTER_HEIGHT = 350
+MENU_POSTER_WIDTH = 2 * POSTER_WIDTH
 QCoreApplication.setApplicationName("MovieFinder")
 QCoreApplication.setOrganizationDomain("chuadevs.com")
 QCoreApplication.setOrganizationName("chuadevs.com")
@@ -33,10 +36,26 @@ class ServiceName(enum.Enum):
         return value in (e.value for e in cls.__members__.values())
 
 
+# Movies' genres, services, and regions are also stored as bitmasks of these. Genres
+# are lowercase strings, and the user's genres get the first bits when they log in.
+genre_vocabulary = Vocabulary()
+service_vocabulary = Vocabulary(ServiceName)
+region_vocabulary = Vocabulary(CountryCode)
+
+
 class Movie:
-    """A movie or a show."""
+    """A movie or a show.
+
+    Parameters
+    ----------
+    movie_info : dict
+        The movie's data from the service.
+    device_pixel_ratio : float
+        The device pixel ratio of the screen the posters will be shown on, which the
+        poster variants' widths are chosen for.
+    """
 
-    def __init__(self, movie_info: dict):
+    def __init__(self, movie_info: dict, device_pixel_ratio: float = 1.0):
         self.__ok = True
         self.hearted = False
         self.xed = False
@@ -49,6 +68,7 @@ class Movie:
         ):
             self.__ok = False
             return
+        self.info = movie_info  # kept for catalog snapshots
         self.id: str = movie_info["imdbID"]
         self.title: str = movie_info["title"]
         self.genres: list[str] = [genre.lower() for genre in movie_info["genres"]]
@@ -71,32 +91,32 @@ class Movie:
             self.services[ServiceName.HULU] = url
         elif "netflix.com" in url:
             self.services[ServiceName.NETFLIX] = url
+        self.genre_mask: int = genre_vocabulary.mask(self.genres)
+        self.service_mask: int = service_vocabulary.mask(self.services)
+        self.region_mask: int = region_vocabulary.mask(self.regions)
         self.imdb_rating_percent: int = -1
         if "imdbRating" in movie_info:
             self.imdb_rating_percent = movie_info["imdbRating"]
         self.imdb_vote_count: int = -1
         if "imdbVoteCount" in movie_info:
             self.imdb_vote_count = movie_info["imdbVoteCount"]
+        # Movies without a poster URL get a placeholder poster rendered locally.
+        self.poster_url: str = ""
         if "posterURL" in movie_info:
-            self.poster_url: str = movie_info["posterURL"]
-        else:
-            h = POSTER_HEIGHT
-            w = POSTER_WIDTH
-            t = escape(self.title)
-            self.poster_url = f"https://via.placeholder.com/{w}x{h}.png?text={t}"
-        response = requests.get(self.poster_url)
-        if not response:
-            self.__ok = False
-            print(
-                f'Error: unable to get "{self.title}"\'s poster from'
-                f' url "{self.poster_url}".'
-            )
-            return
-        if not qApp:  # type: ignore # noqa: F821
-            return
-        self.poster_pixmap = QtGui.QPixmap()
-        self.poster_pixmap.loadFromData(response.content)
-        self.poster_pixmap.scaledToWidth(5)
+            self.poster_url = movie_info["posterURL"]
+        # The browse menu and the movie menu show posters at different sizes, so they
+        # use different variants of the poster from the image CDN.
+        poster_size = QtCore.QSize(POSTER_WIDTH, POSTER_HEIGHT)
+        self.poster: PosterHandle = poster_cache.handle(
+            resolve_poster_url(self.poster_url, POSTER_WIDTH, device_pixel_ratio),
+            self.title,
+            poster_size,
+        )
+        self.menu_poster: PosterHandle = poster_cache.handle(
+            resolve_poster_url(self.poster_url, MENU_POSTER_WIDTH, device_pixel_ratio),
+            self.title,
+            poster_size,
+        )
         self.release_year: int = -1
         if "year" in movie_info:
             self.release_year = movie_info["year"]
@@ -0,0 +1,122 @@
+from collections.abc import Iterable
+from typing import Any
+
+from moviefinder.movies import movies
+from PySide6 import QtCore
+
+
+class MovieListModel(QtCore.QAbstractListModel):
+    """A list model of movie IDs for views of movies such as the browse widget.
+
+    By default the model lists the loaded movies in their order, and it grows as more
+    pages of movies are loaded. Views call ``fetchMore`` when they are scrolled to the
+    end to ask for more movies. A fixed list of movies, such as search results, can be
+    listed instead.
+
+    Parameters
+    ----------
+    movie_ids : list[str] | None
+        The IDs of the movies to list. If None, the loaded movies are listed.
+    parent : QtCore.QObject | None
+        The model's parent.
+    """
+
+    MOVIE_ID_ROLE = QtCore.Qt.UserRole
+
+    def __init__(
+        self, movie_ids: list[str] | None = None, parent: QtCore.QObject | None = None
+    ):
+        super().__init__(parent)
+        self.__is_listing_loaded_movies = False
+        self.__movie_ids: list[str] = []
+        self.__rows: dict[str, int] = {}  # maps movie IDs to rows
+        self.set_movies(movie_ids)
+        movies.signals.page_loaded.connect(self.__on_page_loaded)
+        movies.signals.poster_loaded.connect(self.__on_poster_loaded)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.__movie_ids)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        movie_id = self.__movie_ids[index.row()]
+        if role == self.MOVIE_ID_ROLE:
+            return movie_id
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            return movies[movie_id].title
+        return None
+
+    def movie_id(self, row: int) -> str:
+        return self.__movie_ids[row]
+
+    def canFetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        return (
+            not parent.isValid()
+            and self.__is_listing_loaded_movies
+            and (len(self.__movie_ids) < len(movies) or movies.has_more_pages())
+        )
+
+    def fetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> None:
+        """Lists any loaded movies not listed yet, and loads more in the background."""
+        if parent.isValid() or not self.__is_listing_loaded_movies:
+            return
+        self.__append(movies.range(len(self.__movie_ids)))
+        movies.prefetch(len(self.__movie_ids))
+
+    def set_movies(self, movie_ids: list[str] | None = None) -> None:
+        """Replaces the listed movies in one model reset.
+
+        Views keep their widgets and only repaint their visible cells, so this is much
+        cheaper than creating a new model and view.
+
+        Parameters
+        ----------
+        movie_ids : list[str] | None
+            The IDs of the movies to list. If None, the loaded movies are listed.
+        """
+        self.beginResetModel()
+        self.__is_listing_loaded_movies = movie_ids is None
+        self.__movie_ids = list(
+            dict.fromkeys(movies.range() if movie_ids is None else movie_ids)
+        )
+        self.__rows = {movie_id: row for row, movie_id in enumerate(self.__movie_ids)}
+        self.endResetModel()
+
+    def clear(self) -> None:
+        """Stops listing any movies, such as when the movies are cleared."""
+        self.set_movies([])
+
+    def refresh(self) -> None:
+        """Tells views to repaint all of the movies, such as after some were hearted."""
+        if self.__movie_ids:
+            self.dataChanged.emit(
+                self.index(0), self.index(len(self.__movie_ids) - 1), []
+            )
+
+    def __append(self, movie_ids: Iterable[str]) -> None:
+        new_movie_ids = [
+            movie_id
+            for movie_id in dict.fromkeys(movie_ids)
+            if movie_id not in self.__rows
+        ]
+        if not new_movie_ids:
+            return
+        first_row = len(self.__movie_ids)
+        self.beginInsertRows(
+            QtCore.QModelIndex(), first_row, first_row + len(new_movie_ids) - 1
+        )
+        for row, movie_id in enumerate(new_movie_ids, first_row):
+            self.__rows[movie_id] = row
+        self.__movie_ids.extend(new_movie_ids)
+        self.endInsertRows()
+
+    def __on_page_loaded(self, page: int) -> None:
+        if self.__is_listing_loaded_movies:
+            self.__append(movies.range(len(self.__movie_ids)))
+
+    def __on_poster_loaded(self, movie_id: str) -> None:
+        row = self.__rows.get(movie_id)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [QtCore.Qt.DecorationRole])
@@ -5,6 +5,7 @@ from textwrap import dedent
 from moviefinder.abstract_movie_widget import AbstractMovieWidget
 from moviefinder.buttons import init_buttons
 from moviefinder.country_code import CountryCode
+from moviefinder.icons import icon
 from moviefinder.movie import Movie
 from moviefinder.movie import ServiceName
 from moviefinder.movies import movies
@@ -14,7 +15,6 @@ from moviefinder.resources import filled_heart_icon_path
 from moviefinder.scaled_label import ScaledLabel
 from moviefinder.user import user
 from moviefinder.validators import valid_services
-from PySide6 import QtGui
 from PySide6 import QtWidgets
 from PySide6.QtCore import Qt
 
@@ -32,7 +32,7 @@ class MovieMenu(AbstractMovieWidget):
         self.movie_id: str | None = None
         top_buttons_layout = QtWidgets.QHBoxLayout()
         self.back_button = QtWidgets.QPushButton()
-        self.back_button.setIcon(QtGui.QIcon(corner_up_left_arrow_icon_path))
+        self.back_button.setIcon(icon(corner_up_left_arrow_icon_path))
         self.back_button.clicked.connect(main_window.show_browse_menu)
         top_buttons_layout.addWidget(self.back_button, alignment=Qt.AlignLeft)
         self.options_button = main_window.create_options_button(self)
@@ -75,8 +75,21 @@ class MovieMenu(AbstractMovieWidget):
         self.movie_layout.addLayout(self.left_layout)
         self.movie_layout.addLayout(self.right_layout)
         self.layout.addLayout(self.movie_layout)
+        movies.signals.poster_loaded.connect(self.__on_poster_loaded)
 
-    def update_movie_data(self, movie_id: str, poster_pixmap: QtGui.QPixmap) -> bool:
+    def __on_poster_loaded(self, movie_id: str) -> None:
+        if movie_id == self.movie_id:
+            self.__update_poster()
+
+    def __update_poster(self) -> None:
+        """Shows the large poster, or the small one until the large one is loaded."""
+        movie = movies[self.movie_id]
+        if movie.menu_poster.is_loaded():
+            self.poster_label.setPixmap(movie.menu_poster.pixmap())
+        else:
+            self.poster_label.setPixmap(movie.poster.pixmap())
+
+    def update_movie_data(self, movie_id: str) -> bool:
         """Returns True if successful, False otherwise.
 
         This function may fail if the movie's data does not make sense.
@@ -85,7 +98,8 @@ class MovieMenu(AbstractMovieWidget):
             return False
         self.movie_id = movie_id
         init_buttons(self, self.movie_id)
-        self.poster_label.setPixmap(poster_pixmap)
+        self.__update_poster()
+        movies.load_menu_poster(self.movie_id)
         hours = movies[self.movie_id].runtime_minutes // 60
         minutes = movies[self.movie_id].runtime_minutes % 60
         duration = f"{hours}h {minutes}m" if hours else f"{minutes}m"
@@ -148,19 +162,22 @@ class MovieMenu(AbstractMovieWidget):
     def handle_service_button_click(self, service) -> None:
         if not movies[self.movie_id].hearted:
             movies[self.movie_id].hearted = True
-            self.heart_button.setIcon(QtGui.QIcon(filled_heart_icon_path))
+            self.heart_button.setIcon(icon(filled_heart_icon_path))
             for genre in movies[self.movie_id].genres:
                 user.genre_habits[genre] += 1
             if movies[self.movie_id].xed:
                 self.x_button.setDisabled(True)
                 movies[self.movie_id].xed = False
-                self.x_button.setIcon(QtGui.QIcon(black_x_icon_path))
+                self.x_button.setIcon(icon(black_x_icon_path))
         webbrowser.open_new_tab(movies[self.movie_id].services[service])
 
     def is_valid_movie(self, movie_id: str) -> bool:
         try:
-            assert movie_id in movies, f"Invalid movie: {movie_id}"
-            movie: Movie = movies[movie_id]
+            movie: Movie = movies[movie_id]  # search results are not in ``movies``
+        except KeyError:
+            print(f"    Invalid movie: {movie_id}")
+            return False
+        try:
             assert isinstance(
                 movie.hearted, bool
             ), f"Type error: hearted is a {type(movie.hearted)}"
@@ -175,7 +192,6 @@ class MovieMenu(AbstractMovieWidget):
             assert isinstance(
                 movie.imdb_vote_count, int
             ), f"Type error: imdb_vote_count is a {type(movie.imdb_vote_count)}"
-            assert movie.poster_url, "Error: poster_url is falsy"
             assert isinstance(
                 movie.poster_url, str
             ), f"Type error: poster_url is a {type(movie.poster_url)}"
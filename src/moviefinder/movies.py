@@ -1,18 +1,49 @@
 import json
+from bisect import bisect_right
 from collections import UserDict
+from collections.abc import Iterable
 from collections.abc import Iterator
+from concurrent.futures import CancelledError
+from concurrent.futures import Future
+from functools import partial
+from pathlib import Path
 from random import shuffle
 from threading import Lock
 from typing import Any
 from typing import NoReturn
 from typing import Optional
 
-import requests
+from moviefinder.catalog_snapshot import read_snapshot
+from moviefinder.catalog_snapshot import snapshot_path
+from moviefinder.catalog_snapshot import write_snapshot
+from moviefinder.catalog_store import catalog_store
+from moviefinder.country_code import CountryCode
+from moviefinder.http_client import http_client
+from moviefinder.key_index import KeyIndex
+from moviefinder.key_index import KeySnapshot
+from moviefinder.movie import genre_vocabulary
 from moviefinder.movie import Movie
+from moviefinder.movie import region_vocabulary
 from moviefinder.movie import SERVICE_BASE_URL
+from moviefinder.movie import service_vocabulary
+from moviefinder.movie import ServiceName
 from moviefinder.movie import USE_MOCK_DATA
+from moviefinder.poster_fetcher import poster_fetcher
 from moviefinder.resources import sample_movies_json_path
+from moviefinder.response_cache import response_cache
+from moviefinder.task_scheduler import Priority
+from moviefinder.task_scheduler import task_scheduler
+from moviefinder.task_scheduler import TaskGroup
 from moviefinder.user import user
+from PySide6 import QtCore
+
+
+class MoviesSignals(QtCore.QObject):
+    """Signals emitted by the movies singleton, possibly from other threads."""
+
+    poster_loaded = QtCore.Signal(str)  # movie ID
+    page_loaded = QtCore.Signal(int)  # page number
+    page_failed = QtCore.Signal(int)  # page number
 
 
 class Movies(UserDict):
@@ -21,6 +52,29 @@ class Movies(UserDict):
     The keys are movie IDs (strings) and the values are Movie objects. Although this is
     a dictionary, you can iterate over it at a starting index of your choice using the
     ``enum_items`` method.
+
+    Movies are loaded from the service one page at a time, in page order, by tasks
+    in the task scheduler. ``load`` loads the next page and waits for it,
+    ``load_async`` starts loading it without waiting, and ``prefetch`` keeps
+    ``read_ahead_pages`` pages loaded ahead of the movies being shown without waiting.
+    ``cancel_loading`` cancels the pages being loaded.
+
+    Every valid movie received from the service is kept in a catalog with inverted
+    indexes by genre, service, and region, but only the movies that match the current
+    genres and the user's services and region are in this dictionary. ``refilter``
+    answers a change of genres, services, or region from the catalog first. The movies
+    are also saved to the catalog store, which ``search`` searches. Looking up a
+    movie that is in the catalog or the search results but not in this dictionary
+    returns it anyway.
+
+    Changes to the movies are made while holding a lock, and each change publishes a
+    new snapshot of the movies' order, except removals, which the next read publishes.
+    ``range`` reads the latest snapshot without locking unless movies were removed since
+    the last read, so the GUI thread never waits for the pages being loaded.
+
+    ``save_snapshot`` saves the movies for the next launch, and ``restore_snapshot``
+    restores them so they can be shown before the service answers. ``revalidate`` then
+    refreshes the restored movies from the service in the background.
     """
 
     __instance: Optional["Movies"] = None
@@ -38,20 +92,71 @@ class Movies(UserDict):
         self.genres: list[str] = []
         self.total_pages: int | None = None
         self.current_page: int = 0
-        self.__keys: list[str] = []
+        self.__keys = KeyIndex()  # the movie IDs in the order they were added
+        self.__key_snapshot = self.__keys.snapshot()
+        # Every valid movie received from the service, matching or not, in the order
+        # they were added, and the IDs of those movies by genre, service, and region.
+        self.__catalog: dict[str, Movie] = {}
+        self.__genre_index: dict[str, set[str]] = {}
+        self.__service_index: dict[ServiceName, set[str]] = {}
+        self.__region_index: dict[CountryCode, set[str]] = {}
+        # Search results that are not in the catalog. They can be looked up, but they
+        # are not refiltered or saved in snapshots.
+        self.__search_results: dict[str, Movie] = {}
+        self.signals = MoviesSignals()
+        self.read_ahead_pages = 2
+        # The primary screen's device pixel ratio, which new movies' poster variants
+        # are chosen for. Movies are created in worker threads, which must not use the
+        # screen, so the GUI thread sets this.
+        self.device_pixel_ratio = 1.0
+        # Requests for a page that is already loading share the page's future.
+        self.__page_futures: dict[int, Future[bool]] = {}
+        self.merged_page_request_count = 0
+        self.__last_requested_page = 0
+        self.__page_starts: list[int] = []  # the index of each loaded page's 1st movie
+        self.__prefetch_position = 0
+        self.__is_prefetching_paused = False
+        self.__is_prefetch_deferred = False
+        # Incremented when the movies are cleared or refiltered or loading is cancelled
+        # so that pages requested before then are discarded instead of added.
+        self.__generation = 0
+        self.__pages_lock = Lock()
+        # The downloads of the browse menu's posters that have not finished, by movie
+        # ID, so those no longer needed can be cancelled.
+        self.__poster_futures: dict[str, Future] = {}
+        # The browse menu's posters that failed to download, which are not retried
+        # when they are scrolled into view.
+        self.__failed_poster_ids: set[str] = set()
+        self.__posters_lock = Lock()
+        # Pages are loaded one at a time, in the order of their priorities.
+        self.__pager = TaskGroup(max_running=1)
 
     def __setitem__(self, key: str, item: Movie) -> None:
-        if key not in self.__keys:
+        with self.__lock:
+            # Publishing is only cheap if no removals are waiting to be compacted.
+            is_published = self.__key_snapshot.version == self.__keys.version
+            super().__setitem__(key, item)
             self.__keys.append(key)
-        return super().__setitem__(key, item)
+            if is_published:
+                self.__key_snapshot = self.__keys.snapshot()
+
+    def __missing__(self, key: str) -> Movie:
+        movie = self.__catalog.get(key) or self.__search_results.get(key)
+        if movie is None:
+            raise KeyError(key)
+        return movie
 
     def __delitem__(self, key: str) -> None:
-        self.__keys.remove(key)
-        return super().__delitem__(key)
+        with self.__lock:
+            super().__delitem__(key)
+            self.__keys.remove(key)  # published by the next read
 
     def range(self, start: int = 0, stop: int = -1) -> Iterator[str]:
         """Yields movie keys starting and stopping at the given indexes.
 
+        The keys come from a snapshot taken when this is called, so movies added or
+        removed during the iteration do not affect it.
+
         Parameters
         ----------
         start : int
@@ -59,11 +164,22 @@ class Movies(UserDict):
         stop : int
             The index to stop at. Defaults to -1 (the end).
         """
-        if stop == -1:
-            stop = len(self.__keys)
-        with self.__lock:
-            for i in range(start, stop):
-                yield self.__keys[i]
+        keys = self.__latest_keys().slice(start, None if stop == -1 else stop)
+        return iter(keys)
+
+    def __latest_keys(self) -> KeySnapshot:
+        """Returns the latest snapshot of the movies' order.
+
+        Removing a movie doesn't publish a new snapshot, because compacting the keys
+        takes linear time. Instead, the first read after any number of removals
+        publishes one while holding the lock. Other reads don't lock.
+        """
+        snapshot = self.__key_snapshot
+        if snapshot.version != self.__keys.version:
+            with self.__lock:
+                self.__key_snapshot = self.__keys.snapshot()
+                snapshot = self.__key_snapshot
+        return snapshot
 
     def __copy__(self) -> NoReturn:
         raise RuntimeError("The movies singleton object cannot be copied.")
@@ -72,108 +188,734 @@ class Movies(UserDict):
         raise RuntimeError("The movies singleton object cannot be copied.")
 
     def clear(self) -> None:
-        """Clears all movies and shows.
+        """Clears all movies and shows, including the catalog.
 
-        Always call ``browse_widget.movie_widgets.clear()`` immediately after or before
+        Always call ``browse_widget.model.clear()`` immediately after or before
         calling this method (you can just use ``main_window.clear_movies`` to do both).
         """
-        self.data.clear()
+        with self.__pages_lock:
+            with self.__lock:
+                self.__reset_pages()
+                self.__generation += 1
+                self.data.clear()
+                self.__keys.clear()
+                self.__key_snapshot = self.__keys.snapshot()
+                self.__catalog.clear()
+                self.__search_results.clear()
+                self.__genre_index.clear()
+                self.__service_index.clear()
+                self.__region_index.clear()
+        self.__cancel_posters(keep=set())
+
+    def refilter(self, genres: list[str]) -> bool:
+        """Replaces the movies with the catalog's movies that match the new filters.
+
+        Call this after changing the genres or the user's services or region, instead of
+        clearing and reloading the movies. Movies already loaded that still match are
+        kept without any network requests, and the service is asked for more movies
+        starting again from its first page. Returns True if any movies match.
+
+        Always call ``browse_menu.reload_browse_widget`` after calling this method.
+
+        Parameters
+        ----------
+        genres : list[str]
+            The new genres.
+        """
+        with self.__pages_lock:
+            with self.__lock:
+                self.__reset_pages()
+                self.__generation += 1
+                self.genres = genres
+                ids = self.__matching_ids()
+                matching_movies = [
+                    movie
+                    for movie_id, movie in self.__catalog.items()
+                    if movie_id in ids
+                ]
+                new_movies = [
+                    movie for movie in matching_movies if movie.id not in self
+                ]
+                self.data = {movie.id: movie for movie in matching_movies}
+                self.__keys.clear()
+                self.__keys.extend(self.data)
+                self.__key_snapshot = self.__keys.snapshot()
+        self.__cancel_posters(keep=ids)
+        self.__load_posters(new_movies)
+        print(f"{len(matching_movies)} loaded movies match the new filters.")
+        return bool(matching_movies)
+
+    def __cancel_posters(self, keep: set[str]) -> None:
+        """Cancels the browse menu's poster downloads that have not started yet.
+
+        The downloads of the posters of the movies with IDs in ``keep`` continue. Don't
+        call this while holding ``self.__lock``.
+        """
+        with self.__posters_lock:
+            futures = [
+                self.__poster_futures.pop(movie_id)
+                for movie_id in list(self.__poster_futures)
+                if movie_id not in keep
+            ]
+            self.__failed_poster_ids &= keep
+        for future in futures:
+            future.cancel()
+
+    def __reset_pages(self) -> None:
+        """Forgets which pages were loaded and cancels the pages waiting to load.
+
+        Only call this while holding both ``self.__pages_lock`` and ``self.__lock``.
+        """
+        for future in self.__page_futures.values():
+            future.cancel()
+        self.__page_futures.clear()
+        self.__last_requested_page = 0
+        self.__page_starts = []
+        self.__prefetch_position = 0
+        self.__is_prefetch_deferred = False
         self.total_pages = None
         self.current_page = 0
-        self.__keys = []
+
+    def __matching_ids(self) -> set[str]:
+        """Returns the IDs of the catalog's movies that match the current filters."""
+        if user.region is None:
+            return set()
+        genre_ids: set[str] = set().union(
+            *(self.__genre_index.get(genre.lower(), ()) for genre in self.genres)
+        )
+        service_ids: set[str] = set().union(
+            *(self.__service_index.get(service, ()) for service in user.services)
+        )
+        region_ids = self.__region_index.get(user.region, set())
+        return genre_ids & service_ids & region_ids
 
     def update(self, *args, **kwargs) -> None:
-        self.data.update(*args, **kwargs)
-        self.__keys.extend(key for key, _ in args)
-        self.__keys.extend(kwargs.keys())
+        for key, movie in dict(*args, **kwargs).items():
+            self[key] = movie
 
     def load(self) -> bool:
-        """Loads movies from the service.
+        """Loads the next page of movies from the service and waits for it.
 
         Assumes the user object has already been loaded and has valid data. Returns True
         if the movies were loaded successfully, returns False otherwise. Calling this
         method will not clear any current data; the method can be called multiple times
-        to load more movies.
+        to load more movies. If the next page is already being prefetched, this waits
+        for that instead of requesting the page again. Don't call this in the GUI
+        thread; use ``load_async`` instead.
+        """
+        try:
+            return self.load_async().result()
+        except CancelledError:
+            return False
+
+    def load_async(self) -> Future[bool]:
+        """Starts loading the next page of movies from the service without waiting.
+
+        The returned future's result is True if the movies were loaded successfully,
+        and False otherwise. The future is cancelled if the page was still waiting to
+        load when ``cancel_loading`` was called or the movies were cleared or
+        refiltered. Otherwise this is like ``load``.
         """
         print("Loading movies...")
         if not self.genres:
             print("Error: genres must be set before loading movies.")
-            return False
+            return self.__finished_future(False)
         if not user.region:
             print("Error: user region must be set before loading movies.")
+            return self.__finished_future(False)
+        with self.__pages_lock:
+            page = self.current_page + 1
+            if self.total_pages is not None and page > self.total_pages:
+                print("No more movies to load.")
+                return self.__finished_future(False)
+            future = self.__fetch_page(page, Priority.PAGE)
+        task_scheduler.reprioritize(future, Priority.PAGE)  # if it was prefetching
+        return future
+
+    def cancel_loading(self) -> None:
+        """Cancels the pages of movies that are waiting to load or loading.
+
+        A page that is already downloading is discarded when it arrives. The movies
+        already loaded are kept, and the cancelled pages can be requested again.
+        """
+        with self.__pages_lock:
+            with self.__lock:
+                for future in self.__page_futures.values():
+                    future.cancel()
+                self.__page_futures.clear()
+                self.__last_requested_page = self.current_page
+                self.__is_prefetch_deferred = False
+                self.__generation += 1
+
+    @staticmethod
+    def __finished_future(result: bool) -> Future[bool]:
+        future: Future[bool] = Future()
+        future.set_result(result)
+        return future
+
+    def prefetch(self, position: int) -> None:
+        """Loads pages of movies in the background ahead of the given position.
+
+        Pages are requested until ``read_ahead_pages`` pages past the one containing
+        ``position`` are loaded or loading, stopping at the last page. The
+        ``page_loaded`` signal is emitted as each page is added, and ``page_failed`` if
+        a page can't be loaded. While prefetching is paused, the prefetch is deferred
+        until it resumes. This can be called from any thread.
+
+        Parameters
+        ----------
+        position : int
+            The index of the first movie that has not been shown yet.
+        """
+        with self.__pages_lock:
+            self.__prefetch_position = position
+            if self.__is_prefetching_paused:
+                self.__is_prefetch_deferred = True
+                return
+            if not self.genres or not user.region:
+                return
+            if self.total_pages is None:
+                last_page = 1  # the number of pages is unknown until one has loaded
+            else:
+                current_page = bisect_right(self.__page_starts, position)
+                last_page = min(current_page + self.read_ahead_pages, self.total_pages)
+            for page in range(self.__last_requested_page + 1, last_page + 1):
+                if self.__fetch_page(page, Priority.PREFETCH).cancelled():
+                    break  # the scheduler is too busy, so prefetch again later
+
+    def set_prefetching_paused(self, paused: bool) -> None:
+        """Pauses or resumes prefetching, such as while the app is in the background.
+
+        Pages that are already loading are not cancelled. When prefetching resumes, any
+        prefetch deferred while it was paused catches up with the last position given
+        to ``prefetch``.
+        """
+        with self.__pages_lock:
+            self.__is_prefetching_paused = paused
+            is_prefetch_deferred = self.__is_prefetch_deferred and not paused
+            if is_prefetch_deferred:
+                self.__is_prefetch_deferred = False
+            position = self.__prefetch_position
+        if is_prefetch_deferred:
+            self.prefetch(position)
+
+    def wait_for_pages(self, timeout: float | None = None) -> None:
+        """Blocks until the pages of movies requested so far are done loading.
+
+        Pages that are cancelled before they start are not waited for. Raises
+        ``concurrent.futures.CancelledError`` if the task scheduler is too busy to
+        accept the wait, and ``TimeoutError`` if ``timeout`` seconds pass first.
+        """
+        task_scheduler.submit(
+            lambda: None, priority=Priority.BACKGROUND, group=self.__pager
+        ).result(timeout)
+
+    def has_more_pages(self) -> bool:
+        """Returns False if the last page of movies has been loaded."""
+        return self.total_pages is None or self.current_page < self.total_pages
+
+    def search(self, query: str, limit: int = 60) -> list[str]:
+        """Returns the IDs of the movies that best match a search, best first.
+
+        Every movie ever received from the service is searched, without any network
+        requests, but only movies available in the user's region and on any of their
+        services are returned. The results can be looked up like the other movies,
+        but results that are not in the catalog are kept apart from it, so they are not
+        refiltered into the browsed movies or saved in snapshots.
+
+        Parameters
+        ----------
+        query : str
+            The words to search for in the movies' titles, taglines, overviews, actors,
+            and directors.
+        limit : int
+            The most results to return.
+        """
+        if user.region is None:
+            return []
+        # The store filters by region and service before ranking and limiting the
+        # matches, so only the results are parsed.
+        matches = catalog_store.search(
+            query, limit, region=user.region, services=user.services
+        )
+        results = [movie for movie in self.__new_movies(matches) if movie]
+        with self.__lock:
+            for i, movie in enumerate(results):
+                old_movie = self.__catalog.get(movie.id) or self.__search_results.get(
+                    movie.id
+                )
+                if old_movie is None:
+                    self.__search_results[movie.id] = movie
+                else:
+                    results[i] = old_movie  # it may be hearted or Xed
+        self.__load_posters(
+            [movie for movie in results if not movie.poster.is_loaded()]
+        )
+        return [movie.id for movie in results]
+
+    def save_snapshot(self, path: Path | None = None) -> bool:
+        """Saves the movies for ``restore_snapshot`` to restore on the next launch.
+
+        The snapshot has the catalog's movies, the order of the movies shown, the pages
+        loaded, and which movies are hearted or Xed. Returns True if the snapshot was
+        saved, returns False otherwise.
+
+        Parameters
+        ----------
+        path : Path | None
+            Where to save the snapshot. Defaults to the app data folder.
+        """
+        with self.__pages_lock:
+            with self.__lock:
+                if not self.__catalog:
+                    return False
+                state = {
+                    "email": user.email,
+                    "region": user.region.name if user.region else "",
+                    "services": sorted(service.value for service in user.services),
+                    "genres": self.genres,
+                    "total_pages": self.total_pages,
+                    "current_page": self.current_page,
+                    "page_starts": self.__page_starts,
+                    "keys": [key for key in self.__keys if key in self.__catalog],
+                    "movies": [movie.info for movie in self.__catalog.values()],
+                    "hearted": [m.id for m in self.__catalog.values() if m.hearted],
+                    "xed": [m.id for m in self.__catalog.values() if m.xed],
+                }
+        return write_snapshot(path or snapshot_path(), state)
+
+    def restore_snapshot(self, path: Path | None = None) -> bool:
+        """Restores the movies saved by ``save_snapshot``.
+
+        Nothing is restored if any movies are loaded, or if the snapshot was saved for
+        a different user, region, or services. If the genres changed since, the
+        catalog is restored and refiltered by the current genres instead of restoring
+        the order and pages. Returns True if any movies were restored, returns False
+        otherwise. Call ``revalidate`` after this succeeds.
+
+        Parameters
+        ----------
+        path : Path | None
+            Where the snapshot was saved. Defaults to the app data folder.
+        """
+        state = read_snapshot(path or snapshot_path())
+        if state is None:
             return False
+        try:
+            services = sorted(service.value for service in user.services)
+            region = user.region.name if user.region else ""
+            if (
+                state["email"] != user.email
+                or state["region"] != region
+                or state["services"] != services
+            ):
+                print("Ignoring a catalog snapshot saved with different settings.")
+                return False
+            valid_movies = [
+                movie for movie in self.__new_movies(state["movies"]) if movie
+            ]
+            hearted_ids = set(state["hearted"])
+            xed_ids = set(state["xed"])
+            keys: list[str] = state["keys"]
+            is_same_genres = sorted(state["genres"]) == sorted(self.genres)
+            total_pages: int | None = state["total_pages"]
+            current_page: int = state["current_page"]
+            page_starts: list[int] = state["page_starts"]
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Error: the catalog snapshot is invalid: {e}")
+            return False
+        for movie in valid_movies:
+            movie.hearted = movie.id in hearted_ids
+            movie.xed = movie.id in xed_ids
+        with self.__pages_lock:
+            with self.__lock:
+                if self.data or self.__catalog:
+                    return False
+                for movie in valid_movies:
+                    self.__add_to_catalog(movie)
+                if is_same_genres:
+                    self.data = {
+                        key: self.__catalog[key]
+                        for key in keys
+                        if key in self.__catalog
+                    }
+                    self.__keys.extend(self.data)
+                    self.__key_snapshot = self.__keys.snapshot()
+                    self.total_pages = total_pages
+                    self.current_page = current_page
+                    self.__last_requested_page = current_page
+                    self.__page_starts = page_starts
+        if not is_same_genres:
+            return self.refilter(self.genres)
+        self.__load_posters(list(self.data.values()))
+        print(f"Restored {len(self.data)} movies from the catalog snapshot.")
+        return bool(self.data)
+
+    def revalidate(self) -> Future[bool]:
+        """Refreshes the loaded pages of movies from the service in the background.
+
+        The pages are requested again without using the response cache. The movies the
+        service still returns get its latest details, and those it no longer returns are
+        removed from the catalog but stay shown until the next launch. The returned
+        future's result is True if every page was refreshed.
+        """
+        with self.__pages_lock:
+            with self.__lock:
+                movie_ids = set(self.data)
+            return task_scheduler.submit(
+                self.__revalidate,
+                self.current_page,
+                movie_ids,
+                self.__generation,
+                priority=Priority.BACKGROUND,
+                group=self.__pager,
+            )
+
+    def __revalidate(
+        self, last_page: int, movie_ids: set[str], generation: int
+    ) -> bool:
+        """Refreshes pages 1 through ``last_page``. Runs in a worker thread.
+
+        ``movie_ids`` are the IDs of the movies on those pages before the refresh.
+        """
+        returned_ids: set[str] = set()
+        for page in range(1, last_page + 1):
+            if generation != self.__generation:
+                return False
+            response_data = self.__request_page(page, use_cache=False)
+            if response_data is None:
+                return False
+            self.__add_movies(response_data, generation)
+            returned_ids.update(
+                movie_data.get("imdbID") for movie_data in response_data["movies"]
+            )
+        with self.__lock:
+            if generation != self.__generation:
+                return False
+            for movie_id in movie_ids - returned_ids:
+                movie = self.__catalog.pop(movie_id, None)
+                if movie is not None:
+                    self.__unindex(movie)
+        print(f"Revalidated {last_page} pages of movies.")
+        return True
+
+    def __fetch_page(self, page: int, priority: Priority) -> Future:
+        """Starts loading a page of movies unless it is already loading.
+
+        Requests for a page that is already loading share its future, and are counted
+        in ``merged_page_request_count``.
+
+        The returned future is cancelled if the scheduler rejected the request. Only
+        call this while holding ``self.__pages_lock``.
+        """
+        future = self.__page_futures.get(page)
+        if future is not None:
+            self.merged_page_request_count += 1
+        else:
+            future = task_scheduler.submit(
+                self.__load_page,
+                page,
+                self.__generation,
+                priority=priority,
+                group=self.__pager,
+            )
+            if not future.cancelled():
+                self.__page_futures[page] = future
+                self.__last_requested_page = max(self.__last_requested_page, page)
+        return future
+
+    def __load_page(self, page: int, generation: int) -> bool:
+        """Downloads a page of movies and adds them. Runs in a worker thread.
+
+        Returns True if any movies were added, returns False otherwise. Either the
+        ``page_loaded`` or the ``page_failed`` signal is emitted unless the movies were
+        cleared, refiltered, or cancelled meanwhile.
+        """
+        is_added = False
+        is_loaded = False
+        try:
+            if generation != self.__generation or page != self.current_page + 1:
+                return False  # the movies were cleared or an earlier page failed
+            response_data = self.__request_page(page)
+            if response_data is None:
+                return False
+            start = len(self.__latest_keys())
+            is_added = self.__add_movies(response_data, generation)
+            with self.__pages_lock:
+                if generation != self.__generation:
+                    return False
+                self.current_page = page
+                self.__page_starts.append(start)
+                position = self.__prefetch_position
+            is_loaded = True
+        finally:
+            with self.__pages_lock:
+                is_current = generation == self.__generation
+                if is_current:
+                    del self.__page_futures[page]
+                    if self.current_page < page:  # let the page be requested again
+                        self.__last_requested_page = max(
+                            self.__page_futures, default=self.current_page
+                        )
+            if is_current and not is_loaded:
+                self.signals.page_failed.emit(page)
+        self.signals.page_loaded.emit(page)
+        self.prefetch(position)
+        return is_added
+
+    def __request_page(
+        self, page: int, use_cache: bool = True
+    ) -> dict[str, Any] | None:
+        """Requests a page of movies from the service.
+
+        Returns the response's data, or None if the request failed. Pages requested
+        recently with the same filters are served from the response cache unless
+        ``use_cache`` is False. The response is cached either way.
+        """
         if USE_MOCK_DATA:
             with open(sample_movies_json_path, "r", encoding="utf8") as file:
-                return self.__add_movies(json.load(file))
-        if self.total_pages is not None and self.current_page >= self.total_pages:
-            print("No more movies to load.")
-            return False
-        self.current_page += 1
+                response_data = json.load(file)
+            response_data["total_pages"] = 1  # the sample data is only one page
+            return response_data
+        if user.region is None:
+            print("Error: user region must be set before loading movies.")
+            return None
+        body = {
+            "country": user.region.name.lower(),
+            "genre": [genre.title() for genre in self.genres],
+            "language": "en",
+            "orderBy": "year",  # "original_title" or "year"
+            "page": str(page),
+            "services": [service.value.lower() for service in user.services],
+        }
+        cache_key = response_cache.key("/movie", body)
+        if use_cache:
+            response_data = response_cache.get(cache_key)
+            if response_data is not None:
+                print(f"Using the cached page {page} of movies.")
+                return response_data
         try:
-            print("Sending request for movies...")
-            response = requests.get(
-                url=f"{SERVICE_BASE_URL}/movie",
-                json={
-                    "country": user.region.name.lower(),
-                    "genre": [genre.title() for genre in self.genres],
-                    "language": "en",
-                    "orderBy": "year",  # "original_title" or "year"
-                    "page": str(self.current_page),
-                    "services": [service.value.lower() for service in user.services],
-                },
-                verify=False,
+            print(f"Sending request for page {page} of movies...")
+            response = http_client.get(
+                url=f"{SERVICE_BASE_URL}/movie", json=body, verify=False
             )
             print(f"movies {response = }")
         except Exception as e:
             print(f"Exception while loading movies: {e}")
-            return False
+            return None
         if not response:
             print(f"movies {response.content = }")
             print("Error: failed to load more movies. `response` is falsy.")
-            return False
-        return self.__add_movies(response.json())
+            return None
+        response_data = response.json()
+        response_cache.put(cache_key, response_data)
+        return response_data
 
-    def __add_movies(self, response_data: dict[str, Any]) -> bool:
+    def __new_movies(self, movies_data: Iterable[dict]) -> Iterator[Movie]:
+        """Creates movies whose posters are sized for the primary screen."""
+        device_pixel_ratio = self.device_pixel_ratio
+        return (Movie(movie_data, device_pixel_ratio) for movie_data in movies_data)
+
+    def __add_movies(
+        self, response_data: dict[str, Any], generation: int | None = None
+    ) -> bool:
         """Adds movies to ``self.data`` from a web request response.
 
         Returns True if the movies were added successfully, returns False otherwise.
+        Nothing is added if ``generation`` is given and the movies have been cleared
+        since it was current.
         """
-        self.total_pages = response_data["total_pages"]
+        if generation is not None and generation != self.__generation:
+            return False  # the page is stale, so don't even parse it
         movies_data: list[dict] = response_data["movies"]
+        # Posters are by far the most expensive part of a movie to load, so they are
+        # only downloaded after the movies have been parsed, validated, filtered, and
+        # deduplicated.
+        valid_movies = [movie for movie in self.__new_movies(movies_data) if movie]
+        shuffle(valid_movies)
+        new_movies: dict[str, Movie] = {}
+        for new_movie, is_match in zip(valid_movies, self.__match(valid_movies)):
+            if not is_match:
+                continue
+            if new_movie.id in self.data or new_movie.id in new_movies:
+                continue
+            new_movies[new_movie.id] = new_movie
+        items = list(new_movies.items())
+        with self.__lock:
+            if generation is not None and generation != self.__generation:
+                return False
+            self.total_pages = response_data["total_pages"]
+            for movie in valid_movies:
+                old_movie = self.__catalog.get(movie.id)
+                searched_movie = self.__search_results.pop(movie.id, None)
+                if old_movie is not None:
+                    # The service's latest details replace the old ones, but movies keep
+                    # their hearts and Xs.
+                    movie.hearted, movie.xed = old_movie.hearted, old_movie.xed
+                    self.__unindex(old_movie)
+                    if movie.id in self.data:
+                        self.data[movie.id] = movie
+                elif searched_movie is not None:
+                    movie.hearted, movie.xed = (
+                        searched_movie.hearted,
+                        searched_movie.xed,
+                    )
+                self.__add_to_catalog(movie)
+            self.data.update(items)
+            self.__keys.extend(key for key, _ in items)
+            self.__key_snapshot = self.__keys.snapshot()
+        catalog_store.add(valid_movies)
         if not movies_data:
             print("Error: no movies were received from the service.")
             return False
-        new_movies: dict[str, Movie] = {}
-        for movie_data in movies_data:
-            new_movie = Movie(movie_data)
-            if new_movie and self.__service_region_and_genres_match(new_movie):
-                new_movies[new_movie.id] = new_movie
         if not new_movies:
             print("Error: none of the movies from the service were valid.")
             return False
-        items = list(new_movies.items())
-        shuffle(items)
-        with self.__lock:
-            self.data.update(items)
-        self.__keys.extend(key for key, _ in items)
+        self.__load_posters([movie for _, movie in items])
         print("Movies loaded successfully.")
         return True
 
-    def __service_region_and_genres_match(self, movie: Movie) -> bool:
-        """Checks if the user has the service, region, & genres of the movie."""
-        if user.region not in movie.regions:
-            return False
-        for service in user.services:
-            if service in movie.services:
-                break
-        else:
-            return False
-        for genre in self.genres:
-            if genre in movie.genres:
-                break
-        else:
-            return False
-        return True
+    def __add_to_catalog(self, movie: Movie) -> None:
+        """Adds or replaces a movie in the catalog and indexes it.
+
+        Only call this while holding ``self.__lock``. A replaced movie keeps its
+        place in the catalog's order, but call ``__unindex`` on the old movie first.
+        """
+        self.__catalog[movie.id] = movie
+        for genre in movie.genres:
+            self.__genre_index.setdefault(genre, set()).add(movie.id)
+        for service in movie.services:
+            self.__service_index.setdefault(service, set()).add(movie.id)
+        for region in movie.regions:
+            self.__region_index.setdefault(region, set()).add(movie.id)
+
+    def __unindex(self, movie: Movie) -> None:
+        """Removes a movie from the catalog's indexes but not from the catalog."""
+        for genre in movie.genres:
+            self.__genre_index[genre].discard(movie.id)
+        for service in movie.services:
+            self.__service_index[service].discard(movie.id)
+        for region in movie.regions:
+            self.__region_index[region].discard(movie.id)
+
+    def load_menu_poster(self, movie_id: str) -> None:
+        """Starts downloading the larger poster that the movie menu shows.
+
+        The ``poster_loaded`` signal is emitted when the poster arrives. Nothing is
+        downloaded if the poster is already in memory.
+        """
+        movie = self[movie_id]
+        if not movie.menu_poster.is_loaded():
+            self.__load_posters(
+                [movie], menu_posters=True, priority=Priority.VISIBLE_POSTER
+            )
+
+    def prioritize_posters(
+        self, visible_ids: Iterable[str], nearby_ids: Iterable[str]
+    ) -> None:
+        """Downloads the posters of the movies in and near the browse grid's viewport
+        first.
+
+        The posters of the visible movies are downloaded before those of the movies
+        within a screen of them, which are downloaded before all the others. Visible and
+        nearby posters that are neither loaded nor downloading, such as those whose
+        downloads were rejected by the busy task scheduler, are requested again.
+
+        Parameters
+        ----------
+        visible_ids : Iterable[str]
+            The IDs of the movies whose tiles intersect the viewport.
+        nearby_ids : Iterable[str]
+            The IDs of the movies whose tiles are within one screen of the viewport.
+        """
+        priorities = {movie_id: Priority.PREFETCH for movie_id in nearby_ids}
+        priorities |= {movie_id: Priority.VISIBLE_POSTER for movie_id in visible_ids}
+        with self.__posters_lock:
+            downloads = dict(self.__poster_futures)
+            failed_ids = set(self.__failed_poster_ids)
+        for movie_id, future in downloads.items():
+            poster_fetcher.reprioritize(
+                future, priorities.get(movie_id, Priority.BACKGROUND)
+            )
+        missing: dict[Priority, list[Movie]] = {priority: [] for priority in Priority}
+        for movie_id, priority in priorities.items():
+            movie = self.__catalog.get(movie_id) or self.__search_results.get(movie_id)
+            if (
+                movie is not None
+                and movie_id not in downloads
+                and movie_id not in failed_ids
+                and not movie.poster.is_loaded()
+            ):
+                missing[priority].append(movie)
+        for priority, missing_movies in missing.items():
+            if missing_movies:
+                self.__load_posters(missing_movies, priority=priority)
+
+    def __load_posters(
+        self,
+        new_movies: list[Movie],
+        menu_posters: bool = False,
+        priority: Priority = Priority.PREFETCH,
+    ) -> None:
+        """Starts downloading the movies' posters without waiting for them.
+
+        The ``poster_loaded`` signal is emitted for each poster as it arrives. The
+        posters for the browse menu are downloaded unless ``menu_posters`` is True. The
+        browse menu's posters start at ``priority`` until ``prioritize_posters`` is
+        called for the tiles in view.
+        """
+        generation = self.__generation
+        for movie in new_movies:
+            handle = movie.menu_poster if menu_posters else movie.poster
+            if not handle.url:
+                # Movies without poster URLs use placeholders that cost no requests.
+                continue
+            future = poster_fetcher.submit(handle.url, priority)
+            if not menu_posters:
+                with self.__posters_lock:
+                    self.__poster_futures[movie.id] = future
+            future.add_done_callback(
+                partial(self.__on_poster_done, movie, menu_posters, generation)
+            )
+
+    def __on_poster_done(
+        self, movie: Movie, menu_poster: bool, generation: int, future: Future
+    ) -> None:
+        """Shows a downloaded poster. Called from the thread that finished it."""
+        if not menu_poster:
+            with self.__posters_lock:
+                if self.__poster_futures.get(movie.id) is future:
+                    del self.__poster_futures[movie.id]
+        if future.cancelled():
+            return  # it is requested again if it's scrolled into view
+        data = future.result() if future.exception() is None else None
+        if data is None:
+            if generation == self.__generation:  # else the movies have changed
+                print(f'Error: unable to get "{movie.title}"\'s poster.')
+                if not menu_poster:
+                    with self.__posters_lock:
+                        self.__failed_poster_ids.add(movie.id)
+            return
+        (movie.menu_poster if menu_poster else movie.poster).set_data(data)
+        self.signals.poster_loaded.emit(movie.id)
+
+    def __match(self, candidates: list[Movie]) -> list[bool]:
+        """Returns which movies have the user's region & any of their services & genres.
+
+        The filters' masks are built once per batch, and then each movie is checked with
+        an ``&`` of each of its bitmasks.
+        """
+        genre_mask = genre_vocabulary.mask(genre.lower() for genre in self.genres)
+        service_mask = service_vocabulary.mask(user.services)
+        region_mask = region_vocabulary.mask([user.region]) if user.region else 0
+        return [
+            bool(
+                movie.genre_mask & genre_mask
+                and movie.service_mask & service_mask
+                and movie.region_mask & region_mask
+            )
+            for movie in candidates
+        ]
 
 
 movies = Movies()
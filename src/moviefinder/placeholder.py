@@ -0,0 +1,68 @@
+from PySide6 import QtCore
+from PySide6 import QtGui
+
+
+PLACEHOLDER_BACKGROUND_COLOR = QtGui.QColor("#cccccc")
+PLACEHOLDER_TEXT_COLOR = QtGui.QColor("#555555")
+
+
+def paint_placeholder(painter: QtGui.QPainter, rect: QtCore.QRect, title: str) -> None:
+    """Paints a gray poster with a movie's title on it, for movies without posters.
+
+    Placeholders are painted directly instead of being rendered to pixmaps, so they
+    take no memory no matter how many movies are shown.
+
+    Parameters
+    ----------
+    painter : QtGui.QPainter
+        The painter to paint with.
+    rect : QtCore.QRect
+        Where to paint the poster.
+    title : str
+        The text to put on the poster.
+    """
+    painter.save()
+    painter.fillRect(rect, PLACEHOLDER_BACKGROUND_COLOR)
+    painter.setRenderHint(QtGui.QPainter.TextAntialiasing)
+    painter.setPen(PLACEHOLDER_TEXT_COLOR)
+    font = painter.font()
+    font.setPixelSize(max(10, rect.width() // 10))
+    painter.setFont(font)
+    margin = rect.width() // 10
+    painter.drawText(
+        rect.adjusted(margin, margin, -margin, -margin),
+        QtCore.Qt.AlignCenter | QtCore.Qt.TextWordWrap,
+        title,
+    )
+    painter.restore()
+
+
+def placeholder_pixmap(
+    title: str, width: int, height: int, device_pixel_ratio: float = 1.0
+) -> QtGui.QPixmap:
+    """Returns a pixmap of a placeholder poster, for widgets that show pixmaps.
+
+    The pixmap is rendered on every call, so only use this for the few placeholders
+    shown outside of the browse grid. Only use this in the GUI thread.
+
+    Parameters
+    ----------
+    title : str
+        The text to put on the poster.
+    width : int
+        The poster's width in device-independent pixels.
+    height : int
+        The poster's height in device-independent pixels.
+    device_pixel_ratio : float
+        The device pixel ratio of the screen the poster will be shown on.
+    """
+    image = QtGui.QImage(
+        round(width * device_pixel_ratio),
+        round(height * device_pixel_ratio),
+        QtGui.QImage.Format_ARGB32_Premultiplied,
+    )
+    image.setDevicePixelRatio(device_pixel_ratio)
+    painter = QtGui.QPainter(image)
+    paint_placeholder(painter, QtCore.QRect(0, 0, width, height), title)
+    painter.end()
+    return QtGui.QPixmap.fromImage(image)
@@ -0,0 +1,414 @@
+import os
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import Future
+from functools import partial
+from threading import Lock
+
+from moviefinder.disk_cache import DiskCache
+from moviefinder.placeholder import placeholder_pixmap
+from moviefinder.poster_fetcher import poster_fetcher
+from moviefinder.task_scheduler import Priority
+from moviefinder.task_scheduler import task_scheduler
+from moviefinder.task_scheduler import TaskGroup
+from moviefinder.task_scheduler import TaskScheduler
+from PySide6 import QtCore
+from PySide6 import QtGui
+
+
+class PosterCacheSignals(QtCore.QObject):
+    """Signals emitted by a poster cache in the GUI thread."""
+
+    pixmap_decoded = QtCore.Signal(str)  # the poster's URL
+
+
+class PosterCache:
+    """A process-wide, two-tier, in-memory cache of posters.
+
+    The first tier holds posters' compressed bytes, which are cheap to keep. The second
+    tier holds decoded pixmaps, which are only created when a poster is about to be
+    shown and are decoded directly at the size they will be shown at. Each tier evicts
+    its least recently used posters when it grows beyond its byte budget. Compressed
+    bytes evicted from memory are read back from the disk cache when they are needed
+    again.
+
+    Decoding a poster is slow enough to stall scrolling, so posters can also be decoded
+    to ``QImage`` objects by tasks in a task scheduler. Only the cheap conversion to a
+    pixmap, which must happen in the GUI thread, is done there, and then the
+    ``pixmap_decoded`` signal is emitted. Decodes of posters scrolled out of view are
+    cancelled by ``prioritize_decodes``.
+
+    Parameters
+    ----------
+    max_data_bytes : int
+        The memory budget for compressed posters.
+    max_pixmap_bytes : int
+        The memory budget for decoded posters.
+    disk_cache : DiskCache | None
+        Where to look for posters whose compressed bytes were evicted from memory.
+    scheduler : TaskScheduler
+        The scheduler to decode posters in without blocking the GUI thread.
+    """
+
+    def __init__(
+        self,
+        max_data_bytes: int = 64 * 1024 * 1024,
+        max_pixmap_bytes: int = 96 * 1024 * 1024,
+        disk_cache: DiskCache | None = None,
+        scheduler: TaskScheduler = task_scheduler,
+    ):
+        self.max_data_bytes = max_data_bytes
+        self.max_pixmap_bytes = max_pixmap_bytes
+        self.disk_cache = disk_cache
+        self.scheduler = scheduler
+        self.signals = PosterCacheSignals()
+        self.__data: OrderedDict[str, bytes] = OrderedDict()
+        self.__data_bytes = 0
+        self.__evicted_urls: set[str] = set()
+        # Decoded pixmaps are keyed by URL, width, and height in device pixels. Full
+        # size pixmaps have a width and height of 0.
+        self.__pixmaps: OrderedDict[tuple[str, int, int], QtGui.QPixmap] = OrderedDict()
+        self.__pixmap_bytes = 0
+        # The posters being decoded in the background, and those that couldn't be
+        # decoded, which are not tried again until their bytes are replaced.
+        self.__decodes: dict[tuple[str, int, int], Future] = {}
+        self.__undecodable_urls: set[str] = set()
+        # Decoding is CPU-bound, so a core is left for the GUI thread.
+        self.__decoders = TaskGroup(max_running=max(1, (os.cpu_count() or 1) - 1))
+        self.__lock = Lock()
+
+    @property
+    def data_bytes(self) -> int:
+        """The memory used by compressed posters."""
+        return self.__data_bytes
+
+    @property
+    def pixmap_bytes(self) -> int:
+        """The memory used by decoded posters."""
+        return self.__pixmap_bytes
+
+    @property
+    def resident_bytes(self) -> int:
+        """The memory used by all of the cached posters."""
+        return self.__data_bytes + self.__pixmap_bytes
+
+    def handle(
+        self, url: str, title: str, placeholder_size: QtCore.QSize
+    ) -> "PosterHandle":
+        return PosterHandle(self, url, title, placeholder_size)
+
+    def has_data(self, url: str) -> bool:
+        """Returns True if a poster's compressed bytes are in memory."""
+        with self.__lock:
+            return url in self.__data
+
+    def set_data(self, url: str, data: bytes) -> None:
+        """Caches a poster's compressed bytes. This can be called from any thread."""
+        with self.__lock:
+            if url in self.__data:
+                self.__data_bytes -= len(self.__data.pop(url))
+            self.__evicted_urls.discard(url)
+            self.__undecodable_urls.discard(url)
+            self.__data[url] = data
+            self.__data_bytes += len(data)
+            while self.__data_bytes > self.max_data_bytes and len(self.__data) > 1:
+                evicted_url, evicted = self.__data.popitem(last=False)
+                self.__data_bytes -= len(evicted)
+                self.__evicted_urls.add(evicted_url)
+
+    def pixmap(
+        self,
+        url: str,
+        size: QtCore.QSize | None = None,
+        device_pixel_ratio: float = 1.0,
+    ) -> QtGui.QPixmap | None:
+        """Returns a poster's pixmap, decoding it if needed.
+
+        Returns None if the poster has not been downloaded. Only use this in the GUI
+        thread.
+
+        Parameters
+        ----------
+        url : str
+            The poster's URL.
+        size : QtCore.QSize | None
+            The size, in device-independent pixels, to fit the poster within while
+            keeping its aspect ratio. The image is decoded directly at that size, which
+            is much faster than decoding it at full size and then scaling it. If None,
+            the poster is decoded at full size.
+        device_pixel_ratio : float
+            The device pixel ratio of the screen the poster will be shown on.
+        """
+        key = self.__key(url, size, device_pixel_ratio)
+        if key in self.__pixmaps:
+            self.__pixmaps.move_to_end(key)
+            return self.__pixmaps[key]
+        image = self.__decode(key)
+        if image is None:
+            return None
+        return self.__add_pixmap(key, image, size is not None, device_pixel_ratio)
+
+    def pixmap_async(
+        self,
+        url: str,
+        size: QtCore.QSize | None = None,
+        device_pixel_ratio: float = 1.0,
+    ) -> QtGui.QPixmap | None:
+        """Returns a poster's pixmap if it is decoded, else starts decoding it.
+
+        Returns None if the poster is being decoded, and ``pixmap_decoded`` is emitted
+        once it can be returned. Also returns None if the poster has not been
+        downloaded. The poster is decoded in a worker thread, so this never blocks.
+        Only use this in the GUI thread. See ``pixmap`` for the parameters.
+        """
+        key = self.__key(url, size, device_pixel_ratio)
+        if key in self.__pixmaps:
+            self.__pixmaps.move_to_end(key)
+            return self.__pixmaps[key]
+        if key in self.__decodes:
+            return None
+        with self.__lock:
+            if url in self.__undecodable_urls or (
+                url not in self.__data and url not in self.__evicted_urls
+            ):
+                return None
+        future = self.scheduler.submit(
+            self.__decode, key, priority=Priority.VISIBLE_POSTER, group=self.__decoders
+        )
+        self.__decodes[key] = future
+        self.scheduler.add_gui_callback(
+            future,
+            partial(self.__on_decoded, key, size is not None, device_pixel_ratio),
+        )
+        return None
+
+    def prioritize_decodes(
+        self, visible_urls: Iterable[str], nearby_urls: Iterable[str]
+    ) -> None:
+        """Cancels the decodes of posters scrolled out of view, and lowers those nearby.
+
+        Decodes that haven't started are cancelled unless their posters are visible or
+        nearby, and the nearby ones wait behind the visible ones. Posters scrolled back
+        into view are decoded again when they are painted. Only use this in the GUI
+        thread.
+
+        Parameters
+        ----------
+        visible_urls : Iterable[str]
+            The URLs of the posters in the viewport.
+        nearby_urls : Iterable[str]
+            The URLs of the posters within a screen of the viewport.
+        """
+        priorities = {url: Priority.PREFETCH for url in nearby_urls}
+        priorities |= {url: Priority.VISIBLE_POSTER for url in visible_urls}
+        for key, future in list(self.__decodes.items()):
+            priority = priorities.get(key[0])
+            if priority is not None:
+                self.scheduler.reprioritize(future, priority)
+            elif future.cancel():
+                del self.__decodes[key]
+
+    def release(
+        self,
+        url: str,
+        size: QtCore.QSize | None = None,
+        device_pixel_ratio: float = 1.0,
+    ) -> None:
+        """Drops a poster's decoded pixmap but keeps its compressed bytes."""
+        key = self.__key(url, size, device_pixel_ratio)
+        if key in self.__pixmaps:
+            self.__pixmap_bytes -= self.__size_of(self.__pixmaps.pop(key))
+
+    def clear(self) -> None:
+        """Drops all of the cached posters. Only use this in the GUI thread."""
+        with self.__lock:
+            self.__data.clear()
+            self.__data_bytes = 0
+            self.__evicted_urls.clear()
+            self.__undecodable_urls.clear()
+        self.__pixmaps.clear()
+        self.__pixmap_bytes = 0
+        for future in self.__decodes.values():
+            future.cancel()
+        self.__decodes.clear()
+
+    def __decode(self, key: tuple[str, int, int]) -> QtGui.QImage | None:
+        """Decodes a poster at the size in its key. This can be called from any thread.
+
+        Returns None if the poster has not been downloaded or cannot be decoded.
+        """
+        url, width, height = key
+        data = self.__get_data(url)
+        if data is None:
+            return None
+        buffer = QtCore.QBuffer()
+        buffer.setData(QtCore.QByteArray(data))
+        buffer.open(QtCore.QIODevice.ReadOnly)
+        reader = QtGui.QImageReader(buffer)
+        full_size = reader.size()
+        if (
+            width
+            and full_size.isValid()
+            and (full_size.width() > width or full_size.height() > height)
+        ):
+            reader.setScaledSize(
+                full_size.scaled(width, height, QtCore.Qt.KeepAspectRatio)
+            )
+        image = reader.read()
+        if image.isNull():
+            print(f'Error: unable to decode the poster from url "{url}".')
+            with self.__lock:
+                self.__undecodable_urls.add(url)
+            return None
+        return image
+
+    def __on_decoded(
+        self,
+        key: tuple[str, int, int],
+        is_scaled: bool,
+        device_pixel_ratio: float,
+        future: Future,
+    ) -> None:
+        """Adds a poster decoded in the background. Called in the GUI thread."""
+        if self.__decodes.get(key) is not future:
+            return  # the cache was cleared
+        del self.__decodes[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        image = future.result()
+        if image is not None:
+            self.__add_pixmap(key, image, is_scaled, device_pixel_ratio)
+            self.signals.pixmap_decoded.emit(key[0])
+
+    def __add_pixmap(
+        self,
+        key: tuple[str, int, int],
+        image: QtGui.QImage,
+        is_scaled: bool,
+        device_pixel_ratio: float,
+    ) -> QtGui.QPixmap:
+        """Converts a decoded poster to a pixmap and caches it.
+
+        Only use this in the GUI thread.
+        """
+        pixmap = QtGui.QPixmap.fromImage(image)
+        if is_scaled:
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+        self.__pixmaps[key] = pixmap
+        self.__pixmap_bytes += self.__size_of(pixmap)
+        while self.__pixmap_bytes > self.max_pixmap_bytes and len(self.__pixmaps) > 1:
+            _, evicted = self.__pixmaps.popitem(last=False)
+            self.__pixmap_bytes -= self.__size_of(evicted)
+        return pixmap
+
+    def __get_data(self, url: str) -> bytes | None:
+        with self.__lock:
+            if url in self.__data:
+                self.__data.move_to_end(url)
+                return self.__data[url]
+            if url not in self.__evicted_urls:
+                return None
+        if self.disk_cache is None:
+            return None
+        entry = self.disk_cache.get(url)
+        if entry is None:
+            return None
+        self.set_data(url, entry.data)
+        return entry.data
+
+    @staticmethod
+    def __key(
+        url: str, size: QtCore.QSize | None, device_pixel_ratio: float
+    ) -> tuple[str, int, int]:
+        if size is None:
+            return url, 0, 0
+        return (
+            url,
+            round(size.width() * device_pixel_ratio),
+            round(size.height() * device_pixel_ratio),
+        )
+
+    @staticmethod
+    def __size_of(pixmap: QtGui.QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+class PosterHandle:
+    """A reference to one poster in a ``PosterCache``.
+
+    Movies hand out these instead of owning their posters' pixmaps so that the poster
+    cache can decide which pixmaps stay in memory. Until a poster has been downloaded,
+    or if it has no URL or cannot be downloaded, a placeholder with the movie's title
+    is shown instead. Placeholders are not cached, so they don't count against the
+    cache's budgets.
+
+    Parameters
+    ----------
+    cache : PosterCache
+        The cache the poster is in.
+    url : str
+        The poster's URL, or an empty string if the movie has no poster.
+    title : str
+        The text to show on the placeholder.
+    placeholder_size : QtCore.QSize
+        The size of the placeholder when the full size poster is asked for.
+    """
+
+    def __init__(
+        self,
+        cache: PosterCache,
+        url: str,
+        title: str,
+        placeholder_size: QtCore.QSize,
+    ):
+        self.cache = cache
+        self.url = url
+        self.title = title
+        self.placeholder_size = placeholder_size
+
+    def is_loaded(self) -> bool:
+        """Returns True if the poster has been downloaded and is in memory."""
+        return self.cache.has_data(self.url)
+
+    def set_data(self, data: bytes) -> None:
+        self.cache.set_data(self.url, data)
+
+    def pixmap(
+        self, size: QtCore.QSize | None = None, device_pixel_ratio: float = 1.0
+    ) -> QtGui.QPixmap:
+        """Returns the decoded poster, or a placeholder if it has not been downloaded.
+
+        Placeholders are rendered on every call. See ``PosterCache.pixmap`` for the
+        parameters. Only use this in the GUI thread.
+        """
+        if self.url:
+            pixmap = self.cache.pixmap(self.url, size, device_pixel_ratio)
+            if pixmap is not None:
+                return pixmap
+        if size is None:
+            size = self.placeholder_size
+        return placeholder_pixmap(
+            self.title, size.width(), size.height(), device_pixel_ratio
+        )
+
+    def pixmap_async(
+        self, size: QtCore.QSize | None = None, device_pixel_ratio: float = 1.0
+    ) -> QtGui.QPixmap | None:
+        """Returns the decoded poster, or None if a placeholder should be painted.
+
+        None is also returned while the poster is decoded in the background, and the
+        cache's ``pixmap_decoded`` signal is emitted once the poster is ready. See
+        ``PosterCache.pixmap`` for the parameters. Only use this in the GUI thread.
+        """
+        if not self.url:
+            return None
+        return self.cache.pixmap_async(self.url, size, device_pixel_ratio)
+
+    def release(
+        self, size: QtCore.QSize | None = None, device_pixel_ratio: float = 1.0
+    ) -> None:
+        """Lets the poster cache free the decoded poster."""
+        self.cache.release(self.url, size, device_pixel_ratio)
+
+
+poster_cache = PosterCache(disk_cache=poster_fetcher.cache)
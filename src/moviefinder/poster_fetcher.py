@@ -0,0 +1,197 @@
+from collections.abc import Callable
+from collections.abc import Sequence
+from concurrent.futures import CancelledError
+from concurrent.futures import Future
+from functools import partial
+from threading import Lock
+from urllib.parse import urlsplit
+
+import requests
+from moviefinder.disk_cache import DiskCache
+from moviefinder.http_client import http_client
+from moviefinder.poster_urls import original_poster_url
+from moviefinder.single_flight import SingleFlight
+from moviefinder.task_scheduler import Priority
+from moviefinder.task_scheduler import task_scheduler
+from moviefinder.task_scheduler import TaskGroup
+from moviefinder.task_scheduler import TaskScheduler
+
+
+class PosterFetcher:
+    """Downloads posters concurrently.
+
+    The downloads are tasks in a task scheduler, so posters that are about to be shown
+    can be downloaded before the others. Concurrent requests for the same poster share
+    one download. At most ``max_per_host`` posters are downloaded from the same host at
+    once. If a disk cache is given, fresh cached posters are used without any network
+    requests and stale ones are revalidated with conditional requests. If a resized
+    variant of a poster is not on the image CDN, the original is downloaded instead.
+
+    Parameters
+    ----------
+    max_workers : int
+        The maximum number of posters downloaded at the same time, if no scheduler is
+        given.
+    max_per_host : int
+        The maximum number of connections to any one host at the same time.
+    timeout : tuple[float, float]
+        The connect and read timeouts, in seconds, of each download.
+    cache : DiskCache | None
+        Where to save downloaded posters between runs of the app.
+    scheduler : TaskScheduler | None
+        The scheduler to run the downloads in. If None, the fetcher gets its own.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 12,
+        max_per_host: int = 6,
+        timeout: tuple[float, float] = (3.05, 10),
+        cache: DiskCache | None = None,
+        scheduler: TaskScheduler | None = None,
+    ):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.cache = cache
+        if scheduler is None:
+            scheduler = TaskScheduler(
+                max_workers=max_workers, thread_name_prefix="poster_fetcher"
+            )
+        self.scheduler = scheduler
+        # Limits the downloads from each host. Downloads waiting for a connection to
+        # their host don't hold a worker thread.
+        self.__host_groups: dict[str, TaskGroup] = {}
+        # Requests for a poster that is already being downloaded share its download.
+        self.__flights = SingleFlight()
+        # The resized variants that are not on the image CDN.
+        self.__missing_variant_urls: set[str] = set()
+        self.__lock = Lock()
+
+    def fetch(self, url: str) -> bytes | None:
+        """Downloads one poster and blocks until it is done.
+
+        Returns the poster's bytes, or None if the download failed. Unlike the
+        downloads started by ``submit``, this doesn't count toward ``max_per_host``.
+        """
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and entry.is_fresh:
+            return entry.data
+        original_url = original_poster_url(url)
+        with self.__lock:
+            is_missing = url in self.__missing_variant_urls
+        if is_missing:
+            return self.fetch(original_url)
+        headers = entry.revalidation_headers() if entry is not None else {}
+        try:
+            response = http_client.get(
+                url,
+                endpoint=f"GET {urlsplit(url).netloc} poster",
+                headers=headers,
+                timeout=self.timeout,
+            )
+        except requests.exceptions.RequestException as e:
+            print(f'Error: unable to get poster from url "{url}": {e}')
+            return entry.data if entry is not None else None
+        if self.cache is not None and entry is not None and response.status_code == 304:
+            self.cache.refresh(url)
+            return entry.data
+        if response.status_code == 404 and original_url != url:
+            with self.__lock:
+                self.__missing_variant_urls.add(url)
+            data = self.fetch(original_url)
+            if data is not None and self.cache is not None:
+                self.cache.put(url, data)  # so the variant isn't requested again
+            return data
+        if not response:
+            print(f'Error: unable to get poster from url "{url}": {response = }')
+            return entry.data if entry is not None else None
+        if self.cache is not None:
+            self.cache.put(
+                url,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return response.content
+
+    def submit(self, url: str, priority: Priority = Priority.VISIBLE_POSTER) -> Future:
+        """Starts downloading one poster and returns its future without blocking.
+
+        If the poster is already being downloaded, such as for another movie with the
+        same poster, the download is shared instead, and moved to ``priority`` if that
+        is more urgent. Change the download's priority with ``reprioritize``.
+        """
+        future = self.__flights.submit(url, partial(self.__submit, url, priority))
+        shared_future = self.__flights.shared_future(future)
+        if shared_future is not None:
+            self.scheduler.reprioritize(shared_future, priority, only_raise=True)
+        return future
+
+    def reprioritize(self, future: Future, priority: Priority) -> None:
+        """Moves a download that has not started yet to another lane.
+
+        If other callers share the download, it's moved for them too.
+        """
+        shared_future = self.__flights.shared_future(future)
+        if shared_future is not None:
+            self.scheduler.reprioritize(shared_future, priority)
+
+    @property
+    def merged_count(self) -> int:
+        """How many downloads were shared with one already in flight."""
+        return self.__flights.merged_count
+
+    def stream(
+        self,
+        urls: Sequence[str],
+        on_result: Callable[[int, str, bytes | None], None],
+        priority: Priority = Priority.VISIBLE_POSTER,
+    ) -> list[Future]:
+        """Starts downloading posters and returns their futures without blocking.
+
+        Parameters
+        ----------
+        urls : Sequence[str]
+            The URLs of the posters to download.
+        on_result : Callable[[int, str, bytes | None], None]
+            Called with each URL's index, the URL, and the poster's bytes (or None if
+            the download failed). The downloads may finish in any order, but
+            ``on_result`` is always called in the same order as ``urls``, one call at
+            a time, from whichever worker thread finished the download that was
+            being waited on.
+        priority : Priority
+            The downloads' priority.
+        """
+        results: dict[int, bytes | None] = {}
+        next_index = 0
+        lock = Lock()
+
+        def on_done(index: int, future: Future) -> None:
+            nonlocal next_index
+            try:
+                result = future.result()
+            except CancelledError:
+                result = None
+            with lock:
+                results[index] = result
+                while next_index in results:
+                    on_result(next_index, urls[next_index], results.pop(next_index))
+                    next_index += 1
+
+        futures = []
+        for i, url in enumerate(urls):
+            future = self.submit(url, priority)
+            future.add_done_callback(partial(on_done, i))
+            futures.append(future)
+        return futures
+
+    def __submit(self, url: str, priority: Priority) -> Future:
+        host = urlsplit(url).netloc
+        with self.__lock:
+            if host not in self.__host_groups:
+                self.__host_groups[host] = TaskGroup(max_running=self.max_per_host)
+            group = self.__host_groups[host]
+        return self.scheduler.submit(self.fetch, url, priority=priority, group=group)
+
+
+poster_fetcher = PosterFetcher(cache=DiskCache("posters"), scheduler=task_scheduler)
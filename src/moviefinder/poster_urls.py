@@ -0,0 +1,59 @@
+import re
+
+from PySide6 import QtGui
+
+
+POSTER_CDN_BASE_URL = "https://image.tmdb.org"
+# The image CDN serves each poster at these widths, in pixels, and at its original
+# size. URL paths look like ``/t/p/{size}/{file name}`` where size is "w185", "w342",
+# "w500", or "original".
+POSTER_CDN_WIDTHS = (185, 342, 500)
+__poster_path_pattern = re.compile(r"^(?P<prefix>.*/t/p/)(?P<size>original|w\d+)/")
+
+
+def resolve_poster_url(url: str, width: int, device_pixel_ratio: float = 1.0) -> str:
+    """Returns the URL of the smallest variant of a poster that is wide enough.
+
+    URLs that are not from the image CDN are returned unchanged.
+
+    Parameters
+    ----------
+    url : str
+        The URL of any variant of the poster.
+    width : int
+        The width, in device-independent pixels, the poster will be shown at.
+    device_pixel_ratio : float
+        The device pixel ratio of the screen the poster will be shown on.
+    """
+    match = __poster_path_pattern.match(url)
+    if match is None:
+        return url
+    device_width = width * device_pixel_ratio
+    size = "original"
+    for cdn_width in POSTER_CDN_WIDTHS:
+        if cdn_width >= device_width:
+            size = f"w{cdn_width}"
+            break
+    return f"{match['prefix']}{size}/{url[match.end():]}"
+
+
+def original_poster_url(url: str) -> str:
+    """Returns the URL of the original size variant of a poster.
+
+    URLs that are not from the image CDN are returned unchanged.
+    """
+    match = __poster_path_pattern.match(url)
+    if match is None:
+        return url
+    return f"{match['prefix']}original/{url[match.end():]}"
+
+
+def screen_device_pixel_ratio() -> float:
+    """Returns the device pixel ratio of the primary screen, or 1 if there is none.
+
+    Only call this in the GUI thread.
+    """
+    if QtGui.QGuiApplication.instance() is None:
+        return 1.0
+    screen = QtGui.QGuiApplication.primaryScreen()
+    return screen.devicePixelRatio() if screen is not None else 1.0
@@ -0,0 +1,112 @@
+import json
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+
+from moviefinder.disk_cache import DiskCache
+
+
+class ResponseCache:
+    """A least-recently-used cache of the service's JSON responses that expire.
+
+    Responses are keyed by their endpoint and normalized request body, so requests that
+    only differ in the order of their lists share a response. Responses are kept in
+    memory and, if a disk cache is given, on disk so that they survive restarts. Both
+    expire ``ttl_seconds`` after they were stored. This object is thread-safe.
+
+    Parameters
+    ----------
+    max_entries : int
+        The number of responses to keep in memory. The least recently used responses
+        are dropped from memory when there are more.
+    ttl_seconds : float
+        How long a response can be used.
+    disk_cache : DiskCache | None
+        Where to also save responses. Its ``max_age_seconds`` should be
+        ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: float = 60 * 60,
+        disk_cache: DiskCache | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_cache = disk_cache
+        self.hit_count = 0
+        self.miss_count = 0
+        self.__entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.__lock = Lock()
+
+    @staticmethod
+    def key(endpoint: str, body: dict[str, Any]) -> str:
+        """Returns the cache key of a request.
+
+        Lists in the body are sorted because the service treats them as sets.
+        """
+        normalized_body = {
+            name: sorted(value) if isinstance(value, list) else value
+            for name, value in body.items()
+        }
+        return f"{endpoint} {json.dumps(normalized_body, sort_keys=True)}"
+
+    def get(self, key: str) -> Any | None:
+        """Returns a cached response's data, or None if it is not cached or expired."""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                stored_at, data = entry
+                if time.time() - stored_at < self.ttl_seconds:
+                    self.__entries.move_to_end(key)
+                    self.hit_count += 1
+                    return data
+                del self.__entries[key]
+        if self.disk_cache is not None:
+            disk_entry = self.disk_cache.get(key)
+            if disk_entry is not None and disk_entry.is_fresh:
+                try:
+                    data = json.loads(disk_entry.data)
+                except ValueError:
+                    data = None
+                if data is not None:
+                    self.__remember(key, data, disk_entry.stored_at)
+                    with self.__lock:
+                        self.hit_count += 1
+                    return data
+        with self.__lock:
+            self.miss_count += 1
+        return None
+
+    def put(self, key: str, data: Any) -> None:
+        """Caches a response's data, which must be JSON serializable."""
+        self.__remember(key, data, time.time())
+        if self.disk_cache is not None:
+            self.disk_cache.put(key, json.dumps(data).encode("utf8"))
+
+    def clear(self) -> None:
+        """Drops all cached responses, such as when the user's settings change."""
+        with self.__lock:
+            self.__entries.clear()
+        if self.disk_cache is not None:
+            self.disk_cache.clear()
+
+    def __remember(self, key: str, data: Any, stored_at: float) -> None:
+        with self.__lock:
+            self.__entries[key] = (stored_at, data)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+
+RESPONSE_TTL_SECONDS = 60 * 60
+response_cache = ResponseCache(
+    ttl_seconds=RESPONSE_TTL_SECONDS,
+    disk_cache=DiskCache(
+        "responses",
+        max_bytes=20 * 1024 * 1024,
+        max_age_seconds=RESPONSE_TTL_SECONDS,
+    ),
+)
@@ -3,7 +3,6 @@ from typing import Literal
 from moviefinder.buttons import add_services_groupbox
 from moviefinder.checkable_combo_box import CheckableComboBox
 from moviefinder.country_code import CountryCode
-from moviefinder.loading_dialog import LoadingDialog
 from moviefinder.movie import ServiceName
 from moviefinder.movies import movies
 from moviefinder.user import show_message_box
@@ -156,10 +155,5 @@ class SettingsMenu(QtWidgets.QWidget):
             self.main_window.log_out()
             return
         if must_reload_movies and self.from_menu_name == "BrowseMenu":
-            with LoadingDialog():
-                self.main_window.clear_movies()
-                if not movies.load():
-                    show_message_box("Error: unable to connect to the service.")
-                    return
-                self.main_window.browse_menu.reload_browse_widget()
+            self.main_window.browse_menu.refilter(new_genres)
         self.__show_previous_menu()
@@ -0,0 +1,95 @@
+from collections.abc import Callable
+from collections.abc import Hashable
+from concurrent.futures import Future
+from functools import partial
+from threading import Lock
+
+
+class SingleFlight:
+    """Merges concurrent requests for the same resource into one request.
+
+    ``submit`` starts a request unless a request with the same key is already in
+    flight, and gives each caller a future of its own that gets the shared request's
+    result. Cancelling a caller's future only cancels the shared request once every
+    caller's future has been cancelled, so callers never cancel each other's requests.
+    ``merged_count`` counts the requests that joined one already in flight. This object
+    is thread-safe.
+    """
+
+    def __init__(self):
+        self.merged_count = 0
+        self.__flights: dict[Hashable, Future] = {}  # the shared futures by key
+        self.__callers: dict[Future, set[Future]] = {}  # by shared future
+        self.__shared_futures: dict[Future, Future] = {}  # by caller's future
+        self.__lock = Lock()
+
+    def submit(self, key: Hashable, start: Callable[[], Future]) -> Future:
+        """Returns a future of the request with the given key, starting it if needed.
+
+        Parameters
+        ----------
+        key : Hashable
+            What identifies the requested resource, such as its URL.
+        start : Callable[[], Future]
+            Starts the request and returns its future. This is only called if no
+            request with the same key is in flight. It must not call this object.
+        """
+        future: Future = Future()
+        with self.__lock:
+            in_flight = self.__flights.get(key)
+            is_started = in_flight is None
+            if in_flight is None:
+                shared_future = start()
+                self.__flights[key] = shared_future
+                self.__callers[shared_future] = set()
+            else:
+                shared_future = in_flight
+                self.merged_count += 1
+            self.__callers[shared_future].add(future)
+            self.__shared_futures[future] = shared_future
+        if is_started:
+            shared_future.add_done_callback(partial(self.__on_shared_done, key))
+        future.add_done_callback(partial(self.__on_caller_done, key))
+        return future
+
+    def shared_future(self, future: Future) -> Future | None:
+        """Returns the shared request behind a caller's future if it's in flight."""
+        with self.__lock:
+            return self.__shared_futures.get(future)
+
+    def __on_shared_done(self, key: Hashable, shared_future: Future) -> None:
+        """Gives the shared request's result to each of its callers."""
+        with self.__lock:
+            if self.__flights.get(key) is shared_future:
+                del self.__flights[key]
+            futures = self.__callers.pop(shared_future)
+            for future in futures:
+                del self.__shared_futures[future]
+        for future in futures:
+            if shared_future.cancelled():
+                future.cancel()
+            elif future.set_running_or_notify_cancel():
+                if shared_future.exception() is not None:
+                    future.set_exception(shared_future.exception())
+                else:
+                    future.set_result(shared_future.result())
+
+    def __on_caller_done(self, key: Hashable, future: Future) -> None:
+        """Cancels the shared request if every caller's future was cancelled.
+
+        The request stops being in flight as soon as it's unwanted, so callers that
+        arrive while it's being cancelled start a new request instead of joining it.
+        """
+        if not future.cancelled():
+            return
+        with self.__lock:
+            shared_future = self.__shared_futures.pop(future, None)
+            if shared_future is None:
+                return  # the shared request was already done
+            futures = self.__callers[shared_future]
+            futures.discard(future)
+            is_unwanted = not futures
+            if is_unwanted and self.__flights.get(key) is shared_future:
+                del self.__flights[key]
+        if is_unwanted:
+            shared_future.cancel()
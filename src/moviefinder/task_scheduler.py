@@ -0,0 +1,359 @@
+import enum
+import heapq
+import time
+from bisect import bisect_right
+from collections.abc import Callable
+from concurrent.futures import Future
+from functools import partial
+from itertools import count
+from threading import Condition
+from threading import Thread
+from typing import Any
+
+from PySide6 import QtCore
+
+
+class Priority(enum.IntEnum):
+    """The scheduler's lanes. Tasks in lower-numbered lanes start first."""
+
+    VISIBLE_POSTER = 0
+    PAGE = 1
+    PREFETCH = 2
+    BACKGROUND = 3
+
+
+class TaskGroup:
+    """Tasks that share a limit on how many of them may run at the same time.
+
+    For example, the pages of movies must be loaded one at a time, and only a few
+    posters may be downloaded from the same host at once. A group's waiting tasks start
+    in the same order as the scheduler's other tasks: by priority, then oldest first.
+    The group's state is only used by the scheduler, while holding its lock.
+
+    Parameters
+    ----------
+    max_running : int
+        How many of the group's tasks may run at the same time.
+    """
+
+    def __init__(self, max_running: int = 1):
+        self.max_running = max_running
+        self.running_count = 0
+        # The tasks that could not start because the group was at its limit.
+        self.parked: list[tuple[int, int, int, "ScheduledTask"]] = []
+
+
+class ScheduledTask:
+    """A task waiting for or running in a ``TaskScheduler``. Only used by the scheduler.
+
+    ``version`` is incremented when the task's priority changes, so the task's old
+    entries in the scheduler's heaps can be recognized and skipped.
+    """
+
+    WAITING, PARKED, RUNNING, DONE = range(4)
+
+    def __init__(
+        self,
+        fn: Callable,
+        args: tuple,
+        kwargs: dict[str, Any],
+        priority: Priority,
+        group: TaskGroup | None,
+        sequence: int,
+    ):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.group = group
+        self.sequence = sequence
+        self.version = 0
+        self.state = self.WAITING
+        self.future: Future = Future()
+        self.submit_time = time.perf_counter()
+
+    def entry(self) -> tuple[int, int, int, "ScheduledTask"]:
+        """Returns the task's entry for a heap, which sorts by priority, then age."""
+        return (self.priority, self.sequence, self.version, self)
+
+
+class TaskSignals(QtCore.QObject):
+    """Delivers callbacks from the scheduler's threads to the GUI thread."""
+
+    call = QtCore.Signal(object)  # a function to call without arguments
+
+
+class TaskScheduler:
+    """A shared pool of worker threads that runs tasks by priority.
+
+    Tasks wait in one queue ordered by ``Priority`` and then by age, so visible posters
+    start before pages of movies, which start before prefetches and background syncs.
+    Each task returns a ``concurrent.futures.Future``. Cancelling a task's future
+    before the task starts removes it from the queue. Tasks can be limited by a
+    ``TaskGroup``, which waiting tasks don't hold a worker for.
+
+    Speculative tasks, those with a priority of ``Priority.PREFETCH`` or lower, are
+    rejected while ``max_waiting`` tasks are waiting: their futures are returned
+    already cancelled, and they can be submitted again later. How many tasks are waiting
+    in each lane and how long tasks waited to start are tracked, so late posters can be
+    explained. This object is thread-safe.
+
+    Parameters
+    ----------
+    max_workers : int
+        The maximum number of tasks running at the same time.
+    max_waiting : int
+        How many tasks may be waiting before speculative tasks are rejected.
+    thread_name_prefix : str
+        The beginning of the worker threads' names.
+    """
+
+    # The upper bounds, in milliseconds, of the wait time histograms' buckets. The last
+    # bucket has no upper bound.
+    WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        max_waiting: int = 1000,
+        thread_name_prefix: str = "tasks",
+    ):
+        self.max_workers = max_workers
+        self.max_waiting = max_waiting
+        self.rejected_count = 0
+        self.__thread_name_prefix = thread_name_prefix
+        self.__threads: list[Thread] = []
+        self.__idle_worker_count = 0
+        self.__queue: list[tuple[int, int, int, ScheduledTask]] = []
+        # The tasks that have not started yet, including parked ones, by future.
+        self.__waiting_tasks: dict[Future, ScheduledTask] = {}
+        self.__waiting_counts = {priority: 0 for priority in Priority}
+        self.__wait_histograms = {
+            priority: [0] * (len(self.WAIT_BUCKETS_MS) + 1) for priority in Priority
+        }
+        self.__sequence = count()
+        self.__condition = Condition()
+        self.__is_shut_down = False
+        self.__signals = TaskSignals()
+        self.__signals.call.connect(
+            self.__call_in_gui_thread, QtCore.Qt.QueuedConnection
+        )
+
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        priority: Priority = Priority.BACKGROUND,
+        group: TaskGroup | None = None,
+        **kwargs,
+    ) -> Future:
+        """Queues a call of ``fn(*args, **kwargs)`` and returns its future.
+
+        Parameters
+        ----------
+        fn : Callable
+            The function to call in a worker thread.
+        *args
+            The positional arguments to pass to ``fn``.
+        priority : Priority
+            The lane to queue the task in.
+        group : TaskGroup | None
+            The group that limits how many of its tasks may run at once, if any.
+        **kwargs
+            The keyword arguments to pass to ``fn``.
+        """
+        with self.__condition:
+            if self.__is_shut_down:
+                raise RuntimeError("cannot submit tasks after shutdown")
+            task = ScheduledTask(
+                fn, args, kwargs, priority, group, next(self.__sequence)
+            )
+            is_rejected = (
+                priority >= Priority.PREFETCH
+                and sum(self.__waiting_counts.values()) >= self.max_waiting
+            )
+            if is_rejected:
+                self.rejected_count += 1
+                task.state = ScheduledTask.DONE
+            else:
+                self.__waiting_counts[priority] += 1
+                self.__waiting_tasks[task.future] = task
+                heapq.heappush(self.__queue, task.entry())
+                if len(self.__waiting_tasks) > self.__idle_worker_count and (
+                    len(self.__threads) < self.max_workers
+                ):
+                    self.__start_worker()
+                self.__condition.notify()
+        if is_rejected:
+            task.future.cancel()
+            task.future.set_running_or_notify_cancel()
+        else:
+            task.future.add_done_callback(partial(self.__on_task_done, task))
+        return task.future
+
+    def reprioritize(
+        self, future: Future, priority: Priority, only_raise: bool = False
+    ) -> None:
+        """Moves a waiting task to another lane, such as a poster scrolled into view.
+
+        Nothing happens if the task has already started, or if ``only_raise`` is True
+        and the task's lane is already at least as urgent.
+        """
+        with self.__condition:
+            task = self.__waiting_tasks.get(future)
+            if task is None or task.priority == priority:
+                return
+            if only_raise and task.priority < priority:
+                return
+            self.__waiting_counts[task.priority] -= 1
+            self.__waiting_counts[priority] += 1
+            task.priority = priority
+            task.version += 1
+            if task.state == ScheduledTask.PARKED:
+                assert task.group is not None  # only tasks in groups are parked
+                heapq.heappush(task.group.parked, task.entry())
+            else:
+                heapq.heappush(self.__queue, task.entry())
+
+    def add_gui_callback(
+        self, future: Future, callback: Callable[[Future], None]
+    ) -> None:
+        """Calls ``callback(future)`` in the GUI thread once the future is done.
+
+        The callback is delivered by a queued signal, so it is never called before this
+        returns, even if the future is already done.
+        """
+        future.add_done_callback(
+            lambda done_future: self.__signals.call.emit(partial(callback, done_future))
+        )
+
+    def queue_depths(self) -> dict[Priority, int]:
+        """Returns how many tasks are waiting to start in each lane."""
+        with self.__condition:
+            return dict(self.__waiting_counts)
+
+    def wait_histograms(self) -> dict[Priority, list[int]]:
+        """Returns the number of started tasks per wait time bucket for each lane.
+
+        See ``WAIT_BUCKETS_MS`` for the buckets' upper bounds.
+        """
+        with self.__condition:
+            return {
+                priority: list(counts)
+                for priority, counts in self.__wait_histograms.items()
+            }
+
+    def print_wait_histograms(self) -> None:
+        labels = [f"<{ms}ms" for ms in self.WAIT_BUCKETS_MS]
+        labels.append(f">={self.WAIT_BUCKETS_MS[-1]}ms")
+        depths = self.queue_depths()
+        for priority, counts in self.wait_histograms().items():
+            buckets = ", ".join(
+                f"{label}: {count}" for label, count in zip(labels, counts) if count
+            )
+            print(
+                f"{priority.name} tasks ({sum(counts)} started,"
+                f" {depths[priority]} waiting): {buckets}"
+            )
+        print(f"{self.rejected_count} speculative tasks were rejected.")
+
+    def shutdown(self) -> None:
+        """Stops the worker threads once every waiting task has run."""
+        with self.__condition:
+            self.__is_shut_down = True
+            self.__condition.notify_all()
+
+    def __start_worker(self) -> None:
+        """Only call this while holding ``self.__condition``."""
+        thread = Thread(
+            target=self.__work,
+            name=f"{self.__thread_name_prefix}_{len(self.__threads)}",
+            daemon=True,
+        )
+        self.__threads.append(thread)
+        thread.start()
+
+    def __work(self) -> None:
+        while True:
+            with self.__condition:
+                task = self.__next_task()
+                while task is None:
+                    if self.__is_shut_down:
+                        return
+                    self.__idle_worker_count += 1
+                    self.__condition.wait()
+                    self.__idle_worker_count -= 1
+                    task = self.__next_task()
+            self.__run(task)
+
+    def __next_task(self) -> ScheduledTask | None:
+        """Takes the next task that may start from the queue.
+
+        Only call this while holding ``self.__condition``.
+        """
+        while self.__queue:
+            _, _, version, task = heapq.heappop(self.__queue)
+            if version != task.version or task.state != ScheduledTask.WAITING:
+                continue  # the entry is outdated
+            group = task.group
+            if group is not None and group.running_count >= group.max_running:
+                task.state = ScheduledTask.PARKED
+                heapq.heappush(group.parked, task.entry())
+                continue
+            if group is not None:
+                group.running_count += 1
+            task.state = ScheduledTask.RUNNING
+            self.__waiting_counts[task.priority] -= 1
+            del self.__waiting_tasks[task.future]
+            wait_ms = (time.perf_counter() - task.submit_time) * 1000
+            bucket = bisect_right(self.WAIT_BUCKETS_MS, wait_ms)
+            self.__wait_histograms[task.priority][bucket] += 1
+            return task
+        return None
+
+    def __run(self, task: ScheduledTask) -> None:
+        if task.future.set_running_or_notify_cancel():
+            try:
+                result = task.fn(*task.args, **task.kwargs)
+            except BaseException as e:
+                task.future.set_exception(e)
+            else:
+                task.future.set_result(result)
+        with self.__condition:
+            task.state = ScheduledTask.DONE
+            group = task.group
+            if group is not None:
+                group.running_count -= 1
+                self.__unpark(group)
+
+    def __unpark(self, group: TaskGroup) -> None:
+        """Queues the group's best parked task again.
+
+        Only call this while holding ``self.__condition``.
+        """
+        while group.parked:
+            _, _, version, task = heapq.heappop(group.parked)
+            if version == task.version and task.state == ScheduledTask.PARKED:
+                task.state = ScheduledTask.WAITING
+                heapq.heappush(self.__queue, task.entry())
+                self.__condition.notify()
+                return
+
+    def __on_task_done(self, task: ScheduledTask, future: Future) -> None:
+        """Forgets a task that was cancelled before it started."""
+        if not future.cancelled():
+            return
+        with self.__condition:
+            if task.state not in (ScheduledTask.WAITING, ScheduledTask.PARKED):
+                return
+            task.state = ScheduledTask.DONE
+            self.__waiting_counts[task.priority] -= 1
+            del self.__waiting_tasks[future]
+        future.set_running_or_notify_cancel()
+
+    @staticmethod
+    def __call_in_gui_thread(callback: Callable[[], None]) -> None:
+        callback()
+
+
+task_scheduler = TaskScheduler()
@@ -2,10 +2,12 @@ from typing import NoReturn
 from typing import Optional
 
 import requests
+from moviefinder.http_client import http_client
 from moviefinder.movie import CountryCode
 from moviefinder.movie import SERVICE_BASE_URL
 from moviefinder.movie import ServiceName
 from moviefinder.movie import USE_MOCK_DATA
+from moviefinder.response_cache import response_cache
 from moviefinder.validators import EmailValidator
 from PySide6 import QtCore
 from PySide6 import QtWidgets
@@ -92,7 +94,7 @@ class User:
         if USE_MOCK_DATA:
             return True
         try:
-            response = requests.post(
+            response = http_client.post(
                 url=f"{SERVICE_BASE_URL}/register",
                 json={
                     "name": self.name,
@@ -103,7 +105,7 @@ class User:
                     "genre_habits": self.genre_habits,
                 },
             )
-        except requests.exceptions.ConnectionError as e:
+        except requests.exceptions.RequestException as e:
             show_message_box("Error communicating with the service.")
             print(e)
             return False
@@ -143,10 +145,15 @@ class User:
         if new_password:
             data["updatedpw"] = new_password
         if not USE_MOCK_DATA:
-            response = requests.put(
-                url=f"{SERVICE_BASE_URL}/account",
-                json=data,
-            )
+            try:
+                response = http_client.put(
+                    url=f"{SERVICE_BASE_URL}/account",
+                    json=data,
+                )
+            except requests.exceptions.RequestException as e:
+                print(e)
+                show_message_box("Error communicating with the service.")
+                return False
             if response.status_code == 401:
                 print("Status code 401.")
                 print(f"{response.content = }")
@@ -157,6 +164,9 @@ class User:
                 print(f"{response.content = }")
                 show_message_box("Unknown error when updating.")
                 return False
+            if new_region != self.region or new_services != self.services:
+                # The cached movies were chosen for the old region and services.
+                response_cache.clear()
             self.name = new_name
             self.region = new_region
             self.services = new_services
@@ -174,14 +184,19 @@ class User:
         if USE_MOCK_DATA:
             return True
         print("Saving genre habits...")
-        response = requests.put(
-            url=f"{SERVICE_BASE_URL}/data",
-            json={
-                "email": self.email,
-                "genre_habits": self.genre_habits,
-                "password": self.password,
-            },
-        )
+        try:
+            response = http_client.put(
+                url=f"{SERVICE_BASE_URL}/data",
+                json={
+                    "email": self.email,
+                    "genre_habits": self.genre_habits,
+                    "password": self.password,
+                },
+            )
+        except requests.exceptions.RequestException as e:
+            print(e)
+            show_message_box("Error: unable to connect to the service.")
+            return False
         if response.status_code == 401:
             print("Status code 401")
             print(f"{response.content = }")
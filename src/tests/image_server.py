@@ -0,0 +1,110 @@
+"""A local stand-in for the poster image server, for tests and benchmarks."""
+import hashlib
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from threading import Lock
+from threading import Thread
+
+
+class ImageServer:
+    """Serves in-memory images over HTTP on localhost with injected latency.
+
+    Use as a context manager. Add images with ``add``; requests for any other path get
+    a 404 response. Images are served with an ETag, and requests with a matching
+    If-None-Match header get a 304 response. Set ``failures_left`` to make the next
+    requests get a 503 response.
+
+    Parameters
+    ----------
+    latency : float
+        The number of seconds to wait before answering each request.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.images: dict[str, bytes] = {}
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.bytes_sent = 0
+        self.max_concurrent_requests = 0
+        self.failures_left = 0
+        self.__concurrent_requests = 0
+        self.__lock = Lock()
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), self.__make_handler())
+        self.__server.daemon_threads = True
+        # Clients that time out close their connections before the response is sent.
+        self.__server.handle_error = lambda *args: None  # type: ignore
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"http://{str(host)}:{port}"
+
+    def add(self, path: str, image: bytes) -> str:
+        """Serves ``image`` at ``path`` and returns its full URL."""
+        self.images[path] = image
+        return f"{self.base_url}{path}"
+
+    def __enter__(self) -> "ImageServer":
+        Thread(target=self.__server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        with self.__lock:
+            self.request_count += 1
+            self.__concurrent_requests += 1
+            self.max_concurrent_requests = max(
+                self.max_concurrent_requests, self.__concurrent_requests
+            )
+        try:
+            time.sleep(self.latency)
+            with self.__lock:
+                should_fail = self.failures_left > 0
+                self.failures_left -= should_fail
+            image = self.images.get(handler.path)
+            if should_fail or image is None:
+                handler.send_response(503 if should_fail else 404)
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+                return
+            etag = f'"{hashlib.md5(image).hexdigest()}"'
+            if handler.headers.get("If-None-Match") == etag:
+                with self.__lock:
+                    self.not_modified_count += 1
+                handler.send_response(304)
+                handler.send_header("ETag", etag)
+                handler.end_headers()
+                return
+            handler.send_response(200)
+            handler.send_header("Content-Type", "image/jpeg")
+            handler.send_header("ETag", etag)
+            handler.send_header("Content-Length", str(len(image)))
+            handler.end_headers()
+            with self.__lock:
+                self.bytes_sent += len(image)
+            handler.wfile.write(image)
+        finally:
+            with self.__lock:
+                self.__concurrent_requests -= 1
+
+    def __make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                server._handle(self)
+
+            def do_POST(self) -> None:
+                server._handle(self)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,11 @@
+from moviefinder.bitmasks import Vocabulary
+
+
+def test_values_get_bits_in_the_order_they_are_first_seen() -> None:
+    vocabulary = Vocabulary(["action", "comedy"])
+    assert vocabulary.bit("comedy") == 1
+    assert vocabulary.bit("drama") == 2
+    assert vocabulary.bit("action") == 0
+    assert len(vocabulary) == 3
+    assert vocabulary.mask(["drama", "action"]) == 0b101
+    assert vocabulary.mask([]) == 0
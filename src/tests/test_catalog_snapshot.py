@@ -0,0 +1,42 @@
+import struct
+from pathlib import Path
+
+from moviefinder.catalog_snapshot import read_snapshot
+from moviefinder.catalog_snapshot import SNAPSHOT_FORMAT_VERSION
+from moviefinder.catalog_snapshot import write_snapshot
+
+
+STATE = {"keys": ["tt1", "tt2"], "current_page": 1, "movies": [{"imdbID": "tt1"}]}
+
+
+def test_snapshots_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "nested" / "catalog.snapshot"
+    assert write_snapshot(path, STATE)
+    assert read_snapshot(path) == STATE
+    assert list(path.parent.iterdir()) == [path]  # no temporary files are left
+
+
+def test_missing_snapshots_are_not_read(tmp_path: Path) -> None:
+    assert read_snapshot(tmp_path / "catalog.snapshot") is None
+
+
+def test_corrupt_snapshots_are_detected(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.snapshot"
+    assert write_snapshot(path, STATE)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert read_snapshot(path) is None
+    path.write_bytes(bytes(data[:5]))
+    assert read_snapshot(path) is None
+    path.write_bytes(b"not a snapshot at all")
+    assert read_snapshot(path) is None
+
+
+def test_snapshots_with_other_format_versions_are_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.snapshot"
+    assert write_snapshot(path, STATE)
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<H", data, 4, SNAPSHOT_FORMAT_VERSION + 1)
+    path.write_bytes(bytes(data))
+    assert read_snapshot(path) is None
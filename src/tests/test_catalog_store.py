@@ -0,0 +1,132 @@
+import sqlite3
+from pathlib import Path
+
+from moviefinder.catalog_store import CatalogStore
+from moviefinder.country_code import CountryCode
+from moviefinder.movie import Movie
+from moviefinder.movie import ServiceName
+
+
+def make_movie_info(imdb_id: str, title: str, **details) -> dict:
+    return {
+        "imdbID": imdb_id,
+        "title": title,
+        "genres": ["Action"],
+        "countries": ["us"],
+        "videoURL": "https://www.hulu.com/movie/abc",
+        **details,
+    }
+
+
+def add_movies(store: CatalogStore, movies_info: list[dict]) -> None:
+    store.add(Movie(movie_info) for movie_info in movies_info)
+
+
+def search_ids(store: CatalogStore, query: str) -> list[str]:
+    return [info["imdbID"] for info in store.search(query)]
+
+
+def test_titles_rank_above_other_matches() -> None:
+    store = CatalogStore(":memory:")
+    add_movies(
+        store,
+        [
+            make_movie_info("tt1", "Speed", overview="A bus must keep its speed."),
+            make_movie_info("tt2", "The Matrix", cast=["Keanu Reeves"]),
+            make_movie_info("tt3", "John Wick", tagline="From the star of The Matrix"),
+        ],
+    )
+    assert search_ids(store, "matrix") == ["tt2", "tt3"]
+    assert search_ids(store, "the matr") == ["tt2", "tt3"]
+    assert search_ids(store, "keanu") == ["tt2"]
+    assert search_ids(store, "speed")[0] == "tt1"
+    assert store.search("matrix")[0] == make_movie_info(
+        "tt2", "The Matrix", cast=["Keanu Reeves"]
+    )
+
+
+def test_added_movies_replace_stored_movies() -> None:
+    store = CatalogStore(":memory:")
+    add_movies(store, [make_movie_info("tt1", "Old Title")])
+    add_movies(store, [make_movie_info("tt1", "New Title")])
+    assert len(store) == 1
+    assert search_ids(store, "old") == []
+    assert search_ids(store, "new") == ["tt1"]
+
+
+def test_single_letters_and_punctuation_are_searched_safely() -> None:
+    store = CatalogStore(":memory:")
+    add_movies(store, [make_movie_info("tt1", "Plan B"), make_movie_info("tt2", "Big")])
+    assert search_ids(store, "b") == ["tt1"]
+    assert search_ids(store, "bi") == ["tt2"]
+    assert search_ids(store, '"plan" (b*') == ["tt1"]
+    assert search_ids(store, "  --  ") == []
+
+
+def test_broad_searches_rank_title_matches_first() -> None:
+    store = CatalogStore(":memory:", max_ranked_matches=1)
+    add_movies(
+        store,
+        [
+            make_movie_info("tt1", "Heat", overview="A star thief."),
+            make_movie_info("tt2", "Star Wars"),
+            make_movie_info("tt3", "Alien", tagline="A star is born"),
+        ],
+    )
+    results = search_ids(store, "star")
+    assert results[0] == "tt2"
+    assert sorted(results[1:]) == ["tt1", "tt3"]
+
+
+def test_searches_only_return_movies_the_user_can_watch() -> None:
+    store = CatalogStore(":memory:", max_ranked_matches=1)
+    add_movies(
+        store,
+        [
+            make_movie_info("tt1", "Star Wars", countries=["gb"]),
+            make_movie_info("tt2", "Star Trek", videoURL="https://www.netflix.com/1"),
+            make_movie_info("tt3", "Stardust"),
+            make_movie_info("tt4", "Alien", tagline="A star is born"),
+        ],
+    )
+
+    def available_ids(query: str, limit: int = 50) -> list[str]:
+        results = store.search(
+            query, limit, region=CountryCode.US, services=[ServiceName.HULU]
+        )
+        return [info["imdbID"] for info in results]
+
+    assert available_ids("star") == ["tt3", "tt4"]
+    assert available_ids("star", limit=1) == ["tt3"]  # filtered before limiting
+    assert store.search("star", region=CountryCode.US, services=[]) == []
+    add_movies(store, [make_movie_info("tt1", "Star Wars", countries=["gb", "us"])])
+    assert available_ids("wars") == ["tt1"]
+
+
+def test_stores_saved_before_availability_get_it_from_their_movies(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "catalog.sqlite3"
+    store = CatalogStore(path)
+    add_movies(store, [make_movie_info("tt1", "Heat")])
+    store.close()
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        """
+        DROP TRIGGER movies_after_insert;
+        DROP TRIGGER movies_after_delete;
+        DROP TRIGGER movies_after_update;
+        DROP TABLE movies_fts;
+        ALTER TABLE movies DROP COLUMN availability;
+        CREATE VIRTUAL TABLE movies_fts USING fts5(
+            title, tagline, overview, actors, directors,
+            content = 'movies', content_rowid = 'rowid'
+        );
+        INSERT INTO movies_fts (movies_fts) VALUES ('rebuild');
+        """
+    )
+    connection.close()
+    store = CatalogStore(path)
+    results = store.search("heat", region=CountryCode.US, services=[ServiceName.HULU])
+    assert [info["imdbID"] for info in results] == ["tt1"]
+    store.close()
@@ -0,0 +1,61 @@
+import os
+from pathlib import Path
+
+from moviefinder.disk_cache import DiskCache
+from moviefinder.poster_fetcher import PosterFetcher
+from tests.image_server import ImageServer
+
+
+def test_get_returns_what_was_put(tmp_path: Path) -> None:
+    cache = DiskCache("posters", directory=tmp_path)
+    assert cache.get("https://a.com/1.jpg") is None
+    cache.put("https://a.com/1.jpg", b"poster", etag='"abc"')
+    entry = cache.get("https://a.com/1.jpg")
+    assert entry is not None
+    assert entry.data == b"poster"
+    assert entry.is_fresh
+    assert entry.revalidation_headers() == {"If-None-Match": '"abc"'}
+    assert (cache.hit_count, cache.miss_count) == (1, 1)
+
+
+def test_least_recently_used_files_are_evicted(tmp_path: Path) -> None:
+    cache = DiskCache("posters", max_bytes=25, directory=tmp_path)
+    for i in range(3):
+        cache.put(f"https://a.com/{i}.jpg", b"x" * 10)
+        # File modification times are used to track use, so space them out.
+        for path in tmp_path.iterdir():
+            os.utime(path, (path.stat().st_atime, path.stat().st_mtime - 10))
+    assert cache.get("https://a.com/0.jpg") is None
+    assert cache.get("https://a.com/1.jpg") is not None
+    assert cache.get("https://a.com/2.jpg") is not None
+    assert cache.total_bytes == 20
+
+
+def test_warm_start_makes_no_requests(tmp_path: Path) -> None:
+    with ImageServer() as server:
+        urls = [server.add(f"/{i}.jpg", bytes([i]) * 100) for i in range(5)]
+        cold_fetcher = PosterFetcher(cache=DiskCache("posters", directory=tmp_path))
+        assert [cold_fetcher.fetch(url) for url in urls] == [
+            bytes([i]) * 100 for i in range(5)
+        ]
+        assert server.request_count == 5
+        warm_cache = DiskCache("posters", directory=tmp_path)
+        warm_fetcher = PosterFetcher(cache=warm_cache)
+        assert [warm_fetcher.fetch(url) for url in urls] == [
+            bytes([i]) * 100 for i in range(5)
+        ]
+        assert server.request_count == 5
+        assert (warm_cache.hit_count, warm_cache.miss_count) == (5, 0)
+
+
+def test_stale_files_are_revalidated(tmp_path: Path) -> None:
+    with ImageServer() as server:
+        url = server.add("/poster.jpg", b"poster")
+        cache = DiskCache("posters", max_age_seconds=0, directory=tmp_path)
+        fetcher = PosterFetcher(cache=cache)
+        assert fetcher.fetch(url) == b"poster"
+        assert fetcher.fetch(url) == b"poster"
+        assert server.request_count == 2
+        assert server.not_modified_count == 1
+        assert server.bytes_sent == len(b"poster")
+        assert cache.revalidation_count == 1
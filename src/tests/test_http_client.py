@@ -0,0 +1,43 @@
+import pytest
+import requests
+from moviefinder.http_client import HttpClient
+from tests.image_server import ImageServer
+
+
+def test_idempotent_requests_are_retried() -> None:
+    with ImageServer() as server:
+        url = server.add("/poster.jpg", b"poster")
+        server.failures_left = 2
+        response = HttpClient(max_retries=2, backoff_seconds=0.001).get(url)
+        assert response.content == b"poster"
+        assert server.request_count == 3
+
+
+def test_other_requests_are_not_retried() -> None:
+    with ImageServer() as server:
+        url = server.add("/account", b"")
+        server.failures_left = 1
+        response = HttpClient(max_retries=2, backoff_seconds=0.001).post(url)
+        assert response.status_code == 503
+        assert server.request_count == 1
+
+
+def test_requests_time_out() -> None:
+    with ImageServer(latency=1) as server:
+        url = server.add("/poster.jpg", b"poster")
+        client = HttpClient(timeout=(1, 0.05), max_retries=1, backoff_seconds=0.001)
+        with pytest.raises(requests.exceptions.Timeout):
+            client.get(url)
+
+
+def test_latency_is_tracked_per_endpoint() -> None:
+    with ImageServer(latency=0.03) as server:
+        client = HttpClient()
+        for i in range(3):
+            client.get(server.add(f"/{i}.jpg", b"x"), endpoint="poster")
+        client.get(server.add("/other.jpg", b"x"))
+        histograms = client.latency_histograms()
+    assert sum(histograms["poster"]) == 3
+    # 30 ms is past the first two buckets, which are for up to 25 ms.
+    assert histograms["poster"][:2] == [0, 0]
+    assert list(histograms) == ["poster", f"GET {server.base_url[7:]}/other.jpg"]
@@ -0,0 +1,26 @@
+from types import ModuleType
+
+import pytest
+from moviefinder.icons import icon
+from moviefinder.icons import ICON_SIZES
+from moviefinder.resources import filled_heart_icon_path
+from PySide6 import QtCore
+from pytestqt import qtbot  # noqa: F401
+
+
+def test_icons_are_shared_and_prerendered(qtbot: ModuleType) -> None:  # noqa: F811
+    heart_icon = icon(filled_heart_icon_path)
+    assert icon(filled_heart_icon_path) is heart_icon
+    available_sizes = heart_icon.availableSizes()
+    for size in ICON_SIZES:
+        assert QtCore.QSize(size, size) in available_sizes
+        pixmap = heart_icon.pixmap(size)
+        assert not pixmap.isNull()
+        assert pixmap.toImage().pixelColor(size // 2, size // 2).alpha() > 0
+
+
+def test_missing_icons_are_reported(
+    qtbot: ModuleType, capsys: pytest.CaptureFixture[str]  # noqa: F811
+) -> None:
+    assert icon("missing.svg").isNull()
+    assert "missing.svg" in capsys.readouterr().out
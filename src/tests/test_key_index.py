@@ -0,0 +1,51 @@
+import pytest
+from moviefinder.key_index import KeyIndex
+
+
+def test_keys_keep_their_insertion_order() -> None:
+    index = KeyIndex(["b", "a", "c"])
+    assert list(index) == ["b", "a", "c"]
+    assert [index[i] for i in range(len(index))] == ["b", "a", "c"]
+    assert index[-1] == "c"
+
+
+def test_duplicate_keys_are_not_added() -> None:
+    index = KeyIndex(["a", "b"])
+    assert not index.append("a")
+    assert index.append("c")
+    assert index.slice() == ["a", "b", "c"]
+
+
+def test_removed_keys_are_skipped_by_positional_access() -> None:
+    index = KeyIndex(["a", "b", "c", "d"])
+    index.remove("b")
+    index.remove("d")
+    assert "b" not in index
+    assert len(index) == 2
+    assert index.slice() == ["a", "c"]
+    assert index[1] == "c"
+    index.append("b")
+    assert index.slice(1) == ["c", "b"]
+
+
+def test_removing_a_missing_key_raises_key_error() -> None:
+    index = KeyIndex(["a"])
+    index.remove("a")
+    with pytest.raises(KeyError):
+        index.remove("a")
+
+
+def test_snapshots_are_unaffected_by_later_changes() -> None:
+    index = KeyIndex(["a", "b"])
+    snapshot = index.snapshot()
+    index.append("c")
+    assert list(snapshot) == ["a", "b"]
+    assert snapshot.slice(1) == ["b"]
+    index.remove("a")
+    index_snapshot = index.snapshot()
+    index.clear()
+    assert list(snapshot) == ["a", "b"]
+    assert list(index_snapshot) == ["b", "c"]
+    assert index_snapshot.version > snapshot.version
+    with pytest.raises(IndexError):
+        snapshot[2]
@@ -0,0 +1,87 @@
+from types import ModuleType
+
+from moviefinder.buttons import toggle_heart
+from moviefinder.buttons import toggle_x
+from moviefinder.movie_list_model import MovieListModel
+from moviefinder.movies import movies
+from PySide6 import QtCore
+from pytestqt import qtbot  # noqa: F401
+from tests.test_movies import add_movies
+from tests.test_movies import loaded_posters  # noqa: F401
+from tests.test_movies import make_movie_data
+
+
+def listed_movie_ids(model: MovieListModel) -> list[str]:
+    return [model.movie_id(row) for row in range(model.rowCount())]
+
+
+def test_rows_are_added_as_pages_load(
+    qtbot: ModuleType, loaded_posters: list[str]  # noqa: F811
+) -> None:
+    add_movies([make_movie_data("tt1"), make_movie_data("tt2")])
+    model = MovieListModel()
+    assert listed_movie_ids(model) == list(movies.range())
+    add_movies([make_movie_data("tt3"), make_movie_data("tt2")])
+    with qtbot.waitSignal(model.rowsInserted):
+        movies.signals.page_loaded.emit(2)
+    assert listed_movie_ids(model) == list(movies.range())
+    assert sorted(listed_movie_ids(model)) == ["tt1", "tt2", "tt3"]
+    assert model.data(model.index(2), MovieListModel.MOVIE_ID_ROLE) == "tt3"
+    assert model.data(model.index(2)) == "Movie tt3"
+
+
+def test_fixed_lists_do_not_grow(
+    qtbot: ModuleType, loaded_posters: list[str]  # noqa: F811
+) -> None:
+    add_movies([make_movie_data("tt1"), make_movie_data("tt2")])
+    model = MovieListModel(["tt2", "tt2"])
+    assert listed_movie_ids(model) == ["tt2"]
+    assert not model.canFetchMore()
+    movies.signals.page_loaded.emit(2)
+    assert listed_movie_ids(model) == ["tt2"]
+
+
+def test_loaded_posters_and_clicks_update_their_rows(
+    qtbot: ModuleType, loaded_posters: list[str]  # noqa: F811
+) -> None:
+    add_movies([make_movie_data("tt1"), make_movie_data("tt2")])
+    model = MovieListModel()
+    with qtbot.waitSignal(model.dataChanged) as blocker:
+        movies.signals.poster_loaded.emit("tt2")
+    assert model.movie_id(blocker.args[0].row()) == "tt2"
+    assert blocker.args[2] == [QtCore.Qt.DecorationRole]
+    toggle_heart("tt1")
+    toggle_x("tt2")
+    assert movies["tt1"].hearted and movies["tt2"].xed
+    toggle_heart("tt1")
+    assert not movies["tt1"].hearted
+
+
+def test_cleared_models_stop_listing_movies(
+    qtbot: ModuleType, loaded_posters: list[str]  # noqa: F811
+) -> None:
+    add_movies([make_movie_data("tt1")])
+    model = MovieListModel()
+    with qtbot.waitSignal(model.modelReset):
+        model.clear()
+    assert model.rowCount() == 0
+    assert not model.canFetchMore()
+    movies.signals.page_loaded.emit(2)
+    assert model.rowCount() == 0
+
+
+def test_models_can_switch_between_lists(
+    qtbot: ModuleType, loaded_posters: list[str]  # noqa: F811
+) -> None:
+    add_movies([make_movie_data("tt1"), make_movie_data("tt2")])
+    model = MovieListModel()
+    with qtbot.waitSignal(model.modelReset):
+        model.set_movies(["tt2"])
+    assert listed_movie_ids(model) == ["tt2"]
+    assert not model.canFetchMore()
+    with qtbot.waitSignal(model.modelReset):
+        model.set_movies()
+    assert listed_movie_ids(model) == list(movies.range())
+    add_movies([make_movie_data("tt3")])
+    movies.signals.page_loaded.emit(2)
+    assert sorted(listed_movie_ids(model)) == ["tt1", "tt2", "tt3"]
@@ -0,0 +1,550 @@
+import time
+from collections.abc import Iterator
+from concurrent.futures import Future
+from pathlib import Path
+from threading import Event
+from threading import Thread
+from threading import Timer
+from types import ModuleType
+
+import pytest
+from moviefinder.catalog_store import CatalogStore
+from moviefinder.country_code import CountryCode
+from moviefinder.http_client import http_client
+from moviefinder.movie import Movie
+from moviefinder.movie import ServiceName
+from moviefinder.movies import movies
+from moviefinder.poster_fetcher import poster_fetcher
+from moviefinder.response_cache import ResponseCache
+from moviefinder.task_scheduler import Priority
+from moviefinder.user import user
+from pytestqt import qtbot  # noqa: F401
+
+
+def make_movie_data(
+    imdb_id: str,
+    genres: list[str] | None = None,
+    countries: list[str] | None = None,
+    video_url: str = "https://www.hulu.com/movie/abc",
+) -> dict:
+    return {
+        "imdbID": imdb_id,
+        "title": f"Movie {imdb_id}",
+        "genres": genres if genres is not None else ["Action"],
+        "countries": countries if countries is not None else ["us"],
+        "videoURL": video_url,
+        "posterURL": f"https://image.tmdb.org/t/p/original/{imdb_id}.jpg",
+        "year": 2022,
+        "runtime": 100,
+    }
+
+
+@pytest.fixture
+def loaded_posters(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[str]]:
+    """Resets the movies & user singletons and records which posters get loaded."""
+    loaded: list[str] = []
+
+    def fake_submit(url: str, priority: Priority) -> Future:
+        loaded.append(url.rsplit("/", 1)[-1].removesuffix(".jpg"))
+        future: Future = Future()
+        future.set_result(b"")
+        return future
+
+    monkeypatch.setattr(poster_fetcher, "submit", fake_submit)
+    monkeypatch.setattr("moviefinder.movies.response_cache", ResponseCache())
+    monkeypatch.setattr("moviefinder.movies.catalog_store", CatalogStore(":memory:"))
+    movies.clear()
+    movies.genres = ["action"]
+    user.region = CountryCode.US
+    user.services = [ServiceName.HULU]
+    yield loaded
+    movies.clear()
+    movies.genres = []
+    user.region = None
+    user.services = []
+
+
+def add_movies(movies_data: list[dict]) -> bool:
+    return movies._Movies__add_movies(  # type: ignore
+        {"total_pages": 1, "movies": movies_data}
+    )
+
+
+def test_filtered_movies_do_not_load_posters(loaded_posters: list[str]) -> None:
+    assert add_movies(
+        [
+            make_movie_data("tt1"),
+            make_movie_data("tt2", genres=["Comedy"]),
+            make_movie_data("tt3", countries=["gb"]),
+            make_movie_data("tt4", video_url="https://www.netflix.com/title/1"),
+            {"imdbID": "tt5"},
+        ]
+    )
+    assert loaded_posters == ["tt1"]
+    assert list(movies.keys()) == ["tt1"]
+
+
+def test_posters_are_sized_for_the_screen_given_by_the_gui_thread(
+    loaded_posters: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(movies, "device_pixel_ratio", 2.0)
+    assert add_movies([make_movie_data("tt1")])
+    assert movies["tt1"].poster.url.endswith("/w500/tt1.jpg")
+    assert Movie(make_movie_data("tt2")).poster.url.endswith("/w342/tt2.jpg")
+
+
+def test_regions_past_the_first_64_bits_are_matched(
+    loaded_posters: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(user, "region", CountryCode.ZW)
+    assert add_movies(
+        [make_movie_data("tt1", countries=["zw"]), make_movie_data("tt2")]
+    )
+    assert list(movies.keys()) == ["tt1"]
+
+
+def test_duplicate_movies_do_not_load_posters(loaded_posters: list[str]) -> None:
+    assert add_movies([make_movie_data("tt1"), make_movie_data("tt2")])
+    assert add_movies(
+        [make_movie_data("tt2"), make_movie_data("tt3"), make_movie_data("tt3")]
+    )
+    assert sorted(loaded_posters) == ["tt1", "tt2", "tt3"]
+    assert sorted(movies.range()) == ["tt1", "tt2", "tt3"]
+
+
+def test_movies_without_posters_are_kept_without_requests(
+    loaded_posters: list[str],
+) -> None:
+    movie_data = make_movie_data("tt1")
+    del movie_data["posterURL"]
+    assert add_movies([movie_data])
+    assert loaded_posters == []
+    assert list(movies.range()) == ["tt1"]
+    assert movies["tt1"].poster.url == ""
+
+
+def test_refilter_uses_the_loaded_movies(loaded_posters: list[str]) -> None:
+    assert add_movies(
+        [
+            make_movie_data("tt1"),
+            make_movie_data("tt2", genres=["Comedy"]),
+            make_movie_data("tt3", genres=["Action", "Comedy"]),
+            make_movie_data("tt4", genres=["Comedy"], countries=["gb"]),
+        ]
+    )
+    assert sorted(movies.range()) == ["tt1", "tt3"]
+    movies["tt3"].hearted = True
+    assert movies.refilter(["comedy"])
+    assert movies.genres == ["comedy"]
+    assert sorted(movies.range()) == ["tt2", "tt3"]
+    assert movies["tt3"].hearted
+    assert sorted(loaded_posters) == ["tt1", "tt2", "tt3"]
+    assert movies.current_page == 0 and movies.total_pages is None
+    user.region = CountryCode.GB
+    assert movies.refilter(["comedy"])
+    assert list(movies.range()) == ["tt4"]
+    user.services = [ServiceName.NETFLIX]
+    assert not movies.refilter(["comedy", "action"])
+    assert len(movies) == 0
+
+
+def test_refilter_cancels_the_posters_no_longer_shown(
+    loaded_posters: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    downloads: dict[str, Future] = {}
+
+    def fake_submit(url: str, priority: Priority) -> Future:
+        future: Future = Future()
+        downloads[url.rsplit("/", 1)[-1].removesuffix(".jpg")] = future
+        return future
+
+    monkeypatch.setattr(poster_fetcher, "submit", fake_submit)
+    assert add_movies(
+        [
+            make_movie_data("tt1"),
+            make_movie_data("tt2", genres=["Action", "Comedy"]),
+        ]
+    )
+    assert movies.refilter(["comedy"])
+    assert downloads["tt1"].cancelled()
+    assert not downloads["tt2"].cancelled()
+    movies.clear()
+    assert downloads["tt2"].cancelled()
+
+
+def test_posters_in_view_are_downloaded_first(
+    loaded_posters: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    downloads: dict[str, Future] = {}
+    priorities: dict[Future, Priority] = {}
+    requested: list[str] = []
+
+    def fake_submit(url: str, priority: Priority) -> Future:
+        future: Future = Future()
+        requested.append(url.rsplit("/", 1)[-1].removesuffix(".jpg"))
+        downloads[requested[-1]] = future
+        priorities[future] = priority
+        return future
+
+    monkeypatch.setattr(poster_fetcher, "submit", fake_submit)
+    monkeypatch.setattr(poster_fetcher, "reprioritize", priorities.__setitem__)
+    # The IDs are unused by other tests, whose posters stay in the memory cache.
+    assert add_movies([make_movie_data(f"tt{i}") for i in range(901, 906)])
+    downloads["tt904"].cancel()  # such as when rejected by the busy scheduler
+    downloads["tt905"].set_result(None)
+    movies.prioritize_posters(["tt901", "tt904", "tt905"], ["tt902"])
+    assert priorities[downloads["tt901"]] == Priority.VISIBLE_POSTER
+    assert priorities[downloads["tt902"]] == Priority.PREFETCH
+    assert priorities[downloads["tt903"]] == Priority.BACKGROUND
+    # The cancelled download is requested again, but not the one that failed.
+    assert priorities[downloads["tt904"]] == Priority.VISIBLE_POSTER
+    assert not downloads["tt904"].cancelled()
+    assert loaded_posters == []
+    downloads["tt901"].set_result(b"")
+    assert movies["tt901"].poster.is_loaded()
+    movies.prioritize_posters(["tt901"], [])
+    assert sorted(requested) == ["tt901", "tt902", "tt903", "tt904", "tt904", "tt905"]
+
+
+def test_search_finds_movies_on_the_users_services(
+    loaded_posters: list[str],
+) -> None:
+    assert add_movies(
+        [
+            make_movie_data("tt1"),
+            make_movie_data("tt2", genres=["Comedy"]),
+            make_movie_data("tt3", video_url="https://www.netflix.com/title/1"),
+        ]
+    )
+    movies.clear()  # the catalog store keeps the movies
+    assert sorted(movies.search("movie")) == ["tt1", "tt2"]
+    assert movies["tt2"].title == "Movie tt2"  # search results can be looked up
+    assert list(movies.range()) == []  # but are not added to the browsed movies
+    assert movies.search("nothing") == []
+
+
+def test_searches_skip_unavailable_movies_before_limiting(
+    loaded_posters: list[str],
+) -> None:
+    unavailable_movies = [
+        make_movie_data(f"tt{i}", video_url="https://www.netflix.com/title/1")
+        for i in range(1, 6)
+    ]
+    for movie_data in unavailable_movies:
+        movie_data["title"] = "Movie movie movie"  # ranked above the available one
+    assert add_movies(unavailable_movies + [make_movie_data("tt9")])
+    movies.clear()
+    assert movies.search("movie", limit=1) == ["tt9"]
+    assert movies["tt9"].title == "Movie tt9"
+    assert not movies.refilter(["action"])  # search results are not in the catalog
+    assert "tt9" not in movies.range()
+
+
+class FakeService:
+    """Serves pages of 10 movies each and records which pages get requested.
+
+    ``requested`` is set when a request arrives, and requests block until ``release``
+    is set. Set ``failures_left`` to make the next requests fail.
+    """
+
+    content = b""
+
+    def __init__(self, total_pages: int):
+        self.total_pages = total_pages
+        self.requested_pages: list[int] = []
+        self.requested = Event()
+        self.release = Event()
+        self.release.set()
+        self.failures_left = 0
+        self.is_ok = True
+
+    def get(self, url: str, json: dict, **kwargs) -> "FakeService":
+        page = int(json["page"])
+        self.requested_pages.append(page)
+        self.requested.set()
+        assert self.release.wait(5)
+        self.page = page
+        self.is_ok = self.failures_left == 0
+        self.failures_left = max(0, self.failures_left - 1)
+        return self
+
+    def __bool__(self) -> bool:
+        return self.is_ok
+
+    def json(self) -> dict:
+        return {
+            "total_pages": self.total_pages,
+            "movies": [make_movie_data(f"tt{self.page}{i}") for i in range(10)],
+        }
+
+
+@pytest.fixture
+def service(
+    loaded_posters: list[str], monkeypatch: pytest.MonkeyPatch
+) -> Iterator[FakeService]:
+    service = FakeService(total_pages=4)
+    monkeypatch.setattr(http_client, "get", service.get)
+    yield service
+    movies.set_prefetching_paused(True)
+    service.release.set()
+    movies.wait_for_pages(timeout=5)
+    movies.set_prefetching_paused(False)
+
+
+def wait_for_page(page: int) -> None:
+    deadline = time.monotonic() + 5
+    while movies.current_page < page:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_prefetch_reads_ahead_and_stops_at_the_last_page(
+    service: FakeService,
+) -> None:
+    movies.prefetch(0)
+    wait_for_page(3)
+    time.sleep(0.05)
+    assert service.requested_pages == [1, 2, 3]
+    movies.prefetch(35)
+    wait_for_page(4)
+    movies.prefetch(40)
+    time.sleep(0.05)
+    assert service.requested_pages == [1, 2, 3, 4]
+    assert len(movies) == 40
+    assert not movies.has_more_pages()
+
+
+def test_load_merges_with_a_prefetch_of_the_same_page(service: FakeService) -> None:
+    service.release.clear()
+    movies.prefetch(0)
+    Timer(0.1, service.release.set).start()
+    assert movies.load()
+    assert service.requested_pages[0] == 1
+    assert service.requested_pages.count(1) == 1
+
+
+def test_repeated_queries_are_served_from_the_response_cache(
+    service: FakeService,
+) -> None:
+    movies.set_prefetching_paused(True)  # so only the first page is loaded
+    assert movies.load()
+    movies.clear()
+    movies.genres = ["action"]
+    assert movies.load()
+    assert service.requested_pages.count(1) == 1
+    assert len(movies) == 10
+
+
+def test_paused_prefetching_catches_up_when_resumed(service: FakeService) -> None:
+    movies.set_prefetching_paused(True)
+    movies.prefetch(0)
+    time.sleep(0.05)
+    assert service.requested_pages == []
+    movies.set_prefetching_paused(False)
+    wait_for_page(3)
+    assert service.requested_pages == [1, 2, 3]
+
+
+def test_pages_that_fail_to_load_are_reported(
+    qtbot: ModuleType, service: FakeService  # noqa: F811
+) -> None:
+    movies.set_prefetching_paused(True)
+    service.failures_left = 1
+    with qtbot.waitSignal(movies.signals.page_failed) as blocker:
+        assert not movies.load()
+    assert blocker.args == [1]
+    assert movies.current_page == 0
+    assert movies.load()
+    assert service.requested_pages == [1, 1]
+
+
+def test_async_loads_can_be_cancelled_and_loaded_again(
+    service: FakeService,
+) -> None:
+    movies.set_prefetching_paused(True)  # so only the first page is requested
+    service.release.clear()
+    loading = movies.load_async()
+    assert service.requested.wait(5)  # the page is being downloaded
+    movies.cancel_loading()
+    service.release.set()
+    assert loading.cancelled() or not loading.result(timeout=5)
+    assert len(movies) == 0
+    assert movies.current_page == 0
+    assert movies.load_async().result(timeout=5)  # served from the response cache
+    assert "tt10" in movies
+    assert service.requested_pages == [1]
+
+
+def test_pages_waiting_to_load_are_cancelled(service: FakeService) -> None:
+    movies.set_prefetching_paused(True)
+    assert movies.load()
+    service.release.clear()
+    service.requested.clear()
+    loading = movies.load_async()
+    assert service.requested.wait(5)
+    movies.set_prefetching_paused(False)  # page 3 waits for page 2
+    movies.cancel_loading()
+    movies.set_prefetching_paused(True)
+    service.release.set()
+    assert loading.cancelled() or not loading.result(timeout=5)
+    assert movies.load()
+    assert "tt20" in movies
+    assert service.requested_pages == [1, 2]  # page 2 came from the response cache
+
+
+def test_pages_loading_while_cleared_are_discarded(service: FakeService) -> None:
+    service.release.clear()
+    movies.prefetch(0)
+    time.sleep(0.05)
+    movies.clear()
+    service.release.set()
+    time.sleep(0.1)
+    assert len(movies) == 0
+    assert movies.current_page == 0
+
+
+def test_keys_stay_consistent_with_the_movies(loaded_posters: list[str]) -> None:
+    assert add_movies([make_movie_data("tt1"), make_movie_data("tt2")])
+    movie_1 = movies["tt1"]
+    movies["tt1"] = movie_1
+    movies.update({"tt3": movie_1})
+    del movies["tt2"]
+    assert sorted(movies.range()) == ["tt1", "tt3"]
+    assert list(movies.range()) == list(movies.keys())
+    with pytest.raises(KeyError):
+        del movies["tt2"]
+    assert list(movies.range(1)) == ["tt3"]
+
+
+def test_additions_after_removals_are_read_in_order(
+    loaded_posters: list[str],
+) -> None:
+    assert add_movies([make_movie_data(f"tt{i}") for i in range(1, 5)])
+    order = list(movies.range())
+    del movies[order[0]]
+    del movies[order[2]]
+    movies[order[0]] = movies[order[0]]  # the catalog still has the movie
+    assert list(movies.range()) == [order[1], order[3], order[0]]
+    assert list(movies.range(2)) == [order[0]]
+
+
+def test_range_iterates_a_snapshot(loaded_posters: list[str]) -> None:
+    assert add_movies([make_movie_data("tt1"), make_movie_data("tt2")])
+    keys = movies.range()
+    first_key = next(keys)
+    assert add_movies([make_movie_data("tt3")])
+    del movies[first_key]
+    assert list(keys) == [({"tt1", "tt2"} - {first_key}).pop()]
+    assert sorted(movies.range()) == sorted({"tt1", "tt2", "tt3"} - {first_key})
+
+
+def test_readers_see_consistent_snapshots_while_a_thread_writes(
+    loaded_posters: list[str],
+) -> None:
+    """Every tenth page, the writer removes the page's first movie after adding it."""
+    movie = Movie(make_movie_data("tt0"))
+    page_count = 200
+    page_size = 25
+    all_keys = [f"tt{page}-{i}" for page in range(page_count) for i in range(page_size)]
+    positions = {key: i for i, key in enumerate(all_keys)}
+    removed_keys = {f"tt{page}-0" for page in range(9, page_count, 10)}
+    is_writing = True
+    errors: list[list[str]] = []
+
+    def write() -> None:
+        nonlocal is_writing
+        for page in range(page_count):
+            for i in range(page_size):
+                movies[f"tt{page}-{i}"] = movie
+            if page % 10 == 9:
+                del movies[f"tt{page}-0"]
+        is_writing = False
+
+    def is_consistent(keys: list[str]) -> bool:
+        if not keys:
+            return True
+        last_key = keys[-1]
+        expected = [
+            key
+            for key in all_keys[: positions[last_key] + 1]
+            if key not in removed_keys or key.split("-")[0] == last_key.split("-")[0]
+        ]
+        if keys == expected:
+            return True
+        # The writer may have removed the last page's first movie already.
+        return last_key.endswith("-24") and keys == expected[:-25] + expected[-24:]
+
+    def read() -> None:
+        while is_writing:
+            keys = list(movies.range())
+            if not is_consistent(keys):
+                errors.append(keys)
+
+    readers = [Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    write()
+    for reader in readers:
+        reader.join()
+    assert not errors
+    assert list(movies.range()) == [key for key in all_keys if key not in removed_keys]
+    assert list(movies.range()) == list(movies.keys())
+
+
+def test_snapshots_restore_the_order_pages_and_flags(
+    service: FakeService, tmp_path: Path
+) -> None:
+    movies.set_prefetching_paused(True)
+    assert movies.load()
+    keys = list(movies.range())
+    movies[keys[0]].hearted = True
+    movies[keys[1]].xed = True
+    path = tmp_path / "catalog.snapshot"
+    assert movies.save_snapshot(path)
+    movies.clear()
+    assert movies.restore_snapshot(path)
+    assert list(movies.range()) == keys
+    assert movies[keys[0]].hearted and movies[keys[1]].xed
+    assert not movies[keys[2]].hearted and not movies[keys[2]].xed
+    assert movies.current_page == 1 and movies.total_pages == 4
+    assert not movies.restore_snapshot(path)  # movies are already loaded
+
+
+def test_snapshots_are_refiltered_or_ignored_when_settings_change(
+    loaded_posters: list[str], tmp_path: Path
+) -> None:
+    assert add_movies([make_movie_data("tt1"), make_movie_data("tt2", ["Comedy"])])
+    path = tmp_path / "catalog.snapshot"
+    assert movies.save_snapshot(path)
+    movies.clear()
+    user.services = [ServiceName.NETFLIX]
+    assert not movies.restore_snapshot(path)
+    user.services = [ServiceName.HULU]
+    movies.genres = ["comedy"]
+    assert movies.restore_snapshot(path)
+    assert list(movies.range()) == ["tt2"]
+
+
+def test_revalidation_refreshes_the_restored_movies(
+    service: FakeService, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    movies.set_prefetching_paused(True)
+    assert movies.load()
+    movies["tt10"].hearted = True
+    path = tmp_path / "catalog.snapshot"
+    assert movies.save_snapshot(path)
+    movies.clear()
+    assert movies.restore_snapshot(path)
+    movies_data = [make_movie_data(f"tt1{i}") for i in range(9)]  # tt19 is gone
+    movies_data[0]["title"] = "New title"
+    monkeypatch.setattr(
+        service, "json", lambda: {"total_pages": 4, "movies": movies_data}
+    )
+    assert movies.revalidate().result()
+    assert service.requested_pages.count(1) == 2  # not from the response cache
+    assert movies["tt10"].title == "New title" and movies["tt10"].hearted
+    assert "tt19" in movies  # still shown until the next launch
+    assert movies.save_snapshot(path)
+    movies.clear()
+    assert movies.restore_snapshot(path)
+    assert "tt19" not in movies and movies["tt10"].title == "New title"
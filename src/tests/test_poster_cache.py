@@ -0,0 +1,162 @@
+from pathlib import Path
+from threading import Event
+from types import ModuleType
+
+from moviefinder.disk_cache import DiskCache
+from moviefinder.poster_cache import PosterCache
+from moviefinder.task_scheduler import Priority
+from moviefinder.task_scheduler import TaskScheduler
+from PySide6 import QtCore
+from PySide6 import QtGui
+from pytestqt import qtbot  # noqa: F401
+
+
+def make_jpeg(width: int, height: int) -> bytes:
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_RGB32)
+    image.fill(QtGui.QColor("gray"))
+    buffer = QtCore.QBuffer()
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    image.save(buffer, "JPEG")
+    return bytes(buffer.data())
+
+
+def test_pixmap_is_none_until_downloaded(qtbot: ModuleType) -> None:  # noqa: F811
+    cache = PosterCache()
+    assert cache.pixmap("https://a.com/1.jpg") is None
+    cache.set_data("https://a.com/1.jpg", make_jpeg(10, 20))
+    pixmap = cache.pixmap("https://a.com/1.jpg")
+    assert pixmap is not None
+    assert (pixmap.width(), pixmap.height()) == (10, 20)
+
+
+def test_handles_show_placeholders_until_downloaded(
+    qtbot: ModuleType,  # noqa: F811
+) -> None:
+    cache = PosterCache()
+    handle = cache.handle("https://a.com/1.jpg", "Title", QtCore.QSize(235, 350))
+    assert not handle.is_loaded()
+    placeholder = handle.pixmap()
+    assert (placeholder.width(), placeholder.height()) == (235, 350)
+    assert handle.pixmap_async() is None  # the delegate paints the placeholder
+    assert cache.resident_bytes == 0  # placeholders are not kept in memory
+    handle.set_data(make_jpeg(10, 20))
+    assert handle.is_loaded()
+    assert (handle.pixmap().width(), handle.pixmap().height()) == (10, 20)
+
+
+def test_decoded_pixmaps_stay_within_budget(qtbot: ModuleType) -> None:  # noqa: F811
+    pixmap_bytes = 100 * 100 * 4
+    cache = PosterCache(max_pixmap_bytes=3 * pixmap_bytes)
+    jpeg = make_jpeg(100, 100)
+    for i in range(5):
+        cache.set_data(f"https://a.com/{i}.jpg", jpeg)
+        assert cache.pixmap(f"https://a.com/{i}.jpg") is not None
+    assert cache.pixmap_bytes == 3 * pixmap_bytes
+    assert cache.data_bytes == 5 * len(jpeg)
+    assert cache.resident_bytes == cache.pixmap_bytes + cache.data_bytes
+    cache.release("https://a.com/4.jpg")
+    assert cache.pixmap_bytes == 2 * pixmap_bytes
+
+
+def test_evicted_bytes_are_read_from_disk(
+    qtbot: ModuleType, tmp_path: Path  # noqa: F811
+) -> None:
+    disk_cache = DiskCache("posters", directory=tmp_path)
+    jpeg = make_jpeg(10, 10)
+    cache = PosterCache(max_data_bytes=len(jpeg), disk_cache=disk_cache)
+    for i in range(2):
+        disk_cache.put(f"https://a.com/{i}.jpg", jpeg)
+        cache.set_data(f"https://a.com/{i}.jpg", jpeg)
+    assert cache.data_bytes == len(jpeg)
+    assert cache.pixmap("https://a.com/0.jpg") is not None
+    assert disk_cache.hit_count == 1
+
+
+def test_thumbnails_are_decoded_at_thumbnail_size(qtbot: ModuleType) -> None:  # noqa
+    cache = PosterCache()
+    cache.set_data("https://a.com/1.jpg", make_jpeg(2000, 3000))
+    thumbnail_size = QtCore.QSize(235, 350)
+    thumbnail = cache.pixmap("https://a.com/1.jpg", thumbnail_size)
+    assert thumbnail is not None
+    assert (thumbnail.width(), thumbnail.height()) == (233, 350)
+    high_dpi_thumbnail = cache.pixmap("https://a.com/1.jpg", thumbnail_size, 2.0)
+    assert high_dpi_thumbnail is not None
+    assert (high_dpi_thumbnail.width(), high_dpi_thumbnail.height()) == (466, 700)
+    assert high_dpi_thumbnail.devicePixelRatio() == 2.0
+    assert cache.pixmap_bytes == (233 * 350 + 466 * 700) * 4
+    full = cache.pixmap("https://a.com/1.jpg")
+    assert full is not None
+    assert (full.width(), full.height()) == (2000, 3000)
+
+
+def test_posters_can_be_decoded_in_the_background(
+    qtbot: ModuleType,  # noqa: F811
+) -> None:
+    cache = PosterCache()
+    thumbnail_size = QtCore.QSize(235, 350)
+    assert cache.pixmap_async("https://a.com/1.jpg", thumbnail_size) is None
+    cache.set_data("https://a.com/1.jpg", make_jpeg(2000, 3000))
+    with qtbot.waitSignal(cache.signals.pixmap_decoded) as blocker:
+        assert cache.pixmap_async("https://a.com/1.jpg", thumbnail_size) is None
+        assert cache.pixmap_async("https://a.com/1.jpg", thumbnail_size) is None
+    assert blocker.args == ["https://a.com/1.jpg"]
+    thumbnail = cache.pixmap_async("https://a.com/1.jpg", thumbnail_size)
+    assert thumbnail is not None
+    assert (thumbnail.width(), thumbnail.height()) == (233, 350)
+    assert cache.pixmap("https://a.com/1.jpg", thumbnail_size) is thumbnail
+    assert cache.pixmap_bytes == 233 * 350 * 4
+
+
+def test_undecodable_posters_are_not_decoded_again(
+    qtbot: ModuleType,  # noqa: F811
+) -> None:
+    cache = PosterCache()
+    handle = cache.handle("https://a.com/1.jpg", "Title", QtCore.QSize(235, 350))
+    handle.set_data(b"not a poster")
+    assert handle.pixmap_async() is None
+    qtbot.waitUntil(
+        lambda: handle.url in cache._PosterCache__undecodable_urls  # type: ignore
+    )
+    with qtbot.assertNotEmitted(cache.signals.pixmap_decoded, wait=50):
+        assert handle.pixmap_async() is None
+    handle.set_data(make_jpeg(10, 20))
+    with qtbot.waitSignal(cache.signals.pixmap_decoded):
+        assert handle.pixmap_async() is None
+    pixmap = handle.pixmap_async()
+    assert pixmap is not None
+    assert (pixmap.width(), pixmap.height()) == (10, 20)
+
+
+def test_clearing_drops_the_posters_being_decoded(
+    qtbot: ModuleType,  # noqa: F811
+) -> None:
+    cache = PosterCache()
+    cache.set_data("https://a.com/1.jpg", make_jpeg(10, 20))
+    with qtbot.assertNotEmitted(cache.signals.pixmap_decoded, wait=100):
+        assert cache.pixmap_async("https://a.com/1.jpg") is None
+        cache.clear()
+    assert cache.pixmap_bytes == 0
+
+
+def test_decodes_scrolled_out_of_view_are_cancelled(
+    qtbot: ModuleType,  # noqa: F811
+) -> None:
+    scheduler = TaskScheduler(max_workers=1)
+    cache = PosterCache(scheduler=scheduler)
+    release = Event()
+    scheduler.submit(release.wait, 5, priority=Priority.VISIBLE_POSTER)
+    urls = [f"https://a.com/{i}.jpg" for i in range(3)]
+    for url in urls:
+        cache.set_data(url, make_jpeg(10, 20))
+        assert cache.pixmap_async(url) is None
+    decoded_urls: list[str] = []
+    cache.signals.pixmap_decoded.connect(decoded_urls.append)
+    cache.prioritize_decodes(visible_urls=urls[2:], nearby_urls=urls[1:2])
+    release.set()
+    qtbot.waitUntil(lambda: len(decoded_urls) == 2)
+    with qtbot.assertNotEmitted(cache.signals.pixmap_decoded, wait=50):
+        pass
+    assert decoded_urls == [urls[2], urls[1]]
+    assert cache.pixmap_async(urls[0]) is None  # decoded again once back in view
+    qtbot.waitUntil(lambda: len(decoded_urls) == 3)
+    scheduler.shutdown()
@@ -0,0 +1,51 @@
+from threading import Event
+
+from moviefinder.poster_fetcher import PosterFetcher
+from tests.image_server import ImageServer
+
+
+def test_fetch_returns_none_for_missing_poster() -> None:
+    with ImageServer() as server:
+        assert PosterFetcher().fetch(f"{server.base_url}/missing.jpg") is None
+
+
+def test_stream_reports_results_in_order() -> None:
+    with ImageServer(latency=0.02) as server:
+        urls = [server.add(f"/{i}.jpg", bytes([i])) for i in range(20)]
+        urls.insert(5, f"{server.base_url}/missing.jpg")
+        results: list[tuple[int, str, bytes | None]] = []
+        done = Event()
+
+        def on_result(index: int, url: str, data: bytes | None) -> None:
+            results.append((index, url, data))
+            if len(results) == len(urls):
+                done.set()
+
+        PosterFetcher(max_workers=8).stream(urls, on_result)
+        assert done.wait(timeout=10)
+    assert [index for index, _, _ in results] == list(range(len(urls)))
+    assert [url for _, url, _ in results] == urls
+    assert results[5][2] is None
+    assert results[6][2] == bytes([5])
+
+
+def test_stream_limits_connections_per_host() -> None:
+    with ImageServer(latency=0.05) as server:
+        urls = [server.add(f"/{i}.jpg", b"x") for i in range(12)]
+        futures = PosterFetcher(max_workers=12, max_per_host=3).stream(
+            urls, lambda *_: None
+        )
+        for future in futures:
+            future.result(timeout=10)
+        assert 1 <= server.max_concurrent_requests <= 3
+
+
+def test_concurrent_requests_for_a_poster_share_one_download() -> None:
+    with ImageServer(latency=0.05) as server:
+        url = server.add("/1.jpg", b"x")
+        fetcher = PosterFetcher(max_workers=4)
+        futures = [fetcher.submit(url) for _ in range(3)]
+        futures[0].cancel()  # the others still get the poster
+        assert [future.result(timeout=10) for future in futures[1:]] == [b"x", b"x"]
+        assert server.request_count == 1
+        assert fetcher.merged_count == 2
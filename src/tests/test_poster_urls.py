@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import pytest
+from moviefinder.disk_cache import DiskCache
+from moviefinder.poster_fetcher import PosterFetcher
+from moviefinder.poster_urls import original_poster_url
+from moviefinder.poster_urls import resolve_poster_url
+from tests.image_server import ImageServer
+
+TMDB_URL = "https://image.tmdb.org/t/p/{}/fU0QQzO6As3c1jkQWvcT82JWpXd.jpg"
+
+
+@pytest.mark.parametrize(
+    "width, device_pixel_ratio, size",
+    [
+        (100, 1.0, "w185"),
+        (185, 1.0, "w185"),
+        (235, 1.0, "w342"),
+        (235, 2.0, "w500"),
+        (470, 1.0, "w500"),
+        (470, 2.0, "original"),
+    ],
+)
+def test_resolve_poster_url(width: int, device_pixel_ratio: float, size: str) -> None:
+    assert resolve_poster_url(
+        TMDB_URL.format("original"), width, device_pixel_ratio
+    ) == TMDB_URL.format(size)
+
+
+def test_resolve_poster_url_ignores_other_urls() -> None:
+    url = "https://example.com/poster.png"
+    assert resolve_poster_url(url, 235) == url
+    assert original_poster_url(url) == url
+
+
+def test_original_poster_url() -> None:
+    assert original_poster_url(TMDB_URL.format("w342")) == TMDB_URL.format("original")
+
+
+def test_right_sized_variants_transfer_fewer_bytes() -> None:
+    with ImageServer() as server:
+        originals = []
+        for i in range(10):
+            originals.append(server.add(f"/t/p/original/{i}.jpg", b"o" * 500_000))
+            server.add(f"/t/p/w342/{i}.jpg", b"s" * 25_000)
+        fetcher = PosterFetcher()
+        for url in originals:
+            assert fetcher.fetch(url) is not None
+        original_bytes = server.bytes_sent
+        server.bytes_sent = 0
+        for url in originals:
+            assert fetcher.fetch(resolve_poster_url(url, 235)) == b"s" * 25_000
+        assert server.bytes_sent * 20 == original_bytes
+
+
+def test_missing_variants_fall_back_to_the_original() -> None:
+    with ImageServer() as server:
+        url = server.add("/t/p/original/poster.jpg", b"original")
+        fetcher = PosterFetcher()
+        assert fetcher.fetch(resolve_poster_url(url, 235)) == b"original"
+        assert server.request_count == 2
+        assert fetcher.fetch(resolve_poster_url(url, 235)) == b"original"
+        assert server.request_count == 3  # the variant is not requested again
+
+
+def test_fallback_posters_are_cached_under_the_variants_url(tmp_path: Path) -> None:
+    with ImageServer() as server:
+        url = server.add("/t/p/original/poster.jpg", b"original")
+        cache = DiskCache("posters", directory=tmp_path)
+        assert PosterFetcher(cache=cache).fetch(resolve_poster_url(url, 235))
+        next_launch_fetcher = PosterFetcher(cache=cache)
+        assert next_launch_fetcher.fetch(resolve_poster_url(url, 235)) == b"original"
+        assert server.request_count == 2
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+from moviefinder.disk_cache import DiskCache
+from moviefinder.response_cache import ResponseCache
+
+
+def test_keys_ignore_the_order_of_lists() -> None:
+    key = ResponseCache.key(
+        "/movie", {"genre": ["Drama", "Action"], "services": ["netflix", "hulu"]}
+    )
+    assert key == ResponseCache.key(
+        "/movie", {"services": ["hulu", "netflix"], "genre": ["Action", "Drama"]}
+    )
+    assert key != ResponseCache.key(
+        "/movie", {"genre": ["Action"], "services": ["hulu", "netflix"]}
+    )
+
+
+def test_least_recently_used_responses_are_dropped() -> None:
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", {"page": 1})
+    cache.put("b", {"page": 2})
+    assert cache.get("a") == {"page": 1}
+    cache.put("c", {"page": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"page": 1}
+    assert cache.get("c") == {"page": 3}
+    assert (cache.hit_count, cache.miss_count) == (3, 1)
+
+
+def test_responses_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr("moviefinder.response_cache.time.time", lambda: now)
+    cache = ResponseCache(ttl_seconds=60)
+    cache.put("a", {"page": 1})
+    now += 59
+    assert cache.get("a") == {"page": 1}
+    now += 2
+    assert cache.get("a") is None
+
+
+def test_responses_are_read_back_from_disk(tmp_path: Path) -> None:
+    ResponseCache(disk_cache=DiskCache("responses", directory=tmp_path)).put(
+        "a", {"page": 1}
+    )
+    cache = ResponseCache(disk_cache=DiskCache("responses", directory=tmp_path))
+    assert cache.get("a") == {"page": 1}
+    cache.clear()
+    assert cache.get("a") is None
+    cache = ResponseCache(disk_cache=DiskCache("responses", directory=tmp_path))
+    assert cache.get("a") is None
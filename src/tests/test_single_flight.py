@@ -0,0 +1,67 @@
+from concurrent.futures import Future
+
+import pytest
+from moviefinder.single_flight import SingleFlight
+
+
+def test_requests_with_the_same_key_share_one_result() -> None:
+    flights = SingleFlight()
+    started: list[Future] = []
+
+    def start() -> Future:
+        started.append(Future())
+        return started[-1]
+
+    first = flights.submit("a", start)
+    second = flights.submit("a", start)
+    other = flights.submit("b", start)
+    assert len(started) == 2 and flights.merged_count == 1
+    assert flights.shared_future(first) is flights.shared_future(second) is started[0]
+    started[0].set_result(42)
+    assert first.result() == second.result() == 42
+    assert flights.shared_future(first) is None
+    assert not other.done()
+    flights.submit("a", start)  # the first request is no longer in flight
+    assert len(started) == 3
+
+
+def test_shared_requests_are_cancelled_once_no_caller_wants_them() -> None:
+    flights = SingleFlight()
+    shared: Future = Future()
+    first = flights.submit("a", lambda: shared)
+    second = flights.submit("a", lambda: shared)
+    assert first.cancel()
+    assert not shared.cancelled()
+    assert second.cancel()
+    assert shared.cancelled()
+
+
+def test_unwanted_requests_are_not_joined_while_being_cancelled() -> None:
+    flights = SingleFlight()
+    started: list[Future] = []
+
+    def start() -> Future:
+        started.append(Future())
+        return started[-1]
+
+    first = flights.submit("a", start)
+    assert started[0].set_running_or_notify_cancel()  # so it can't be cancelled
+    assert first.cancel()
+    second = flights.submit("a", start)
+    assert len(started) == 2 and flights.merged_count == 0
+    started[0].set_result(1)
+    started[1].set_result(2)
+    assert second.result() == 2
+
+
+def test_failures_and_cancellations_reach_every_caller() -> None:
+    flights = SingleFlight()
+    failing: Future = Future()
+    futures = [flights.submit("a", lambda: failing) for _ in range(2)]
+    failing.set_exception(ValueError("failed"))
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
+    rejected: Future = Future()
+    rejected.cancel()  # such as by a busy task scheduler
+    assert flights.submit("b", lambda: rejected).cancelled()
@@ -0,0 +1,127 @@
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import Future
+from threading import Event
+from types import ModuleType
+
+import pytest
+from moviefinder.task_scheduler import Priority
+from moviefinder.task_scheduler import TaskGroup
+from moviefinder.task_scheduler import TaskScheduler
+from pytestqt import qtbot  # noqa: F401
+
+
+@pytest.fixture
+def scheduler() -> Iterator[TaskScheduler]:
+    scheduler = TaskScheduler(max_workers=1, max_waiting=4)
+    yield scheduler
+    scheduler.shutdown()
+
+
+def block(scheduler: TaskScheduler) -> Event:
+    """Occupies the scheduler's only worker until the returned event is set."""
+    started = Event()
+    release = Event()
+
+    def wait() -> None:
+        started.set()
+        assert release.wait(5)
+
+    scheduler.submit(wait, priority=Priority.VISIBLE_POSTER)
+    assert started.wait(5)
+    return release
+
+
+def test_tasks_start_by_priority_then_age(scheduler: TaskScheduler) -> None:
+    release = block(scheduler)
+    order: list[str] = []
+    futures = [
+        scheduler.submit(order.append, "sync", priority=Priority.BACKGROUND),
+        scheduler.submit(order.append, "page", priority=Priority.PAGE),
+        scheduler.submit(order.append, "poster 1", priority=Priority.VISIBLE_POSTER),
+        scheduler.submit(order.append, "poster 2", priority=Priority.VISIBLE_POSTER),
+    ]
+    assert scheduler.queue_depths()[Priority.VISIBLE_POSTER] == 2
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+    assert order == ["poster 1", "poster 2", "page", "sync"]
+    assert sum(scheduler.queue_depths().values()) == 0
+    assert sum(sum(counts) for counts in scheduler.wait_histograms().values()) == 5
+
+
+def test_waiting_tasks_can_be_reprioritized_and_cancelled(
+    scheduler: TaskScheduler,
+) -> None:
+    release = block(scheduler)
+    order: list[str] = []
+    page = scheduler.submit(order.append, "page", priority=Priority.PAGE)
+    prefetch = scheduler.submit(order.append, "prefetch", priority=Priority.PREFETCH)
+    cancelled = scheduler.submit(order.append, "cancelled", priority=Priority.PAGE)
+    scheduler.reprioritize(prefetch, Priority.VISIBLE_POSTER)
+    scheduler.reprioritize(prefetch, Priority.BACKGROUND, only_raise=True)
+    assert cancelled.cancel()
+    assert scheduler.queue_depths()[Priority.PAGE] == 1
+    release.set()
+    page.result(timeout=5)
+    assert order == ["prefetch", "page"]
+    assert cancelled.cancelled()
+
+
+def test_speculative_tasks_are_rejected_when_too_many_wait(
+    scheduler: TaskScheduler,
+) -> None:
+    release = block(scheduler)
+    futures = [
+        scheduler.submit(time.sleep, 0, priority=Priority.PREFETCH) for _ in range(4)
+    ]
+    rejected = scheduler.submit(time.sleep, 0, priority=Priority.BACKGROUND)
+    urgent = scheduler.submit(time.sleep, 0, priority=Priority.PAGE)
+    assert rejected.cancelled()
+    assert not urgent.cancelled()
+    assert scheduler.rejected_count == 1
+    release.set()
+    for future in futures + [urgent]:
+        future.result(timeout=5)
+
+
+def test_groups_limit_their_running_tasks() -> None:
+    scheduler = TaskScheduler(max_workers=4)
+    group = TaskGroup(max_running=2)
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def run() -> None:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    futures = [scheduler.submit(run, group=group) for _ in range(8)]
+    others = [scheduler.submit(time.sleep, 0) for _ in range(4)]
+    for future in futures + others:
+        future.result(timeout=5)
+    assert max_running == 2
+    scheduler.shutdown()
+
+
+def test_gui_callbacks_run_in_the_gui_thread(
+    qtbot: ModuleType, scheduler: TaskScheduler  # noqa: F811
+) -> None:
+    threads: list[threading.Thread] = []
+    results: list[Future] = []
+
+    def on_done(future: Future) -> None:
+        threads.append(threading.current_thread())
+        results.append(future)
+
+    future = scheduler.submit(lambda: 42)
+    scheduler.add_gui_callback(future, on_done)
+    qtbot.waitUntil(lambda: bool(results))
+    assert threads == [threading.main_thread()]
+    assert results[0].result() == 42